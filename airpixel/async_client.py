@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import client, pacing
+
+
+class FlowControlProtocol(asyncio.DatagramProtocol):
+    def __init__(self, async_client: AsyncAirClient):
+        super().__init__()
+        self._async_client = async_client
+
+    def pause_writing(self) -> None:
+        self._async_client.pause()
+
+    def resume_writing(self) -> None:
+        self._async_client.resume()
+
+    def error_received(self, exc: Exception) -> None:
+        self._async_client.dropped_sends += 1
+
+
+class TransportSender:
+    def __init__(self, async_client: AsyncAirClient):
+        self._async_client = async_client
+
+    def sendto(self, data: bytes, address: t.Tuple[str, int]) -> None:
+        transport = self._async_client.transport
+        if transport is None or transport.is_closing():
+            self._async_client.dropped_sends += 1
+            return
+        transport.sendto(data, address)
+        self._async_client.sent_datagrams += 1
+
+    def sendmsg(
+        self,
+        buffers: t.Iterable[bytes],
+        ancdata: t.Any,
+        flags: int,
+        address: t.Tuple[str, int],
+    ) -> None:
+        self.sendto(b"".join(buffers), address)
+
+
+class AsyncAirClient:
+    def __init__(
+        self,
+        remote_ip: str,
+        remote_port: int,
+        drop_when_paused: bool = False,
+        **client_kwargs: t.Any,
+    ):
+        self.remote_ip = remote_ip
+        self.remote_port = remote_port
+        self.drop_when_paused = drop_when_paused
+        self.client = client.AirClient(
+            remote_ip,
+            remote_port,
+            sock=t.cast(socket.socket, TransportSender(self)),
+            **client_kwargs,
+        )
+        self.transport: t.Optional[asyncio.DatagramTransport] = None
+        self._writable: t.Optional[asyncio.Event] = None
+        self.sent_datagrams = 0
+        self.dropped_sends = 0
+
+    async def connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: FlowControlProtocol(self), family=socket.AF_INET
+        )
+        self.transport = t.cast(asyncio.DatagramTransport, transport)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    async def __aenter__(self) -> AsyncAirClient:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    @property
+    def frame_number(self) -> int:
+        return self.client.frame_number
+
+    @property
+    def paused(self) -> bool:
+        return self._writable is not None and not self._writable.is_set()
+
+    def pause(self) -> None:
+        if self._writable is not None:
+            self._writable.clear()
+
+    def resume(self) -> None:
+        if self._writable is not None:
+            self._writable.set()
+
+    async def _wait_writable(self) -> bool:
+        if self._writable is None or self._writable.is_set():
+            return True
+        if self.drop_when_paused:
+            self.dropped_sends += 1
+            return False
+        await self._writable.wait()
+        return True
+
+    def _pacing_delay(self) -> float:
+        pacer = self.client.pacer
+        if pacer is None or pacer.policy != pacing.FramePolicy.BLOCK:
+            return 0.0
+        return pacer.remaining()
+
+    async def _ready(self) -> bool:
+        # Wait for the pacer here, AirClient would block the event loop in
+        # time.sleep. Another task may send while this one waits, so check again
+        # right before handing the frame over.
+        while True:
+            delay = self._pacing_delay()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._pacing_delay()
+            if not await self._wait_writable():
+                return False
+            if not self._pacing_delay():
+                return True
+
+    async def show_array(self, frame: np.ndarray) -> None:
+        if await self._ready():
+            self.client.show_array(frame)
+
+    async def show_bytes(self, message: bytes) -> None:
+        if await self._ready():
+            self.client.show_bytes(message)
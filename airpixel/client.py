@@ -1,11 +1,29 @@
+from __future__ import annotations
+
 import abc
+import contextlib
+import dataclasses
 import io
+import os
 import socket
+import struct
+import time
 import typing as t
 
 import numpy as np  # type: ignore
 
-from airpixel import gamma_table, monitoring
+from airpixel import (
+    encoding,
+    feedback,
+    fragmentation,
+    gamma_table,
+    monitoring,
+    pacing,
+    power,
+)
+
+if t.TYPE_CHECKING:
+    from airpixel import recording
 
 
 class UDPConstants:
@@ -13,14 +31,113 @@ class UDPConstants:
     FRAME_NUMBER_BYTES = 8
     BITS_IN_BYTE = 8
     MAX_PACKET_SIZE = 65507
+    FRAME_HEADER = struct.Struct(">Q")
+
+
+class ClientError(Exception):
+    pass
+
+
+class FrameShapeError(ClientError):
+    pass
+
+
+class WhiteExtraction:
+    @abc.abstractmethod
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        pass
+
+
+class NoWhiteExtraction(WhiteExtraction):
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        white = np.zeros((frame.shape[0], 1), dtype=frame.dtype)
+        return np.concatenate((frame, white), axis=1)
+
+
+class MinWhiteExtraction(WhiteExtraction):
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        expanded = np.empty((frame.shape[0], 4), dtype=frame.dtype)
+        white = np.minimum(frame[:, 0], frame[:, 1], out=expanded[:, 3])
+        np.minimum(white, frame[:, 2], out=white)
+        np.subtract(frame, white[:, np.newaxis], out=expanded[:, :3])
+        return expanded
+
+
+def white_point_from_temperature(kelvin: float) -> t.Tuple[float, float, float]:
+    # Approximation of the black body color by Tanner Helland
+    temperature = kelvin / 100
+    if temperature <= 66:
+        red = 255.0
+        green = 99.4708025861 * np.log(temperature) - 161.1195681661
+    else:
+        red = 329.698727446 * (temperature - 60) ** -0.1332047592
+        green = 288.1221695283 * (temperature - 60) ** -0.0755148492
+    if temperature >= 66:
+        blue = 255.0
+    elif temperature <= 19:
+        blue = 0.0
+    else:
+        blue = 138.5177312231 * np.log(temperature - 10) - 305.0447927307
+    red, green, blue = np.clip((red, green, blue), 0, 255) / 255
+    return (float(red), float(green), float(blue))
+
+
+class ColorTemperatureWhiteExtraction(WhiteExtraction):
+    def __init__(
+        self,
+        white_temperature: float = 4500,
+        white_point: t.Optional[t.Sequence[float]] = None,
+    ) -> None:
+        if white_point is None:
+            white_point = white_point_from_temperature(white_temperature)
+        self.white_point = np.array(white_point, dtype=np.float32)
+        self.white_point /= self.white_point.max()
+        self._inverse_white_point = 1 / np.maximum(self.white_point, 1e-6)
+
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        values = frame.astype(np.float32)
+        expanded = np.empty((frame.shape[0], 4), dtype=np.float32)
+        scaled = values * self._inverse_white_point
+        white = np.minimum(scaled[:, 0], scaled[:, 1], out=expanded[:, 3])
+        np.minimum(white, scaled[:, 2], out=white)
+        np.subtract(
+            values, white[:, np.newaxis] * self.white_point, out=expanded[:, :3]
+        )
+        np.maximum(expanded[:, :3], 0, out=expanded[:, :3])
+        if np.issubdtype(frame.dtype, np.integer):
+            return np.rint(expanded).astype(frame.dtype)
+        return expanded
 
 
 class ColorMethod:
+    CHANNEL_ORDER: t.Tuple[int, ...] = (0, 1, 2)
+    white_extraction: WhiteExtraction = NoWhiteExtraction()
+
     @staticmethod
     @abc.abstractmethod
     def to_bytes(pixel: "Pixel") -> np.ndarray:
         pass
 
+    @classmethod
+    def channels(cls) -> int:
+        return len(cls.CHANNEL_ORDER)
+
+    @classmethod
+    def expand(cls, frame: np.ndarray) -> np.ndarray:
+        if frame.shape[1] < cls.channels():
+            return cls.white_extraction.extract(frame)
+        return frame
+
+    @classmethod
+    def to_array(cls, frame: np.ndarray) -> np.ndarray:
+        return cls.expand(frame)[:, cls.CHANNEL_ORDER]
+
+    @classmethod
+    def with_white_extraction(
+        cls, white_extraction: WhiteExtraction
+    ) -> t.Type[ColorMethod]:
+        return type(cls.__name__, (cls,), {"white_extraction": white_extraction})
+
 
 class ColorMethodRGB(ColorMethod):
     @staticmethod
@@ -30,16 +147,17 @@ class ColorMethodRGB(ColorMethod):
 
 
 class ColorMethodRGBW(ColorMethod):
-    # For now just r, g, b, 0.
-    # This might have a better solution:
-    # http://www.mirlab.org/conference_papers/International_Conference/ICASSP%202014/papers/p1214-lee.pdf
-    @staticmethod
-    @abc.abstractmethod
-    def to_bytes(pixel: "Pixel") -> np.ndarray:
-        return np.append(pixel.values, [0])
+    CHANNEL_ORDER = (0, 1, 2, 3)
+    white_extraction: WhiteExtraction = MinWhiteExtraction()
+
+    @classmethod
+    def to_bytes(cls, pixel: "Pixel") -> np.ndarray:
+        return cls.white_extraction.extract(pixel.values[np.newaxis])[0]
 
 
 class ColorMethodGRB(ColorMethod):
+    CHANNEL_ORDER = (1, 0, 2)
+
     @staticmethod
     @abc.abstractmethod
     def to_bytes(pixel: "Pixel") -> np.ndarray:
@@ -48,10 +166,14 @@ class ColorMethodGRB(ColorMethod):
 
 
 class ColorMethodGRBW(ColorMethod):
-    @staticmethod
-    @abc.abstractmethod
-    def to_bytes(pixel: "Pixel") -> np.ndarray:
-        red, green, blue, white = ColorMethodRGBW.to_bytes(pixel)
+    CHANNEL_ORDER = (1, 0, 2, 3)
+    white_extraction: WhiteExtraction = MinWhiteExtraction()
+
+    @classmethod
+    def to_bytes(cls, pixel: "Pixel") -> np.ndarray:
+        red, green, blue, white = cls.white_extraction.extract(
+            pixel.values[np.newaxis]
+        )[0]
         return np.array((green, red, blue, white))
 
 
@@ -65,41 +187,496 @@ class Pixel:
         )
 
 
+class FrameBuffer:
+    __slots__ = ("_channels", "_scratch")
+
+    def __init__(self, size: int, channels: int = 3, dtype: t.Any = np.float32):
+        self._channels = np.zeros((channels, size), dtype=dtype)
+        self._scratch = np.empty_like(self._channels)
+
+    def __len__(self) -> int:
+        return int(self._channels.shape[1])
+
+    def __getitem__(self, index: t.Union[int, slice]) -> np.ndarray:
+        return self.array[index]
+
+    def __setitem__(self, index: t.Union[int, slice], value: t.Any) -> None:
+        self.array[index] = value
+
+    def __repr__(self) -> str:
+        return f"FrameBuffer({len(self)}, channels={self._channels.shape[0]})"
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._channels.T
+
+    @property
+    def red(self) -> np.ndarray:
+        return self._channels[0]
+
+    @property
+    def green(self) -> np.ndarray:
+        return self._channels[1]
+
+    @property
+    def blue(self) -> np.ndarray:
+        return self._channels[2]
+
+    def channel(self, index: int) -> np.ndarray:
+        return self._channels[index]
+
+    def clear(self) -> None:
+        self._channels.fill(0)
+
+    def fill(
+        self,
+        color: t.Sequence[float],
+        start: t.Optional[int] = None,
+        stop: t.Optional[int] = None,
+    ) -> None:
+        self.array[start:stop] = color
+
+    def scale(self, factor: t.Union[float, np.ndarray]) -> None:
+        np.multiply(self._channels, factor, out=self._channels)
+
+    def blend(
+        self, other: t.Union[FrameBuffer, np.ndarray], alpha: t.Union[float, np.ndarray]
+    ) -> None:
+        other_channels = other._channels if isinstance(other, FrameBuffer) else other.T
+        np.subtract(other_channels, self._channels, out=self._scratch)
+        np.multiply(self._scratch, alpha, out=self._scratch)
+        np.add(self._channels, self._scratch, out=self._channels)
+
+
+# Float frames are in [0, 1], integer frames use the full range of their type
+INTEGER_DTYPES = (np.uint8, np.uint16)
+
+
+def _validate_dtype(frame: np.ndarray) -> None:
+    if frame.dtype.kind != "f" and frame.dtype not in INTEGER_DTYPES:
+        raise FrameShapeError(
+            f"Expected a float, uint8 or uint16 frame, got {frame.dtype}"
+        )
+
+
+def quantize(frame: np.ndarray, dtype: t.Any = np.uint8) -> np.ndarray:
+    if frame.dtype == dtype:
+        return frame
+    _validate_dtype(frame)
+    max_level = np.iinfo(dtype).max
+    if frame.dtype in INTEGER_DTYPES:
+        source_max_level = np.iinfo(frame.dtype).max
+        return (frame.astype(np.uint32) * max_level // source_max_level).astype(dtype)
+    return (np.clip(frame, 0, 1) * max_level).astype(dtype)
+
+
+class TemporalDither:
+    __slots__ = ("_error", "_quantized")
+
+    def __init__(self) -> None:
+        self._error = np.zeros(0, dtype=np.float32)
+        self._quantized = np.zeros(0, dtype=np.float32)
+
+    def reset(self) -> None:
+        self._error.fill(0)
+
+    def quantize(
+        self, levels: np.ndarray, out: t.Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        if self._error.shape != levels.shape:
+            self._error = np.zeros(levels.shape, dtype=np.float32)
+            self._quantized = np.zeros(levels.shape, dtype=np.float32)
+        np.add(levels, self._error, out=levels)
+        quantized = np.rint(levels, out=self._quantized)
+        np.clip(quantized, 0, 255, out=quantized)
+        np.subtract(levels, quantized, out=self._error)
+        if out is None:
+            return quantized.astype(np.uint8)
+        np.copyto(out, quantized, casting="unsafe")
+        return out
+
+
+class FramePacket:
+    __slots__ = ("buffer", "payload")
+
+    def __init__(self, payload_size: int) -> None:
+        self.buffer = bytearray(UDPConstants.FRAME_NUMBER_BYTES + payload_size)
+        self.payload = np.frombuffer(
+            self.buffer, dtype=np.uint8, offset=UDPConstants.FRAME_NUMBER_BYTES
+        )
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def set_frame_number(self, frame_number: int) -> None:
+        UDPConstants.FRAME_HEADER.pack_into(self.buffer, 0, frame_number)
+
+    def set_payload(self, message: t.Union[bytes, memoryview]) -> None:
+        self.buffer[UDPConstants.FRAME_NUMBER_BYTES :] = message
+
+
+class FeedbackReceiver:
+    def __init__(
+        self,
+        socket_path: str,
+        latency_tracker: t.Optional[feedback.LatencyTracker] = None,
+    ):
+        self.socket_path = socket_path
+        self.latency_tracker = latency_tracker
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.socket.bind(socket_path)
+        self.socket.settimeout(0)
+
+    def _receive(self) -> t.Iterator[feedback.Feedback]:
+        while True:
+            try:
+                data = self.socket.recv(feedback.Feedback.FORMAT.size)
+            except OSError:
+                return
+            try:
+                message = feedback.Feedback.from_bytes(data)
+            except feedback.FeedbackParsingError:
+                continue
+            if self.latency_tracker is not None and message.frame_number:
+                self.latency_tracker.confirm(message.frame_number)
+            yield message
+
+    def latest(self) -> t.Optional[feedback.Feedback]:
+        latest = None
+        for latest in self._receive():
+            pass
+        return latest
+
+    def latest_heartbeat(self) -> t.Optional[feedback.Feedback]:
+        # Confirmations arrive with every shown frame, heartbeats once per
+        # HEARTBEAT_DELTA of the device
+        heartbeat = None
+        for message in self._receive():
+            if not message.frame_number:
+                heartbeat = message
+        return heartbeat
+
+    def close(self) -> None:
+        self.socket.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+class RateController:
+    def __init__(
+        self,
+        pacer: pacing.FramePacer,
+        receiver: FeedbackReceiver,
+        min_fps: float = 5,
+        max_fps: t.Optional[float] = None,
+        target_delivery: float = 0.9,
+        increase_step: float = 1,
+        decrease_factor: float = 0.8,
+    ):
+        self.pacer = pacer
+        self.receiver = receiver
+        self.min_fps = min_fps
+        self.max_fps = pacer.target_fps if max_fps is None else max_fps
+        self.target_delivery = target_delivery
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.delivery_ratio = 1.0
+        self.loss = 0.0
+        self._last_feedback: t.Optional[feedback.Feedback] = None
+        self._last_sent_frames = 0
+
+    def update(self, sent_frames: int) -> None:
+        new_feedback = self.receiver.latest_heartbeat()
+        if new_feedback is None:
+            return
+        last_feedback, last_sent_frames = self._last_feedback, self._last_sent_frames
+        self._last_feedback, self._last_sent_frames = new_feedback, sent_frames
+        if last_feedback is None or new_feedback.received < last_feedback.received:
+            return
+        sent = sent_frames - last_sent_frames
+        if sent <= 0:
+            return
+        received = new_feedback.received - last_feedback.received
+        shown = new_feedback.shown - last_feedback.shown
+        self.loss = max(0.0, 1 - received / sent)
+        self.delivery_ratio = min(1.0, shown / sent)
+        if self.delivery_ratio < self.target_delivery:
+            target_fps = self.pacer.target_fps * self.decrease_factor
+        else:
+            target_fps = self.pacer.target_fps + self.increase_step
+        self.pacer.set_target_fps(min(self.max_fps, max(self.min_fps, target_fps)))
+
+
 class AirClient:
     def __init__(
         self,
         remote_ip: str,
         remote_port: int,
         color_method: t.Type[ColorMethod] = ColorMethodGRB,
+        calibration: gamma_table.Calibration = gamma_table.Calibration(),
+        dither: bool = False,
+        pacer: t.Optional[pacing.FramePacer] = None,
+        rate_controller: t.Optional[RateController] = None,
+        fragment_size: t.Optional[int] = None,
+        encodings: t.Sequence[encoding.Encoding] = (),
+        idle_suppressor: t.Optional[pacing.IdleSuppressor] = None,
+        power_limiter: t.Optional[power.PowerLimiter] = None,
+        recorder: t.Optional[recording.FrameRecorder] = None,
+        latency_tracker: t.Optional[feedback.LatencyTracker] = None,
+        sock: t.Optional[socket.socket] = None,
     ) -> None:
         self.remote_ip = remote_ip
         self.remote_port = remote_port
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.settimeout(0)
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.settimeout(0)
+        self.socket = sock
         self.frame_number = 0
         self.color_method = color_method
+        self.lookup_table = gamma_table.lookup_table(
+            color_method.CHANNEL_ORDER, calibration, precise=dither
+        )
+        self.dither = TemporalDither() if dither else None
+        self._packet = FramePacket(0)
+        self.pacer = pacer
+        self.rate_controller = rate_controller
+        self._pending = False
+        self.chunk_size = (
+            None
+            if fragment_size is None
+            else fragmentation.chunk_size(fragment_size, color_method.channels())
+        )
+        self._fragment_header = bytearray(fragmentation.HEADER.size)
+        self.encoder = (
+            encoding.FrameEncoder(encodings, color_method.channels())
+            if set(encodings) - {encoding.Encoding.RAW}
+            else None
+        )
+        if self.encoder is not None and self.chunk_size is not None:
+            raise ClientError("Encoded frames can't be fragmented")
+        self.idle_suppressor = idle_suppressor
+        if (
+            power_limiter is not None
+            and power_limiter.channels != color_method.channels()
+        ):
+            raise ClientError(
+                f"Power limiter has {power_limiter.channels} channel currents, "
+                f"expected {color_method.channels()}"
+            )
+        self.power_limiter = power_limiter
+        self.recorder = recorder
+        self.latency_tracker = latency_tracker
 
-    def send_bytes(self, message: bytes) -> None:
+    def send_bytes(self, message: t.Union[bytes, bytearray]) -> None:
         try:
             self.socket.sendto(message, (self.remote_ip, self.remote_port))
         except OSError:
             pass
 
-    def _frame_number_bytes(self) -> bytes:
-        return self.frame_number.to_bytes(
-            UDPConstants.FRAME_NUMBER_BYTES, byteorder=UDPConstants.ENCODING_BYTEORDER
-        )
+    def _packet_for(self, payload_size: int) -> FramePacket:
+        if self._packet.payload.size != payload_size:
+            self._packet = FramePacket(payload_size)
+        return self._packet
 
-    def show_bytes(self, message: bytes) -> None:
-        self.send_bytes(self._frame_number_bytes() + message)
+    def _send_fragments(self, packet: FramePacket, chunk_size: int) -> None:
+        address = (self.remote_ip, self.remote_port)
+        for header, chunk in fragmentation.fragments(
+            self.frame_number,
+            memoryview(packet.buffer)[UDPConstants.FRAME_NUMBER_BYTES :],
+            chunk_size,
+            self._fragment_header,
+        ):
+            try:
+                self.socket.sendmsg((header, chunk), (), 0, address)
+            except OSError:
+                pass
+
+    def _send_packet(self, packet: FramePacket) -> None:
+        if self.encoder is not None:
+            self.send_bytes(self.encoder.encode(self.frame_number, packet.payload))
+        elif self.chunk_size is None:
+            packet.set_frame_number(self.frame_number)
+            self.send_bytes(packet.buffer)
+        else:
+            self._send_fragments(packet, self.chunk_size)
+        if self.latency_tracker is not None:
+            self.latency_tracker.mark_sent(self.frame_number)
         self.frame_number += 1
+        self._pending = False
+        if self.pacer is not None:
+            self.pacer.mark_sent()
+        if self.idle_suppressor is not None:
+            self.idle_suppressor.mark_sent(packet.payload)
+
+    def _admit(self) -> bool:
+        if self.rate_controller is not None:
+            self.rate_controller.update(self.frame_number)
+        if self.pacer is None:
+            return True
+        if self.pacer.policy == pacing.FramePolicy.BLOCK:
+            self.pacer.wait()
+        elif self.pacer.policy == pacing.FramePolicy.SKIP and not self.pacer.due():
+            self.pacer.mark_skipped()
+            return False
+        return True
+
+    def show_packet(self, packet: FramePacket) -> None:
+        if self.recorder is not None:
+            self.recorder.record(packet.payload.data)
+        if self.idle_suppressor is not None and self.idle_suppressor.suppress(
+            packet.payload
+        ):
+            return
+        if (
+            self.pacer is not None
+            and self.pacer.policy == pacing.FramePolicy.LATEST
+            and not self.pacer.due()
+        ):
+            if self._pending:
+                self.pacer.mark_skipped()
+            self._pending = True
+            return
+        self._send_packet(packet)
+
+    def poll(self) -> None:
+        if self._pending and self.pacer is not None and self.pacer.due():
+            self._send_packet(self._packet)
+
+    def show_bytes(self, message: t.Union[bytes, memoryview]) -> None:
+        if not self._admit():
+            return
+        packet = self._packet_for(len(message))
+        packet.set_payload(message)
+        self.show_packet(packet)
+
+    def _validate_shape(self, frame: np.ndarray) -> None:
+        if frame.ndim != 2 or frame.shape[1] not in (3, self.color_method.channels()):
+            raise FrameShapeError(
+                f"Expected a frame of shape (N, 3) or "
+                f"(N, {self.color_method.channels()}), got {frame.shape}"
+            )
+        _validate_dtype(frame)
+
+    def _encode_array(self, frame: np.ndarray) -> FramePacket:
+        frame = self.color_method.expand(frame)
+        packet = self._packet_for(frame.shape[0] * self.color_method.channels())
+        if self.dither is None:
+            frame = quantize(frame, np.uint8)
+            self.lookup_table.apply(frame, out=packet.payload)
+        else:
+            frame = quantize(frame, np.uint16)
+            self.dither.quantize(self.lookup_table.apply(frame), out=packet.payload)
+        if self.power_limiter is not None:
+            self.power_limiter.apply(packet.payload)
+        return packet
+
+    def encode_array(self, frame: np.ndarray) -> FramePacket:
+        frame = np.asarray(frame)
+        self._validate_shape(frame)
+        return self._encode_array(frame)
+
+    def show_array(self, frame: np.ndarray) -> None:
+        frame = np.asarray(frame)
+        self._validate_shape(frame)
+        if not self._admit():
+            return
+        self.show_packet(self._encode_array(frame))
+
+    def show_buffer(self, buffer: FrameBuffer) -> None:
+        self.show_array(buffer.array)
 
     def show_frame(self, frame: t.List[Pixel]) -> None:
-        raw_pixels = np.concatenate(
-            [self.color_method.to_bytes(pixel) for pixel in frame]
+        # Pixel(1, 0, 0) holds integers, the levels are still in [0, 1]
+        self.show_array(
+            np.array([pixel.values for pixel in frame], dtype=np.float64).reshape(-1, 3)
+        )
+
+
+@dataclasses.dataclass
+class Endpoint:
+    remote_ip: str
+    remote_port: int
+    color_method: t.Type[ColorMethod] = ColorMethodGRB  # type: ignore
+    calibration: gamma_table.Calibration = gamma_table.Calibration()
+    dither: bool = False
+    power_limiter: t.Optional[power.PowerLimiter] = None
+
+
+@dataclasses.dataclass
+class SkewReport:
+    ticks: int
+    mean: float
+    p99: float
+    max: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.ticks} ticks, send skew mean {self.mean * 1e6:.1f}us "
+            f"p99 {self.p99 * 1e6:.1f}us max {self.max * 1e6:.1f}us"
+        )
+
+
+class MultiAirClient:
+    def __init__(self, endpoints: t.Sequence[Endpoint], history: int = 1024):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.settimeout(0)
+        self.clients = [
+            AirClient(
+                endpoint.remote_ip,
+                endpoint.remote_port,
+                endpoint.color_method,
+                endpoint.calibration,
+                endpoint.dither,
+                power_limiter=endpoint.power_limiter,
+                sock=self.socket,
+            )
+            for endpoint in endpoints
+        ]
+        self._addresses = [(e.remote_ip, e.remote_port) for e in endpoints]
+        self.frame_number = 0
+        self.failed_sends = 0
+        self._skews = np.zeros(history)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def show_arrays(self, frames: t.Sequence[np.ndarray]) -> None:
+        if len(frames) != len(self.clients):
+            raise FrameShapeError(
+                f"Expected {len(self.clients)} frames, got {len(frames)}"
+            )
+        packets = [
+            client.encode_array(frame) for client, frame in zip(self.clients, frames)
+        ]
+        for packet in packets:
+            packet.set_frame_number(self.frame_number)
+        self._send_burst(packets)
+
+    def _send_burst(self, packets: t.List[FramePacket]) -> None:
+        sendto = self.socket.sendto
+        failed = 0
+        start = time.perf_counter()
+        for packet, address in zip(packets, self._addresses):
+            try:
+                sendto(packet.buffer, address)
+            except OSError:
+                failed += 1
+        self._skews[self.frame_number % self._skews.size] = time.perf_counter() - start
+        self.failed_sends += failed
+        self.frame_number += 1
+
+    def skew_report(self) -> SkewReport:
+        skews = self._skews[: min(self.frame_number, self._skews.size)]
+        if not skews.size:
+            return SkewReport(0, 0.0, 0.0, 0.0)
+        return SkewReport(
+            self.frame_number,
+            float(skews.mean()),
+            float(np.percentile(skews, 99)),
+            float(skews.max()),
         )
-        raw_pixels = gamma_table.GAMMA_TABLE[(raw_pixels * 255).astype("uint8")]
-        self.show_bytes(bytes(raw_pixels))
 
 
 class MonitorClient:
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import enum
+import struct
+import typing as t
+
+import numpy as np  # type: ignore
+
+FRAME_HEADER = struct.Struct(">QB")
+REFERENCE_HEADER = struct.Struct(">Q")
+UNENCODED_HEADER_SIZE = 8
+SPAN_HEADER_SIZE = 4
+RUN_HEADER_SIZE = 2
+MAX_COUNT = 0xFFFF
+
+
+class EncodingError(Exception):
+    pass
+
+
+class DecodingError(EncodingError):
+    pass
+
+
+@enum.unique
+class Encoding(str, enum.Enum):
+    RAW = "raw"
+    DELTA = "delta"
+    RLE = "rle"
+
+
+@enum.unique
+class PacketType(enum.IntEnum):
+    RAW = 0
+    DELTA = 1
+    RLE = 2
+
+
+def parse_encodings(encodings: str) -> t.List[Encoding]:
+    try:
+        return [Encoding(name) for name in encodings.split(",") if name]
+    except ValueError as e:
+        raise EncodingError(f"Unknown encoding in {encodings!r}") from e
+
+
+def _big_endian_counts(counts: np.ndarray) -> np.ndarray:
+    return np.stack((counts >> 8, counts & 0xFF), axis=1).astype(np.uint8)
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Concatenation of arange(start, start + length) for every pair
+    ends = np.cumsum(lengths)
+    offsets = np.repeat(starts - (ends - lengths), lengths)
+    return np.arange(ends[-1] if ends.size else 0) + offsets
+
+
+def encode_rle(pixels: np.ndarray) -> np.ndarray:
+    pixel_count, channels = pixels.shape
+    if pixel_count > MAX_COUNT:
+        raise EncodingError("Too many pixels for run length encoding")
+    if not pixel_count:
+        return np.zeros(0, dtype=np.uint8)
+    boundaries = np.flatnonzero(np.any(pixels[1:] != pixels[:-1], axis=1)) + 1
+    starts = np.concatenate(([0], boundaries))
+    counts = np.diff(np.append(starts, pixel_count))
+    runs = np.empty((starts.size, RUN_HEADER_SIZE + channels), dtype=np.uint8)
+    runs[:, :RUN_HEADER_SIZE] = _big_endian_counts(counts)
+    runs[:, RUN_HEADER_SIZE:] = pixels[starts]
+    return runs.ravel()
+
+
+def changed_spans(
+    pixels: np.ndarray, reference: np.ndarray, merge_gap: int = 1
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    changed = np.any(pixels != reference, axis=1).view(np.int8)
+    edges = np.diff(changed, prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size > 1:
+        separate = starts[1:] - ends[:-1] > merge_gap
+        starts = starts[np.concatenate(([True], separate))]
+        ends = ends[np.concatenate((separate, [True]))]
+    return starts, ends - starts
+
+
+def encode_delta(
+    pixels: np.ndarray, reference: np.ndarray, merge_gap: int = 1
+) -> np.ndarray:
+    pixel_count, channels = pixels.shape
+    if pixel_count > MAX_COUNT:
+        raise EncodingError("Too many pixels for delta encoding")
+    starts, counts = changed_spans(pixels, reference, merge_gap)
+    data_sizes = counts * channels
+    span_offsets = np.cumsum(SPAN_HEADER_SIZE + data_sizes) - data_sizes
+    encoded = np.empty(int(np.sum(SPAN_HEADER_SIZE + data_sizes)), dtype=np.uint8)
+    header_index = span_offsets[:, np.newaxis] - np.arange(SPAN_HEADER_SIZE, 0, -1)
+    encoded[header_index] = np.concatenate(
+        (_big_endian_counts(starts), _big_endian_counts(counts)), axis=1
+    )
+    encoded[_ranges(span_offsets, data_sizes)] = pixels.ravel()[
+        _ranges(starts * channels, data_sizes)
+    ]
+    return encoded
+
+
+class FrameEncoder:
+    def __init__(
+        self,
+        encodings: t.Sequence[Encoding],
+        channels: int,
+        keyframe_interval: int = 30,
+        merge_gap: int = 1,
+    ):
+        self.encodings = set(encodings)
+        self.channels = channels
+        self.keyframe_interval = keyframe_interval
+        self.merge_gap = merge_gap
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self._reference = np.zeros((0, channels), dtype=np.uint8)
+        self._reference_number: t.Optional[int] = None
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.raw_bytes / self.encoded_bytes if self.encoded_bytes else 1.0
+
+    def _needs_keyframe(self, frame_number: int, pixels: np.ndarray) -> bool:
+        return (
+            Encoding.DELTA not in self.encodings
+            or self._reference_number is None
+            or self._reference.shape != pixels.shape
+            or frame_number - self._reference_number >= self.keyframe_interval
+        )
+
+    def _keyframe(self, frame_number: int, pixels: np.ndarray) -> bytes:
+        self._reference = pixels.copy()
+        self._reference_number = frame_number
+        if Encoding.RLE in self.encodings and pixels.shape[0] <= MAX_COUNT:
+            runs = encode_rle(pixels)
+            if runs.size < pixels.size:
+                return FRAME_HEADER.pack(frame_number, PacketType.RLE) + runs.tobytes()
+        return FRAME_HEADER.pack(frame_number, PacketType.RAW) + pixels.tobytes()
+
+    def _delta(self, frame_number: int, pixels: np.ndarray) -> t.Optional[bytes]:
+        spans = encode_delta(pixels, self._reference, self.merge_gap)
+        if spans.size + REFERENCE_HEADER.size >= pixels.size:
+            return None
+        return (
+            FRAME_HEADER.pack(frame_number, PacketType.DELTA)
+            + REFERENCE_HEADER.pack(t.cast(int, self._reference_number))
+            + spans.tobytes()
+        )
+
+    def encode(self, frame_number: int, payload: np.ndarray) -> bytes:
+        pixels = payload.reshape(-1, self.channels)
+        packet = None
+        if not self._needs_keyframe(frame_number, pixels):
+            packet = self._delta(frame_number, pixels)
+        if packet is None:
+            packet = self._keyframe(frame_number, pixels)
+        self.raw_bytes += payload.size + UNENCODED_HEADER_SIZE
+        self.encoded_bytes += len(packet)
+        return packet
+
+
+class FrameDecoder:
+    def __init__(self, channels: int):
+        self.channels = channels
+        self.frame_number = -1
+        self.frame = bytearray()
+        self.shown_frames = 0
+        self._reference = b""
+        self._reference_number = -1
+
+    def _decode_rle(self, body: memoryview) -> bytes:
+        run_size = RUN_HEADER_SIZE + self.channels
+        if len(body) % run_size:
+            raise DecodingError("Truncated run")
+        runs = np.frombuffer(body, dtype=np.uint8).reshape(-1, run_size)
+        counts = runs[:, 0].astype(np.intp) << 8 | runs[:, 1]
+        return np.repeat(runs[:, RUN_HEADER_SIZE:], counts, axis=0).tobytes()
+
+    def _decode_delta(self, body: memoryview) -> t.Optional[bytes]:
+        try:
+            (reference_number,) = REFERENCE_HEADER.unpack_from(body)
+        except struct.error as e:
+            raise DecodingError("Missing reference frame number") from e
+        if reference_number != self._reference_number:
+            return None
+        frame = bytearray(self._reference)
+        position = REFERENCE_HEADER.size
+        while position < len(body):
+            if position + SPAN_HEADER_SIZE > len(body):
+                raise DecodingError("Truncated span header")
+            start, count = struct.unpack_from(">HH", body, position)
+            position += SPAN_HEADER_SIZE
+            size = count * self.channels
+            offset = start * self.channels
+            if position + size > len(body) or offset + size > len(frame):
+                raise DecodingError("Span exceeds the frame")
+            frame[offset : offset + size] = body[position : position + size]
+            position += size
+        return bytes(frame)
+
+    def decode(self, packet: bytes) -> t.Optional[bytes]:
+        try:
+            frame_number, packet_type = FRAME_HEADER.unpack_from(packet)
+        except struct.error as e:
+            raise DecodingError("Packet is shorter than the header") from e
+        if frame_number <= self.frame_number:
+            return None
+        body = memoryview(packet)[FRAME_HEADER.size :]
+        if packet_type == PacketType.RAW:
+            frame: t.Optional[bytes] = bytes(body)
+        elif packet_type == PacketType.RLE:
+            frame = self._decode_rle(body)
+        elif packet_type == PacketType.DELTA:
+            frame = self._decode_delta(body)
+        else:
+            raise DecodingError(f"Unknown packet type {packet_type}")
+        if frame is None:
+            return None
+        if packet_type != PacketType.DELTA:
+            self._reference = frame
+            self._reference_number = frame_number
+        self.frame_number = frame_number
+        self.frame = bytearray(frame)
+        self.shown_frames += 1
+        return frame
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import struct
+import tempfile
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+# Fixed width keepalive of devices that register with BINARY_KEEPALIVE:
+# received, shown and the confirmed frame number (0 for plain heartbeats)
+KEEPALIVE = struct.Struct(">IIQ")
+BINARY_KEEPALIVE = "binary-keepalive"
+
+
+class FeedbackError(Exception):
+    pass
+
+
+class FeedbackParsingError(FeedbackError):
+    pass
+
+
+@dataclasses.dataclass
+class Feedback:
+    received: int
+    shown: int
+    # Last shown frame number for confirmations, devices never show frame 0
+    frame_number: int = 0
+
+    FORMAT = struct.Struct(">QQQ")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Feedback:
+        try:
+            received, shown, frame_number = cls.FORMAT.unpack(data)
+        except struct.error as e:
+            raise FeedbackParsingError("Invalid feedback package") from e
+        return cls(received, shown, frame_number)
+
+    def to_bytes(self) -> bytes:
+        return self.FORMAT.pack(self.received, self.shown, self.frame_number)
+
+
+@dataclasses.dataclass
+class LatencyReport:
+    sent_frames: int
+    confirmed_frames: int
+    loss: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.confirmed_frames}/{self.sent_frames} frames confirmed, "
+            f"loss {self.loss:.1%}, latency p50 {self.p50 * 1000:.1f}ms "
+            f"p90 {self.p90 * 1000:.1f}ms p99 {self.p99 * 1000:.1f}ms "
+            f"max {self.max * 1000:.1f}ms"
+        )
+
+
+class LatencyTracker:
+    def __init__(
+        self,
+        history: int = 1024,
+        settle_time: float = 0.5,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        self.settle_time = settle_time
+        self._clock = clock
+        self._frame_numbers = np.full(history, -1, dtype=np.int64)
+        self._sent_times = np.zeros(history)
+        self._latencies = np.full(history, np.nan)
+        self.confirmed_frames = 0
+
+    def mark_sent(self, frame_number: int) -> None:
+        index = frame_number % self._frame_numbers.size
+        self._frame_numbers[index] = frame_number
+        self._sent_times[index] = self._clock()
+        self._latencies[index] = np.nan
+
+    def confirm(self, frame_number: int) -> None:
+        index = frame_number % self._frame_numbers.size
+        if self._frame_numbers[index] != frame_number or not np.isnan(
+            self._latencies[index]
+        ):
+            return
+        self._latencies[index] = self._clock() - self._sent_times[index]
+        self.confirmed_frames += 1
+
+    def report(self) -> LatencyReport:
+        # Frames sent within the settle time may still be confirmed
+        settled = (self._frame_numbers >= 0) & (
+            self._sent_times <= self._clock() - self.settle_time
+        )
+        latencies = self._latencies[settled]
+        latencies = latencies[~np.isnan(latencies)]
+        sent_frames = int(np.count_nonzero(settled))
+        if latencies.size:
+            p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+            maximum = latencies.max()
+        else:
+            p50 = p90 = p99 = maximum = np.nan
+        return LatencyReport(
+            sent_frames,
+            int(latencies.size),
+            1 - latencies.size / sent_frames if sent_frames else 0.0,
+            float(p50),
+            float(p90),
+            float(p99),
+            float(maximum),
+        )
+
+
+def socket_path(device_id: str, ip_address: str) -> str:
+    return os.path.join(
+        tempfile.gettempdir(), f"airpixel-feedback-{device_id}-{ip_address}"
+    )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import struct
+import typing as t
+
+HEADER = struct.Struct(">QII")
+# Ethernet MTU minus IPv4 and UDP headers
+MTU_DATAGRAM_SIZE = 1472
+
+
+class FragmentError(Exception):
+    pass
+
+
+class FragmentParsingError(FragmentError):
+    pass
+
+
+def chunk_size(datagram_size: int, channels: int) -> int:
+    size = (datagram_size - HEADER.size) // channels * channels
+    if size <= 0:
+        raise FragmentError(f"Datagram size {datagram_size} can't hold a pixel")
+    return size
+
+
+def fragments(
+    frame_number: int,
+    payload: t.Union[bytes, bytearray, memoryview],
+    size: int,
+    header: t.Optional[bytearray] = None,
+) -> t.Iterator[t.Tuple[bytearray, memoryview]]:
+    # The header is packed into the same buffer for every fragment, send or copy
+    # it before asking for the next one
+    if header is None:
+        header = bytearray(HEADER.size)
+    payload = memoryview(payload)
+    total = len(payload)
+    for offset in range(0, total, size):
+        HEADER.pack_into(header, 0, frame_number, offset, total)
+        yield header, payload[offset : offset + size]
+
+
+class FrameAssembler:
+    def __init__(self) -> None:
+        self.frame_number = -1
+        self.frame = bytearray()
+        self.received_chunks = 0
+        self.shown_frames = 0
+        self._offsets: t.Set[int] = set()
+        self._received_bytes = 0
+        self._complete = True
+
+    def _show(self) -> bytes:
+        self._complete = True
+        self.shown_frames += 1
+        return bytes(self.frame)
+
+    def _start_frame(self, frame_number: int, total: int) -> None:
+        self.frame_number = frame_number
+        if len(self.frame) != total:
+            self.frame = bytearray(total)
+        self._offsets = set()
+        self._received_bytes = 0
+        self._complete = False
+
+    def receive(self, datagram: bytes) -> t.Optional[bytes]:
+        try:
+            frame_number, offset, total = HEADER.unpack_from(datagram)
+        except struct.error as e:
+            raise FragmentParsingError("Datagram is shorter than the header") from e
+        data = memoryview(datagram)[HEADER.size :]
+        if offset + len(data) > total:
+            raise FragmentParsingError("Chunk exceeds the frame")
+        self.received_chunks += 1
+        if frame_number < self.frame_number or (
+            frame_number == self.frame_number and self._complete
+        ):
+            return None
+        shown = None
+        if frame_number > self.frame_number:
+            if not self._complete and self._received_bytes:
+                shown = self._show()
+            self._start_frame(frame_number, total)
+        if offset in self._offsets:
+            return shown
+        self._offsets.add(offset)
+        self.frame[offset : offset + len(data)] = data
+        self._received_bytes += len(data)
+        if self._received_bytes >= total:
+            shown = self._show()
+        return shown
@@ -2,15 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import atexit
+import collections
 import dataclasses
+import json
 import logging
+import math
+import shlex
 import socket
+import struct
 import subprocess
 import time
 import typing as t
 
 import yaml
 
+from airpixel import feedback, gamma_table, launcher, telemetry
+
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
 
@@ -21,23 +28,107 @@ class FrameworkException(Exception):
     pass
 
 
+@dataclasses.dataclass
+class KeepaliveStatistics:
+    keepalives: int = 0
+    confirmations: int = 0
+    received: int = 0
+    shown: int = 0
+    interval_received: int = 0
+    interval_shown: int = 0
+
+    def start_interval(self) -> None:
+        self.keepalives = 0
+        self.confirmations = 0
+        self.interval_received = self.received
+        self.interval_shown = self.shown
+
+    def interval_counts(self) -> t.Tuple[int, int]:
+        if self.received < self.interval_received:
+            # The device restarted its counters when it reconnected
+            return self.received, self.shown
+        return (
+            self.received - self.interval_received,
+            self.shown - self.interval_shown,
+        )
+
+
 class KeepaliveProtocol(asyncio.DatagramProtocol):
-    def __init__(self, process_registration: ProcessRegistration):
+    def __init__(
+        self,
+        process_registration: ProcessRegistration,
+        statistics_interval: float = 10.0,
+    ):
         super().__init__()
         self._process_registration = process_registration
+        self.statistics_interval = statistics_interval
+        self.statistics: t.DefaultDict[str, KeepaliveStatistics] = (
+            collections.defaultdict(KeepaliveStatistics)
+        )
+        self.malformed_keepalives = 0
+
+    def _parse(
+        self, data: bytes, ip_address: str
+    ) -> t.Optional[t.Tuple[int, int, int]]:
+        if self._process_registration.uses_binary_keepalive(ip_address):
+            try:
+                return t.cast(t.Tuple[int, int, int], feedback.KEEPALIVE.unpack(data))
+            except struct.error:
+                return None
+        try:
+            frames, rendered, *confirmed = (int(n) for n in data.split())
+        except ValueError:
+            return None
+        return frames, rendered, confirmed[0] if confirmed else 0
 
     def datagram_received(self, data: bytes, addr: t.Tuple[str, int]) -> None:
         ip_address, _ = addr
-        frames, rendered = (int(n) for n in str(data, "utf-8").split())
-        if frames:
+        keepalive = self._parse(data, ip_address)
+        if keepalive is None:
+            self.malformed_keepalives += 1
+            return
+        frames, rendered, frame_number = keepalive
+        statistics = self.statistics[ip_address]
+        # Confirmations of shown frames arrive at the frame rate, only count
+        # heartbeats as keepalives
+        if frame_number:
+            statistics.confirmations += 1
+        else:
+            statistics.keepalives += 1
+        statistics.received = frames
+        statistics.shown = rendered
+        self._process_registration.response_from(ip_address)
+        self._process_registration.report_from(
+            ip_address, frames, rendered, frame_number
+        )
+
+    def log_statistics(self) -> None:
+        for ip_address, statistics in list(self.statistics.items()):
+            if not statistics.keepalives and not statistics.confirmations:
+                # Silent for a whole interval, so its process has been purged and
+                # the device starts counting from zero if it comes back
+                del self.statistics[ip_address]
+                continue
+            received, shown = statistics.interval_counts()
             log.info(
-                "%s: Received: %s Shown: %s Ratio: %s",
+                "%s: %s keepalives, %s confirmations, "
+                "received: %s shown: %s ratio: %.2f",
                 ip_address,
-                frames,
-                rendered,
-                rendered / frames,
+                statistics.keepalives,
+                statistics.confirmations,
+                received,
+                shown,
+                shown / received if received else 0.0,
             )
-        self._process_registration.response_from(ip_address)
+            statistics.start_interval()
+        if self.malformed_keepalives:
+            log.warning("Dropped %s malformed keepalives", self.malformed_keepalives)
+            self.malformed_keepalives = 0
+
+    async def log_statistics_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.statistics_interval)
+            self.log_statistics()
 
 
 def _subprocess_factory(command: str) -> subprocess.Popen:
@@ -46,10 +137,12 @@ def _subprocess_factory(command: str) -> subprocess.Popen:
 
 @dataclasses.dataclass
 class ProcessMeta:
-    process: subprocess.Popen
+    process: t.Union[subprocess.Popen, launcher.RendererProcess]
     ip_address: str
     device_id: str
     last_response: float
+    feedback_socket: str
+    binary_keepalive: bool = False
 
 
 class ProcessRegistration:
@@ -58,14 +151,45 @@ class ProcessRegistration:
         device_configs: t.Iterable[DeviceConfig],
         subprocess_factory: t.Callable[[str], subprocess.Popen] = _subprocess_factory,
         timeout: float = 3,
+        clock: t.Callable[[], float] = time.monotonic,
+        device_telemetry: t.Optional[telemetry.Telemetry] = None,
+        renderer_launcher: t.Optional[launcher.ForkLauncher] = None,
     ):
+        device_configs = list(device_configs)
         self._commands = {
             device_config.device_id: device_config.command_template
             for device_config in device_configs
+            if device_config.command_template
+        }
+        self._entry_points = {
+            device_config.device_id: device_config.entry_point
+            for device_config in device_configs
+            if device_config.entry_point
+        }
+        self._encodings = {
+            device_config.device_id: device_config.encodings
+            for device_config in device_configs
+        }
+        self._layouts = {
+            device_config.device_id: device_config.layout
+            for device_config in device_configs
+        }
+        self._calibrations = {
+            device_config.device_id: device_config.calibration
+            for device_config in device_configs
         }
         self._subprocess_factory = subprocess_factory
+        self._renderer_launcher = renderer_launcher
         self._timeout = timeout
+        self._clock = clock
+        self._telemetry = device_telemetry
         self._processes: t.Dict[str, ProcessMeta] = {}
+        # Hashed timing wheel of deadlines. Processes are only added on launch
+        # and when a purge finds they answered since, so keepalives never touch it
+        self._resolution = timeout / 10
+        self._wheel: t.Dict[int, t.List[ProcessMeta]] = {}
+        self._feedback_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._feedback_socket.settimeout(0)
         atexit.register(self.cleanup)
 
     def _kill_process(self, ip_address: str) -> None:
@@ -77,46 +201,175 @@ class ProcessRegistration:
 
     def response_from(self, ip_address: str) -> None:
         try:
-            self._processes[ip_address].last_response = time.time()
+            self._processes[ip_address].last_response = self._clock()
         except KeyError:
             pass
 
-    def purge_processes(self) -> None:
-        now = time.time()
-        dead_processes = {
-            ip
-            for ip, process in self._processes.items()
-            if now - process.last_response >= self._timeout
-        }
-        for ip_address in dead_processes:
-            log.info("Killing process for %s.", ip_address)
-            self._kill_process(ip_address)
+    def uses_binary_keepalive(self, ip_address: str) -> bool:
+        process_meta = self._processes.get(ip_address)
+        return process_meta is not None and process_meta.binary_keepalive
 
-    async def purge_forever(self) -> None:
-        while True:
-            self.purge_processes()
-            await asyncio.sleep(self._timeout / 4)
+    def _schedule(self, process_meta: ProcessMeta) -> None:
+        deadline = process_meta.last_response + self._timeout
+        slot = math.ceil(deadline / self._resolution)
+        self._wheel.setdefault(slot, []).append(process_meta)
 
-    def launch_for(self, device_id: str, ip_address: str, streaming_port: int) -> None:
+    def report_from(
+        self, ip_address: str, received: int, shown: int, frame_number: int = 0
+    ) -> None:
+        if self._telemetry is not None and not frame_number:
+            self._telemetry.record_keepalive(ip_address, received, shown)
         try:
-            base_command = self._commands[device_id]
+            feedback_socket = self._processes[ip_address].feedback_socket
         except KeyError:
-            log.warning("No process configured for device ID %s", device_id)
             return
         try:
-            base_command = base_command.format(
-                ip_address=ip_address, port=str(streaming_port)
+            self._feedback_socket.sendto(
+                feedback.Feedback(received, shown, frame_number).to_bytes(),
+                feedback_socket,
+            )
+        except OSError:
+            pass
+
+    def purge_processes(self) -> None:
+        now = self._clock()
+        due_slot = math.floor(now / self._resolution)
+        for slot in sorted(slot for slot in self._wheel if slot <= due_slot):
+            for process_meta in self._wheel.pop(slot):
+                if self._processes.get(process_meta.ip_address) is not process_meta:
+                    continue
+                if now - process_meta.last_response < self._timeout:
+                    self._schedule(process_meta)
+                    continue
+                log.info("Killing process for %s.", process_meta.ip_address)
+                self._kill_process(process_meta.ip_address)
+
+    def next_deadline(self) -> t.Optional[float]:
+        return min(self._wheel) * self._resolution if self._wheel else None
+
+    async def purge_forever(self) -> None:
+        while True:
+            self.purge_processes()
+            next_deadline = self.next_deadline()
+            delay = (
+                self._timeout
+                if next_deadline is None
+                else next_deadline - self._clock()
+            )
+            await asyncio.sleep(max(delay, self._resolution))
+
+    def negotiate_encodings(
+        self, device_id: str, capabilities: t.Collection[str]
+    ) -> t.List[str]:
+        return [
+            encoding
+            for encoding in self._encodings.get(device_id, [])
+            if encoding in capabilities
+        ]
+
+    def _launch_command(
+        self,
+        device_id: str,
+        ip_address: str,
+        streaming_port: int,
+        feedback_socket: str,
+        encodings: t.List[str],
+        layout: t.Dict[str, t.Any],
+    ) -> t.Optional[subprocess.Popen]:
+        try:
+            command = self._commands[device_id].format(
+                ip_address=ip_address,
+                port=str(streaming_port),
+                feedback_socket=feedback_socket,
+                encodings=",".join(encodings) or "raw",
+                layout=shlex.quote(json.dumps(layout)),
+                calibration=shlex.quote(
+                    json.dumps(dataclasses.asdict(self._calibrations[device_id]))
+                ),
             )
         except KeyError:
             log.warning(
                 "Invalid format string for subprocess command for device %s", device_id
             )
-            return
-        log.info("Launching process for device %s: `%s`", device_id, base_command)
+            return None
+        log.info("Launching process for device %s: `%s`", device_id, command)
+        self._kill_process(ip_address)
+        return self._subprocess_factory(command)
+
+    def _fork_renderer(
+        self,
+        device_id: str,
+        ip_address: str,
+        streaming_port: int,
+        feedback_socket: str,
+        encodings: t.List[str],
+        layout: t.Dict[str, t.Any],
+    ) -> t.Optional[launcher.RendererProcess]:
+        entry_point = self._entry_points[device_id]
+        if self._renderer_launcher is None:
+            self._renderer_launcher = launcher.ForkLauncher()
+        log.info("Forking renderer for device %s: %s", device_id, entry_point)
         self._kill_process(ip_address)
-        self._processes[ip_address] = ProcessMeta(
-            self._subprocess_factory(base_command), ip_address, device_id, time.time()
+        try:
+            return self._renderer_launcher.launch(
+                entry_point,
+                ip_address=ip_address,
+                port=streaming_port,
+                feedback_socket=feedback_socket,
+                encodings=encodings or ["raw"],
+                layout=layout,
+                calibration=self._calibrations[device_id],
+            )
+        except launcher.LauncherError as e:
+            log.warning("Can't fork renderer for device %s: %s", device_id, e)
+            return None
+
+    def launch_for(
+        self,
+        device_id: str,
+        ip_address: str,
+        streaming_port: int,
+        capabilities: t.Collection[str] = (),
+    ) -> None:
+        if self._telemetry is not None:
+            self._telemetry.record_registration(ip_address, device_id)
+        if device_id not in self._commands and device_id not in self._entry_points:
+            log.warning("No process configured for device ID %s", device_id)
+            return
+        feedback_socket = feedback.socket_path(device_id, ip_address)
+        encodings = self.negotiate_encodings(device_id, capabilities)
+        layout = self._layouts.get(device_id) or {}
+        process: t.Union[subprocess.Popen, launcher.RendererProcess, None]
+        if device_id in self._entry_points:
+            process = self._fork_renderer(
+                device_id,
+                ip_address,
+                streaming_port,
+                feedback_socket,
+                encodings,
+                layout,
+            )
+        else:
+            process = self._launch_command(
+                device_id,
+                ip_address,
+                streaming_port,
+                feedback_socket,
+                encodings,
+                layout,
+            )
+        if process is None:
+            return
+        process_meta = ProcessMeta(
+            process,
+            ip_address,
+            device_id,
+            self._clock(),
+            feedback_socket,
+            feedback.BINARY_KEEPALIVE in capabilities,
         )
+        self._processes[ip_address] = process_meta
+        self._schedule(process_meta)
 
     def cleanup(self) -> None:
         for process_meta in self._processes.values():
@@ -126,6 +379,8 @@ class ProcessRegistration:
 class ConnectionProtocol(asyncio.Protocol):
     PORT_SIZE = 2
     SEPPERATOR = b"\n"
+    CAPABILITIES_SEPARATOR = b" "
+    CAPABILITY_SEPARATOR = b","
     transport: asyncio.Transport
 
     def __init__(self, process_registration: ProcessRegistration, response_port: int):
@@ -139,9 +394,17 @@ class ConnectionProtocol(asyncio.Protocol):
 
     def _register_device(self, registration_bytes: bytes) -> None:
         port = int.from_bytes(registration_bytes[: self.PORT_SIZE], BYTEORDER)
-        device_id = str(registration_bytes[self.PORT_SIZE :], "utf-8")
+        device_id_bytes, _, capability_bytes = registration_bytes[
+            self.PORT_SIZE :
+        ].partition(self.CAPABILITIES_SEPARATOR)
+        device_id = str(device_id_bytes, "utf-8")
+        capabilities = [
+            str(capability, "utf-8")
+            for capability in capability_bytes.split(self.CAPABILITY_SEPARATOR)
+            if capability
+        ]
         ip_address, _ = self.transport.get_extra_info("peername")
-        self._process_registration.launch_for(device_id, ip_address, port)
+        self._process_registration.launch_for(device_id, ip_address, port, capabilities)
         self.transport.write(
             int.to_bytes(self.response_port, self.PORT_SIZE, BYTEORDER)
         )
@@ -164,6 +427,12 @@ class Config:
     port: int
     udp_port: int
     devices: t.List[DeviceConfig]
+    statistics_interval: float = 10.0
+    telemetry_socket: str = dataclasses.field(default_factory=telemetry.socket_path)
+    telemetry_capacity: int = telemetry.DEFAULT_CAPACITY
+    preload: t.List[str] = dataclasses.field(
+        default_factory=lambda: list(launcher.DEFAULT_PRELOAD)
+    )
 
     @classmethod
     def from_dict(cls, dict_: t.Dict[str, t.Any]) -> Config:
@@ -172,6 +441,10 @@ class Config:
             dict_["port"],
             dict_["udp_port"],
             [DeviceConfig.from_dict(d) for d in dict_["devices"]],
+            dict_.get("statistics_interval", 10.0),
+            dict_.get("telemetry_socket", telemetry.socket_path()),
+            dict_.get("telemetry_capacity", telemetry.DEFAULT_CAPACITY),
+            dict_.get("preload", list(launcher.DEFAULT_PRELOAD)),
         )
 
     @classmethod
@@ -183,26 +456,57 @@ class Config:
 @dataclasses.dataclass
 class DeviceConfig:
     device_id: str
-    command_template: str
+    command_template: str = ""
+    encodings: t.List[str] = dataclasses.field(default_factory=list)
+    layout: t.Optional[t.Dict[str, t.Any]] = None
+    entry_point: t.Optional[str] = None
+    calibration: gamma_table.Calibration = gamma_table.Calibration()
 
     @classmethod
     def from_dict(cls, dict_: t.Dict[str, t.Any]) -> DeviceConfig:
         return cls(
             dict_["device_id"],
-            dict_["command_template"],
+            dict_.get("command_template", ""),
+            dict_.get("encodings", []),
+            dict_.get("layout"),
+            dict_.get("entry_point"),
+            gamma_table.Calibration.from_dict(dict_.get("calibration", {})),
         )
 
 
 class Application:
     def __init__(self, config: Config):
         self.config = config
-        self.process_registration = ProcessRegistration(config.devices)
+        self.telemetry = telemetry.Telemetry(config.telemetry_capacity)
+        entry_point_modules = [
+            launcher.parse_entry_point(device_config.entry_point)[0]
+            for device_config in config.devices
+            if device_config.entry_point
+        ]
+        # Forked renderers run the main module again unless it's airpixel.__main__
+        self.renderer_launcher = (
+            launcher.ForkLauncher(
+                config.preload + ["airpixel.framework"] + entry_point_modules
+            )
+            if entry_point_modules
+            else None
+        )
+        self.process_registration = ProcessRegistration(
+            config.devices,
+            device_telemetry=self.telemetry,
+            renderer_launcher=self.renderer_launcher,
+        )
 
     async def run_forever(self) -> None:
+        if self.renderer_launcher is not None:
+            self.renderer_launcher.start()
         loop = asyncio.get_running_loop()
+        keepalive_protocol = KeepaliveProtocol(
+            self.process_registration, self.config.statistics_interval
+        )
 
         await loop.create_datagram_endpoint(
-            lambda: KeepaliveProtocol(self.process_registration),
+            lambda: keepalive_protocol,
             local_addr=(self.config.address, self.config.udp_port),
             family=socket.AF_INET,
         )
@@ -215,7 +519,10 @@ class Application:
 
         async with server:
             await asyncio.gather(
-                server.serve_forever(), self.process_registration.purge_forever()
+                server.serve_forever(),
+                self.process_registration.purge_forever(),
+                keepalive_protocol.log_statistics_forever(),
+                self.telemetry.serve_forever(self.config.telemetry_socket),
             )
 
 
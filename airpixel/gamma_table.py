@@ -1,264 +1,86 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import typing as t
+
 import numpy as np  # type: ignore
 
-# Taken from https://learn.adafruit.com/led-tricks-gamma-correction/the-quick-fix
-GAMMA_TABLE = np.array(
-    [
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        4,
-        4,
-        4,
-        4,
-        4,
-        5,
-        5,
-        5,
-        5,
-        6,
-        6,
-        6,
-        6,
-        7,
-        7,
-        7,
-        7,
-        8,
-        8,
-        8,
-        9,
-        9,
-        9,
-        10,
-        10,
-        10,
-        11,
-        11,
-        11,
-        12,
-        12,
-        13,
-        13,
-        13,
-        14,
-        14,
-        15,
-        15,
-        16,
-        16,
-        17,
-        17,
-        18,
-        18,
-        19,
-        19,
-        20,
-        20,
-        21,
-        21,
-        22,
-        22,
-        23,
-        24,
-        24,
-        25,
-        25,
-        26,
-        27,
-        27,
-        28,
-        29,
-        29,
-        30,
-        31,
-        32,
-        32,
-        33,
-        34,
-        35,
-        35,
-        36,
-        37,
-        38,
-        39,
-        39,
-        40,
-        41,
-        42,
-        43,
-        44,
-        45,
-        46,
-        47,
-        48,
-        49,
-        50,
-        50,
-        51,
-        52,
-        54,
-        55,
-        56,
-        57,
-        58,
-        59,
-        60,
-        61,
-        62,
-        63,
-        64,
-        66,
-        67,
-        68,
-        69,
-        70,
-        72,
-        73,
-        74,
-        75,
-        77,
-        78,
-        79,
-        81,
-        82,
-        83,
-        85,
-        86,
-        87,
-        89,
-        90,
-        92,
-        93,
-        95,
-        96,
-        98,
-        99,
-        101,
-        102,
-        104,
-        105,
-        107,
-        109,
-        110,
-        112,
-        114,
-        115,
-        117,
-        119,
-        120,
-        122,
-        124,
-        126,
-        127,
-        129,
-        131,
-        133,
-        135,
-        137,
-        138,
-        140,
-        142,
-        144,
-        146,
-        148,
-        150,
-        152,
-        154,
-        156,
-        158,
-        160,
-        162,
-        164,
-        167,
-        169,
-        171,
-        173,
-        175,
-        177,
-        180,
-        182,
-        184,
-        186,
-        189,
-        191,
-        193,
-        196,
-        198,
-        200,
-        203,
-        205,
-        208,
-        210,
-        213,
-        215,
-        218,
-        220,
-        223,
-        225,
-        228,
-        231,
-        233,
-        236,
-        239,
-        241,
-        244,
-        247,
-        249,
-        252,
-        255,
-    ],
-    dtype="uint8",
-)
+INPUT_LEVELS = 256
+PRECISE_INPUT_LEVELS = 65536
+DEFAULT_GAMMA = 2.8
+
+
+@dataclasses.dataclass(frozen=True)
+class Calibration:
+    gamma: float = DEFAULT_GAMMA
+    white_balance: t.Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0)
+    max_brightness: float = 1.0
+
+    @classmethod
+    def from_dict(cls, dict_: t.Dict[str, t.Any]) -> Calibration:
+        return cls(
+            dict_.get("gamma", DEFAULT_GAMMA),
+            tuple(dict_.get("white_balance", (1.0, 1.0, 1.0, 1.0))),
+            dict_.get("max_brightness", 1.0),
+        )
+
+    def channel_scale(self, channel: int) -> float:
+        try:
+            white_balance = self.white_balance[channel]
+        except IndexError:
+            white_balance = 1.0
+        return white_balance * self.max_brightness
+
+
+@functools.lru_cache(maxsize=None)
+def channel_table(gamma: float, scale: float = 1.0) -> np.ndarray:
+    levels = np.arange(INPUT_LEVELS) / (INPUT_LEVELS - 1)
+    table = np.floor(levels**gamma * 255 * scale + 0.5)
+    table = np.clip(table, 0, 255).astype("uint8")
+    table.setflags(write=False)
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def precise_channel_table(gamma: float, scale: float = 1.0) -> np.ndarray:
+    levels = np.arange(PRECISE_INPUT_LEVELS) / (PRECISE_INPUT_LEVELS - 1)
+    table = np.clip(levels**gamma * 255 * scale, 0, 255).astype("float32")
+    table.setflags(write=False)
+    return table
+
+
+class LookupTable:
+    def __init__(self, channel_order: t.Sequence[int], tables: np.ndarray):
+        self.channel_order = np.array(channel_order, dtype=np.intp)
+        self.levels = tables.shape[1]
+        self.table = np.ascontiguousarray(tables).ravel()
+        self._offsets = np.arange(len(channel_order), dtype=np.intp) * self.levels
+
+    def apply(
+        self, frame: np.ndarray, out: t.Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        index = np.add(frame[:, self.channel_order], self._offsets, dtype=np.intp)
+        return self.table.take(index.ravel(), out=out)
+
+
+@functools.lru_cache(maxsize=None)
+def lookup_table(
+    channel_order: t.Tuple[int, ...],
+    calibration: Calibration = Calibration(),
+    precise: bool = False,
+) -> LookupTable:
+    table_factory = precise_channel_table if precise else channel_table
+    return LookupTable(
+        channel_order,
+        np.stack(
+            [
+                table_factory(calibration.gamma, calibration.channel_scale(channel))
+                for channel in channel_order
+            ]
+        ),
+    )
+
+
+# Matches https://learn.adafruit.com/led-tricks-gamma-correction/the-quick-fix
+GAMMA_TABLE = channel_table(DEFAULT_GAMMA)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import typing as t
+from multiprocessing import forkserver
+
+DEFAULT_PRELOAD = ["numpy", "airpixel.client"]
+
+
+class LauncherError(Exception):
+    pass
+
+
+class EntryPointError(LauncherError):
+    pass
+
+
+def parse_entry_point(entry_point: str) -> t.Tuple[str, str]:
+    module_name, separator, function_name = entry_point.partition(":")
+    if not module_name or not separator or not function_name:
+        raise EntryPointError(f"Expected module:function, got {entry_point!r}")
+    return module_name, function_name
+
+
+def load_entry_point(entry_point: str) -> t.Callable[..., t.Any]:
+    module_name, function_name = parse_entry_point(entry_point)
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise EntryPointError(f"Can't import {module_name}") from e
+    try:
+        function: t.Callable[..., t.Any] = getattr(module, function_name)
+    except AttributeError as e:
+        raise EntryPointError(f"{module_name} has no {function_name}") from e
+    return function
+
+
+def _run(entry_point: str, arguments: t.Dict[str, t.Any]) -> None:
+    load_entry_point(entry_point)(**arguments)
+
+
+class RendererProcess:
+    # Quacks like the subprocess.Popen of the shell launcher
+    def __init__(self, process: multiprocessing.process.BaseProcess):
+        self._process = process
+
+    @property
+    def pid(self) -> t.Optional[int]:
+        return self._process.pid
+
+    def poll(self) -> t.Optional[int]:
+        return self._process.exitcode
+
+    def kill(self) -> None:
+        self._process.kill()
+
+    def communicate(self) -> t.Tuple[None, None]:
+        self._process.join()
+        return None, None
+
+
+class ForkLauncher:
+    def __init__(self, preload: t.Iterable[str] = DEFAULT_PRELOAD):
+        self.preload = list(preload)
+        self._context = multiprocessing.get_context("forkserver")
+        # Only has an effect before the fork server runs, see start()
+        self._context.set_forkserver_preload(self.preload)
+
+    def start(self) -> None:
+        # Pay for the interpreter and the imports now instead of on the first
+        # registration
+        forkserver.ensure_running()
+
+    def launch(self, entry_point: str, **arguments: t.Any) -> RendererProcess:
+        parse_entry_point(entry_point)
+        process = self._context.Process(
+            target=_run, args=(entry_point, arguments), name=entry_point
+        )
+        process.start()
+        return RendererProcess(process)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import typing as t
+
+import numpy as np  # type: ignore
+
+
+class LayoutError(Exception):
+    pass
+
+
+class Layout:
+    def __init__(self, coordinates: np.ndarray):
+        coordinates = np.array(coordinates, dtype=np.float64, ndmin=2)
+        if (
+            coordinates.ndim != 2
+            or not len(coordinates)
+            or coordinates.shape[1] not in (2, 3)
+        ):
+            raise LayoutError(
+                f"Expected coordinates of shape (N, 2) or (N, 3), "
+                f"got {coordinates.shape}"
+            )
+        coordinates.setflags(write=False)
+        self.coordinates = coordinates
+        span = np.ptp(coordinates, axis=0)
+        span[span == 0] = 1
+        self.normalized = (coordinates - coordinates.min(axis=0)) / span
+        self.normalized.setflags(write=False)
+        self._index_maps: t.Dict[t.Tuple[int, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.coordinates.shape[1])
+
+    def index_map(self, shape: t.Tuple[int, int]) -> np.ndarray:
+        shape = (int(shape[0]), int(shape[1]))
+        try:
+            return self._index_maps[shape]
+        except KeyError:
+            pass
+        height, width = shape
+        columns = np.rint(self.normalized[:, 0] * (width - 1)).astype(np.intp)
+        rows = np.rint(self.normalized[:, 1] * (height - 1)).astype(np.intp)
+        index = rows * width + columns
+        index.setflags(write=False)
+        self._index_maps[shape] = index
+        return index
+
+    def sample(
+        self, canvas: np.ndarray, out: t.Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        index = self.index_map(canvas.shape[:2])
+        pixels = canvas.reshape((-1,) + canvas.shape[2:])
+        return pixels.take(index, axis=0, out=out)
+
+
+def ring(
+    pixel_count: int,
+    radius: float = 1.0,
+    start_angle: float = 0.0,
+    clockwise: bool = False,
+) -> Layout:
+    direction = -1 if clockwise else 1
+    angles = np.radians(start_angle) + direction * np.linspace(
+        0, 2 * np.pi, pixel_count, endpoint=False
+    )
+    return Layout(radius * np.stack((np.cos(angles), np.sin(angles)), axis=1))
+
+
+def grid(
+    width: int, height: int, serpentine: bool = False, vertical: bool = False
+) -> Layout:
+    length, count = (height, width) if vertical else (width, height)
+    strip = np.arange(length * count)
+    lines, positions = np.divmod(strip, length)
+    if serpentine:
+        positions = np.where(lines % 2, length - 1 - positions, positions)
+    columns, rows = (lines, positions) if vertical else (positions, lines)
+    return Layout(np.stack((columns, rows), axis=1))
+
+
+def from_file(file_name: str, delimiter: t.Optional[str] = None) -> Layout:
+    try:
+        coordinates = np.loadtxt(file_name, delimiter=delimiter, ndmin=2)
+    except (OSError, ValueError) as e:
+        raise LayoutError(f"Can't load coordinates from {file_name}") from e
+    return Layout(coordinates)
+
+
+LAYOUT_TYPES: t.Dict[str, t.Callable[..., Layout]] = {
+    "ring": ring,
+    "grid": grid,
+    "file": from_file,
+}
+
+
+def from_dict(dict_: t.Dict[str, t.Any]) -> Layout:
+    options = dict(dict_)
+    layout_type = options.pop("type", None)
+    try:
+        factory = LAYOUT_TYPES[layout_type]
+    except KeyError as e:
+        raise LayoutError(f"Unknown layout type {layout_type!r}") from e
+    try:
+        return factory(**options)
+    except TypeError as e:
+        raise LayoutError(f"Invalid options for {layout_type} layout") from e
+
+
+def from_json(text: str) -> Layout:
+    try:
+        return from_dict(json.loads(text))
+    except json.JSONDecodeError as e:
+        raise LayoutError(f"Invalid layout {text!r}") from e
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+# Mirrors TIMEOUT of the Arduino firmware, in seconds
+DEVICE_TIMEOUT = 3.0
+
+
+class PacingError(Exception):
+    pass
+
+
+@enum.unique
+class FramePolicy(str, enum.Enum):
+    BLOCK = "block"
+    SKIP = "skip"
+    LATEST = "latest"
+
+
+@dataclasses.dataclass
+class PacingReport:
+    target_fps: float
+    achieved_fps: float
+    sent_frames: int
+    skipped_frames: int
+    jitter_bins: np.ndarray
+    jitter_histogram: np.ndarray
+
+    def __str__(self) -> str:
+        histogram = " ".join(
+            f"<{upper * 1000:g}ms:{count}"
+            for upper, count in zip(self.jitter_bins, self.jitter_histogram)
+        )
+        return (
+            f"{self.achieved_fps:.1f}/{self.target_fps:g} FPS, "
+            f"sent: {self.sent_frames} skipped: {self.skipped_frames}, "
+            f"jitter {histogram} more:{self.jitter_histogram[-1]}"
+        )
+
+
+class FramePacer:
+    JITTER_BINS = np.array([0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05])
+
+    def __init__(
+        self,
+        target_fps: float,
+        policy: FramePolicy = FramePolicy.BLOCK,
+        history: int = 1024,
+        clock: t.Callable[[], float] = time.monotonic,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ):
+        self.target_fps = target_fps
+        self.period = 1 / target_fps
+        self.policy = FramePolicy(policy)
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline: t.Optional[float] = None
+        self._sent_times = np.zeros(history)
+        self._jitter = np.zeros(history)
+        self.sent_frames = 0
+        self.skipped_frames = 0
+
+    def set_target_fps(self, target_fps: float) -> None:
+        self.target_fps = target_fps
+        self.period = 1 / target_fps
+
+    def due(self) -> bool:
+        return self._deadline is None or self._clock() >= self._deadline
+
+    def remaining(self) -> float:
+        if self._deadline is None:
+            return 0.0
+        return max(self._deadline - self._clock(), 0.0)
+
+    def wait(self) -> None:
+        delay = self.remaining()
+        if delay > 0:
+            self._sleep(delay)
+
+    def mark_skipped(self) -> None:
+        self.skipped_frames += 1
+
+    def mark_sent(self) -> None:
+        now = self._clock()
+        deadline = now if self._deadline is None else self._deadline
+        index = self.sent_frames % self._sent_times.size
+        self._sent_times[index] = now
+        self._jitter[index] = abs(now - deadline)
+        self.sent_frames += 1
+        self._deadline = deadline + self.period
+        if self._deadline <= now:
+            self._deadline = now + self.period
+
+    def report(self) -> PacingReport:
+        samples = min(self.sent_frames, self._sent_times.size)
+        sent_times = self._sent_times[:samples]
+        elapsed = sent_times.max() - sent_times.min() if samples else 0
+        histogram = np.bincount(
+            np.searchsorted(self.JITTER_BINS, self._jitter[:samples], side="right"),
+            minlength=self.JITTER_BINS.size + 1,
+        )
+        return PacingReport(
+            self.target_fps,
+            (samples - 1) / elapsed if elapsed else 0.0,
+            self.sent_frames,
+            self.skipped_frames,
+            self.JITTER_BINS,
+            histogram,
+        )
+
+
+class IdleSuppressor:
+    def __init__(
+        self,
+        refresh_interval: float = 1.0,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        if refresh_interval >= DEVICE_TIMEOUT:
+            raise PacingError(
+                f"Refresh interval must be shorter than the device timeout "
+                f"({DEVICE_TIMEOUT}s)"
+            )
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._last_payload = np.zeros(0, dtype=np.uint8)
+        self._last_sent = -np.inf
+        self.sent_frames = 0
+        self.suppressed_frames = 0
+
+    def suppress(self, payload: np.ndarray) -> bool:
+        if self._clock() - self._last_sent < self.refresh_interval and np.array_equal(
+            payload, self._last_payload
+        ):
+            self.suppressed_frames += 1
+            return True
+        return False
+
+    def mark_sent(self, payload: np.ndarray) -> None:
+        if self._last_payload.shape != payload.shape:
+            self._last_payload = payload.copy()
+        else:
+            np.copyto(self._last_payload, payload)
+        self._last_sent = self._clock()
+        self.sent_frames += 1
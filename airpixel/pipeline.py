@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import client, gamma_table, layout, power
+
+Frames = t.Iterator[np.ndarray]
+Stage = t.Callable[[Frames], Frames]
+
+
+@dataclasses.dataclass
+class StageTiming:
+    name: str
+    frames: int
+    total: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.frames if self.frames else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.frames} frames, "
+            f"mean {self.mean * 1e6:.1f}us total {self.total:.3f}s"
+        )
+
+
+def source(
+    render: t.Callable[[int, np.ndarray], None],
+    pixel_count: int,
+    channels: int = 3,
+    dtype: t.Any = np.float32,
+) -> Frames:
+    frame = np.zeros((pixel_count, channels), dtype=dtype)
+    for frame_number in itertools.count():
+        render(frame_number, frame)
+        yield frame
+
+
+def transform(function: t.Callable[[np.ndarray, np.ndarray], None]) -> Stage:
+    def stage(frames: Frames) -> Frames:
+        out = np.zeros((0, 0))
+        for frame in frames:
+            if out.shape != frame.shape or out.dtype != frame.dtype:
+                out = np.empty_like(frame)
+            function(frame, out)
+            yield out
+
+    stage.__name__ = getattr(function, "__name__", "transform")
+    return stage
+
+
+def resample(led_layout: layout.Layout) -> Stage:
+    def gather(frames: Frames) -> Frames:
+        out = np.zeros((0, 0))
+        for canvas in frames:
+            shape = (len(led_layout),) + canvas.shape[2:]
+            if out.shape != shape or out.dtype != canvas.dtype:
+                out = np.empty(shape, dtype=canvas.dtype)
+            yield led_layout.sample(canvas, out=out)
+
+    return gather
+
+
+def color_conversion(color_method: t.Type[client.ColorMethod]) -> Stage:
+    def convert(frames: Frames) -> Frames:
+        for frame in frames:
+            yield color_method.expand(frame)
+
+    return convert
+
+
+def calibrate(
+    color_method: t.Type[client.ColorMethod],
+    calibration: gamma_table.Calibration = gamma_table.Calibration(),
+    dither: bool = False,
+) -> Stage:
+    lookup_table = gamma_table.lookup_table(
+        color_method.CHANNEL_ORDER, calibration, precise=dither
+    )
+    temporal_dither = client.TemporalDither() if dither else None
+
+    def apply_lookup_table(frames: Frames) -> Frames:
+        out = np.zeros((0, 0), dtype=np.uint8)
+        for frame in frames:
+            if out.shape != frame.shape:
+                out = np.empty(frame.shape, dtype=np.uint8)
+            if temporal_dither is None:
+                lookup_table.apply(client.quantize(frame, np.uint8), out=out.ravel())
+            else:
+                temporal_dither.quantize(
+                    lookup_table.apply(client.quantize(frame, np.uint16)),
+                    out=out.ravel(),
+                )
+            yield out
+
+    return apply_lookup_table
+
+
+def limit_power(power_limiter: power.PowerLimiter) -> Stage:
+    def limit(frames: Frames) -> Frames:
+        for frame in frames:
+            yield power_limiter.apply(frame)
+
+    return limit
+
+
+def transport(air_client: client.AirClient) -> Stage:
+    def send(frames: Frames) -> Frames:
+        for frame in frames:
+            air_client.show_bytes(frame.ravel().data)
+            yield frame
+
+    return send
+
+
+class Pipeline:
+    def __init__(
+        self,
+        frames: t.Iterable[np.ndarray],
+        *stages: Stage,
+        clock: t.Callable[[], float] = time.perf_counter,
+    ):
+        self._clock = clock
+        self.names = ["source"] + [
+            getattr(stage, "__name__", type(stage).__name__) for stage in stages
+        ]
+        self._frame_counts = np.zeros(len(self.names), dtype=np.int64)
+        self._totals = np.zeros(len(self.names))
+        output = self._timed(iter(frames), 0)
+        for index, stage in enumerate(stages, 1):
+            output = self._timed(stage(output), index)
+        self._output = output
+
+    def __iter__(self) -> Frames:
+        return self._output
+
+    def __next__(self) -> np.ndarray:
+        return next(self._output)
+
+    def _timed(self, frames: Frames, index: int) -> Frames:
+        # Pulling from a stage includes the time spent in all stages before it
+        while True:
+            start = self._clock()
+            try:
+                frame = next(frames)
+            except StopIteration:
+                return
+            self._totals[index] += self._clock() - start
+            self._frame_counts[index] += 1
+            yield frame
+
+    def run(self, frame_count: t.Optional[int] = None) -> None:
+        for _ in itertools.islice(self._output, frame_count):
+            pass
+
+    def report(self) -> t.List[StageTiming]:
+        own_totals = np.diff(self._totals, prepend=0.0)
+        return [
+            StageTiming(name, int(frames), float(total))
+            for name, frames, total in zip(self.names, self._frame_counts, own_totals)
+        ]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np  # type: ignore
+
+# Typical draw of a WS2812 channel at full duty, in milliamperes
+DEFAULT_CHANNEL_CURRENT = 20.0
+# Typical quiescent draw of a WS2812 with all channels off, in milliamperes
+DEFAULT_IDLE_CURRENT = 1.0
+
+
+class PowerError(Exception):
+    pass
+
+
+class PowerLimiter:
+    def __init__(
+        self,
+        budget: float,
+        channel_currents: t.Sequence[float] = (DEFAULT_CHANNEL_CURRENT,) * 3,
+        idle_current: float = DEFAULT_IDLE_CURRENT,
+        recovery: float = 0.1,
+    ):
+        if not 0 < recovery <= 1:
+            raise PowerError("Recovery must be in (0, 1]")
+        self.budget = budget
+        self.channel_currents = np.array(channel_currents, dtype=np.float32) / 255
+        self._weights = np.zeros(0, dtype=np.float32)
+        self.idle_current = idle_current
+        self.recovery = recovery
+        self.scale = 1.0
+        self.current = 0.0
+        self.limited_frames = 0
+
+    @property
+    def channels(self) -> int:
+        return int(self.channel_currents.size)
+
+    def estimate(self, payload: np.ndarray) -> float:
+        payload = payload.ravel()
+        if self._weights.size != payload.size:
+            # A flat dot product is much faster than per-channel sums over (N, C)
+            self._weights = np.tile(
+                self.channel_currents, payload.size // self.channels
+            )
+        pixel_count = payload.size // self.channels
+        return float(self._weights.dot(payload)) + pixel_count * self.idle_current
+
+    def _target_scale(self, current: float, idle: float) -> float:
+        if current <= self.budget:
+            return 1.0
+        return max(self.budget - idle, 0.0) / (current - idle)
+
+    def apply(self, payload: np.ndarray) -> np.ndarray:
+        idle = payload.size // self.channels * self.idle_current
+        self.current = self.estimate(payload)
+        target = self._target_scale(self.current, idle)
+        # Dim at once to protect the supply, brighten slowly to avoid flicker
+        if target < self.scale:
+            self.scale = target
+        else:
+            self.scale += (target - self.scale) * self.recovery
+            if 1.0 - self.scale < 1 / 255:
+                self.scale = 1.0
+        if self.scale < 1.0:
+            np.multiply(payload, self.scale, out=payload, casting="unsafe")
+            self.limited_frames += 1
+        return payload
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+import time
+import typing as t
+
+from airpixel import client
+
+MAGIC = b"AIRPXREC"
+VERSION = 1
+FILE_HEADER = struct.Struct(">8sI")
+# Seconds since the first recorded frame and payload size
+FRAME_HEADER = struct.Struct(">dI")
+
+
+class RecordingError(Exception):
+    pass
+
+
+class RecordingFormatError(RecordingError):
+    pass
+
+
+class FrameRecorder:
+    def __init__(
+        self, file_name: str, clock: t.Callable[[], float] = time.monotonic
+    ) -> None:
+        self.file_name = file_name
+        self._clock = clock
+        self._file = open(file_name, "wb")
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._start: t.Optional[float] = None
+        self.recorded_frames = 0
+
+    def record(self, payload: t.Union[bytes, memoryview]) -> None:
+        now = self._clock()
+        if self._start is None:
+            self._start = now
+        payload = memoryview(payload).cast("B")
+        self._file.write(FRAME_HEADER.pack(now - self._start, len(payload)))
+        self._file.write(payload)
+        self.recorded_frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> FrameRecorder:
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+
+class Recording:
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        with open(file_name, "rb") as file_:
+            try:
+                self._map = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise RecordingFormatError(f"{file_name} is empty") from e
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        try:
+            magic, version = FILE_HEADER.unpack_from(self._map)
+        except struct.error as e:
+            raise RecordingFormatError(f"{file_name} is not a recording") from e
+        if magic != MAGIC or version != VERSION:
+            raise RecordingFormatError(
+                f"{file_name} is not a version {VERSION} recording"
+            )
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError as e:
+            raise RecordingError(
+                "Payloads of this recording are still in use, copy them with bytes()"
+            ) from e
+
+    def __enter__(self) -> Recording:
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    def frames(self) -> t.Iterator[t.Tuple[float, memoryview]]:
+        # Payloads are views into the file and only valid until the next frame
+        data = memoryview(self._map)
+        try:
+            position = FILE_HEADER.size
+            while position < len(data):
+                try:
+                    timestamp, size = FRAME_HEADER.unpack_from(data, position)
+                except struct.error as e:
+                    raise RecordingFormatError("Truncated frame header") from e
+                position += FRAME_HEADER.size
+                if position + size > len(data):
+                    raise RecordingFormatError("Truncated frame")
+                payload = data[position : position + size]
+                try:
+                    yield timestamp, payload
+                finally:
+                    payload.release()
+                position += size
+        finally:
+            data.release()
+
+    def replay(
+        self,
+        air_clients: t.Sequence[client.AirClient],
+        speed: t.Optional[float] = 1.0,
+        clock: t.Callable[[], float] = time.monotonic,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ) -> int:
+        start = clock()
+        replayed_frames = 0
+        for timestamp, payload in self.frames():
+            if speed is not None:
+                delay = start + timestamp / speed - clock()
+                if delay > 0:
+                    sleep(delay)
+            for air_client in air_clients:
+                air_client.show_bytes(payload)
+            replayed_frames += 1
+        return replayed_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded frame stream")
+    parser.add_argument("file_name")
+    parser.add_argument("devices", nargs="+", metavar="IP:PORT")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--fast", action="store_true", help="send as fast as possible")
+    arguments = parser.parse_args()
+
+    air_clients = []
+    for device in arguments.devices:
+        ip_address, port = device.rsplit(":", 1)
+        air_clients.append(client.AirClient(ip_address, int(port)))
+    with Recording(arguments.file_name) as recording:
+        recording.replay(air_clients, None if arguments.fast else arguments.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,239 @@
-import socket
-import sys
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import logging
+import struct
 import time
+import typing as t
 
+from airpixel import feedback
 
-def main() -> None:
-    name = sys.argv[1]
+log = logging.getLogger(__name__)
+
+# Mirror config.h and constants.h of the Arduino firmware
+LOCAL_UDP_PORT = 50001
+PIXEL_COUNT = 288
+HEARTBEAT_DELTA = 0.1
+TIMEOUT = 3.0
+FRAME_NUMBER = struct.Struct(">Q")
+PORT_SIZE = 2
+RECONNECT_DELAY = 1.0
+
+
+class SimulatedDevice(asyncio.DatagramProtocol):
+    def __init__(
+        self,
+        device_id: str,
+        server_ip: str = "127.0.0.1",
+        server_port: int = 50000,
+        local_ip: str = "127.0.0.1",
+        local_port: int = LOCAL_UDP_PORT,
+        pixel_count: int = PIXEL_COUNT,
+        channels: int = 3,
+        confirm: bool = False,
+        binary_keepalive: bool = False,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.device_id = device_id
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.local_ip = local_ip
+        self.local_port = local_port
+        self.pixels = bytearray(pixel_count * channels)
+        self.confirm = confirm
+        self.binary_keepalive = binary_keepalive
+        self._clock = clock
+        self.transport: t.Optional[asyncio.DatagramTransport] = None
+        self.response_port: t.Optional[int] = None
+        self.active = False
+        self.registrations = 0
+        self._available = False
+        self._show_scheduled = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self.received_frames = 0
+        self.shown_frames = 0
+        self.highest_frame_number = 0
+        self.last_message = self._clock()
+
+    def activate(self) -> None:
+        # A fresh ActiveState starts with all counters at zero
+        self.active = True
+        self._reset()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = t.cast(asyncio.DatagramTransport, transport)
+        _, self.local_port = transport.get_extra_info("sockname")
+
+    def datagram_received(self, data: bytes, addr: t.Tuple[str, int]) -> None:
+        if not self.active:
+            return
+        self.receive(data)
+        # Packets read in the same pass of the event loop are shown once, like
+        # all packets drained in one ActiveState::performAction
+        if self._available and not self._show_scheduled:
+            self._show_scheduled = True
+            asyncio.get_running_loop().call_soon(self.show)
+
+    def receive(self, data: bytes) -> None:
+        self.received_frames += 1
+        try:
+            (frame_number,) = FRAME_NUMBER.unpack_from(data)
+        except struct.error:
+            return
+        if frame_number > self.highest_frame_number:
+            payload = memoryview(data)[FRAME_NUMBER.size :]
+            size = min(len(payload), len(self.pixels))
+            self.pixels[:size] = payload[:size]
+            self.highest_frame_number = frame_number
+            self._available = True
+
+    def show(self) -> None:
+        self._show_scheduled = False
+        if not self._available:
+            return
+        self._available = False
+        self.shown_frames += 1
+        self.last_message = self._clock()
+        if self.confirm:
+            self._send_to_server(self.confirmation())
+
+    def timed_out(self) -> bool:
+        return self._clock() - self.last_message > TIMEOUT
+
+    def heartbeat(self) -> bytes:
+        if self.binary_keepalive:
+            return feedback.KEEPALIVE.pack(self.received_frames, self.shown_frames, 0)
+        return bytes(f"{self.received_frames} {self.shown_frames}", "utf-8")
+
+    def confirmation(self) -> bytes:
+        if self.binary_keepalive:
+            return feedback.KEEPALIVE.pack(
+                self.received_frames, self.shown_frames, self.highest_frame_number
+            )
+        return self.heartbeat() + bytes(f" {self.highest_frame_number}", "utf-8")
 
-    with socket.create_connection(("0.0.0.0", 50000)) as sock:
-        sock.send(int.to_bytes(54325, 2, "big") + bytes(name, "utf-8") + b"\n")
-        port_bytes = sock.recv(8)
-        port = int.from_bytes(port_bytes, byteorder="big")
+    def _send_to_server(self, message: bytes) -> None:
+        if self.transport is not None and self.response_port is not None:
+            self.transport.sendto(message, (self.server_ip, self.response_port))
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(0)
+    def registration(self) -> bytes:
+        capabilities = f" {feedback.BINARY_KEEPALIVE}" if self.binary_keepalive else ""
+        return (
+            self.local_port.to_bytes(PORT_SIZE, "big")
+            + bytes(self.device_id + capabilities, "utf-8")
+            + b"\n"
+        )
+
+    async def register(self) -> int:
+        reader, writer = await asyncio.open_connection(
+            self.server_ip, self.server_port, local_addr=(self.local_ip, 0)
+        )
+        try:
+            writer.write(self.registration())
+            await writer.drain()
+            port_bytes = await reader.readexactly(PORT_SIZE)
+        finally:
+            writer.close()
+        self.registrations += 1
+        return int.from_bytes(port_bytes, "big")
+
+    async def stay_active(self, response_port: int) -> None:
+        self.response_port = response_port
+        self.activate()
+        while not self.timed_out():
+            self._send_to_server(self.heartbeat())
+            await asyncio.sleep(HEARTBEAT_DELTA)
+        self.active = False
+
+    async def run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(
+            lambda: self, local_addr=(self.local_ip, self.local_port)
+        )
+        while True:
+            try:
+                response_port = await self.register()
+            except (OSError, asyncio.IncompleteReadError) as e:
+                log.debug("%s: Registration failed: %s", self.local_ip, e)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            await self.stay_active(response_port)
+
+
+def simulated_devices(
+    device_id: str,
+    count: int,
+    first_ip: str = "127.1.0.1",
+    **device_kwargs: t.Any,
+) -> t.List[SimulatedDevice]:
+    # The framework tells devices apart by IP, every loopback address works
+    first = ipaddress.IPv4Address(first_ip)
+    return [
+        SimulatedDevice(device_id, local_ip=str(first + index), **device_kwargs)
+        for index in range(count)
+    ]
+
+
+async def log_statistics(devices: t.Sequence[SimulatedDevice], interval: float) -> None:
     while True:
-        time.sleep(2)
-        sock.sendto(b"1 1", ("0.0.0.0", port))
+        await asyncio.sleep(interval)
+        log.info(
+            "%s/%s devices active, received: %s shown: %s",
+            sum(device.active for device in devices),
+            len(devices),
+            sum(device.received_frames for device in devices),
+            sum(device.shown_frames for device in devices),
+        )
+
+
+async def simulate(devices: t.Sequence[SimulatedDevice], interval: float) -> None:
+    await asyncio.gather(
+        log_statistics(devices, interval),
+        *(device.run_forever() for device in devices),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate airpixel devices")
+    parser.add_argument("device_id")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--server", default="127.0.0.1:50000", metavar="IP:PORT")
+    parser.add_argument("--first-ip", default="127.1.0.1")
+    parser.add_argument("--port", type=int, default=LOCAL_UDP_PORT)
+    parser.add_argument("--pixel-count", type=int, default=PIXEL_COUNT)
+    parser.add_argument("--log-interval", type=float, default=5.0)
+    parser.add_argument(
+        "--confirm", action="store_true", help="confirm every shown frame"
+    )
+    parser.add_argument(
+        "--binary-keepalive",
+        action="store_true",
+        help="send fixed width binary keepalives",
+    )
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server_ip, server_port = arguments.server.rsplit(":", 1)
+    devices = simulated_devices(
+        arguments.device_id,
+        arguments.count,
+        arguments.first_ip,
+        server_ip=server_ip,
+        server_port=int(server_port),
+        local_port=arguments.port,
+        pixel_count=arguments.pixel_count,
+        confirm=arguments.confirm,
+        binary_keepalive=arguments.binary_keepalive,
+    )
+    try:
+        asyncio.run(simulate(devices, arguments.log_interval))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import dataclasses
+import json
+import os
+import socket
+import tempfile
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+DEFAULT_CAPACITY = 1024
+DEFAULT_DEVICE_LIMIT = 256
+DEFAULT_WINDOW = 60.0
+
+
+class TelemetryError(Exception):
+    pass
+
+
+def socket_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "airpixel-telemetry")
+
+
+class RingBuffer:
+    def __init__(self, capacity: int, columns: int = 0):
+        if capacity < 1:
+            raise TelemetryError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._times = np.zeros(capacity)
+        self._values = np.zeros((capacity, columns))
+        self._next = 0
+        self.appended = 0
+
+    def __len__(self) -> int:
+        return min(self.appended, self.capacity)
+
+    def append(self, timestamp: float, *values: float) -> None:
+        self._times[self._next] = timestamp
+        self._values[self._next] = values
+        self._next = (self._next + 1) % self.capacity
+        self.appended += 1
+
+    def since(self, start: float) -> t.Tuple[np.ndarray, np.ndarray]:
+        if self.appended < self.capacity:
+            times = self._times[: self._next]
+            values = self._values[: self._next]
+        else:
+            times = np.concatenate(
+                (self._times[self._next :], self._times[: self._next])
+            )
+            values = np.concatenate(
+                (self._values[self._next :], self._values[: self._next])
+            )
+        # Timestamps come from a monotonic clock, so the buffer is sorted
+        first = int(np.searchsorted(times, start))
+        return times[first:], values[first:]
+
+
+@dataclasses.dataclass
+class DeviceSummary:
+    ip_address: str
+    device_id: t.Optional[str]
+    keepalives: int
+    received: int
+    shown: int
+    delivery_ratio: float
+    keepalive_interval: float
+    keepalive_jitter: float
+    registrations: int
+
+
+def _counter_increase(counter: np.ndarray) -> int:
+    increase = np.diff(counter)
+    # Devices start counting from zero again when they reconnect
+    reset = increase < 0
+    increase[reset] = counter[1:][reset]
+    return int(increase.sum())
+
+
+class DeviceTelemetry:
+    def __init__(self, ip_address: str, capacity: int = DEFAULT_CAPACITY):
+        self.ip_address = ip_address
+        self.device_id: t.Optional[str] = None
+        self.keepalives = RingBuffer(capacity, columns=2)
+        self.registrations = RingBuffer(capacity)
+
+    def summarize(self, start: float) -> DeviceSummary:
+        times, counters = self.keepalives.since(start)
+        registration_times, _ = self.registrations.since(start)
+        received = _counter_increase(counters[:, 0])
+        shown = _counter_increase(counters[:, 1])
+        intervals = np.diff(times)
+        return DeviceSummary(
+            self.ip_address,
+            self.device_id,
+            len(times),
+            received,
+            shown,
+            shown / received if received else 0.0,
+            float(intervals.mean()) if intervals.size else 0.0,
+            float(intervals.std()) if intervals.size else 0.0,
+            len(registration_times),
+        )
+
+
+class Telemetry:
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        device_limit: int = DEFAULT_DEVICE_LIMIT,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.device_limit = device_limit
+        self._clock = clock
+        self._devices: t.OrderedDict[str, DeviceTelemetry] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def _device(self, ip_address: str) -> DeviceTelemetry:
+        try:
+            device = self._devices[ip_address]
+        except KeyError:
+            device = self._devices[ip_address] = DeviceTelemetry(
+                ip_address, self.capacity
+            )
+            if len(self._devices) > self.device_limit:
+                self._devices.popitem(last=False)
+            return device
+        self._devices.move_to_end(ip_address)
+        return device
+
+    def record_keepalive(self, ip_address: str, received: int, shown: int) -> None:
+        self._device(ip_address).keepalives.append(self._clock(), received, shown)
+
+    def record_registration(self, ip_address: str, device_id: str) -> None:
+        device = self._device(ip_address)
+        device.device_id = device_id
+        device.registrations.append(self._clock())
+
+    def query(self, window: float = DEFAULT_WINDOW) -> t.List[DeviceSummary]:
+        start = self._clock() - window
+        return [device.summarize(start) for device in self._devices.values()]
+
+    async def handle_query(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await reader.readline()
+            try:
+                window = float(request or DEFAULT_WINDOW)
+            except ValueError:
+                response: t.Dict[str, t.Any] = {"error": f"Invalid window {request!r}"}
+            else:
+                response = {
+                    "window": window,
+                    "devices": [
+                        dataclasses.asdict(summary) for summary in self.query(window)
+                    ],
+                }
+            writer.write(bytes(json.dumps(response), "utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self, path: str) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.handle_query, path=path)
+        async with server:
+            await server.serve_forever()
+
+
+def query(path: str, window: float = DEFAULT_WINDOW) -> t.Dict[str, t.Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(bytes(f"{window}\n", "utf-8"))
+        response = sock.makefile("rb").readline()
+    if not response:
+        raise TelemetryError("No response from the framework")
+    result: t.Dict[str, t.Any] = json.loads(response)
+    if "error" in result:
+        raise TelemetryError(result["error"])
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query airpixel device telemetry")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW)
+    parser.add_argument("--socket", default=socket_path())
+    arguments = parser.parse_args()
+
+    result = query(arguments.socket, arguments.window)
+    print(f"Last {result['window']:g}s:")
+    for device in result["devices"]:
+        print(
+            f"{device['ip_address']} ({device['device_id']}): "
+            f"{device['keepalives']} keepalives, "
+            f"interval {device['keepalive_interval'] * 1e3:.1f}ms "
+            f"jitter {device['keepalive_jitter'] * 1e3:.1f}ms, "
+            f"received {device['received']} shown {device['shown']} "
+            f"ratio {device['delivery_ratio']:.2f}, "
+            f"{device['registrations']} registrations"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import client, pacing
+
+
+class ThreadedAirClient:
+    def __init__(
+        self,
+        air_client: client.AirClient,
+        pixel_count: int,
+        target_fps: float = 60,
+        channels: int = 3,
+        dtype: t.Any = np.float32,
+    ):
+        self.air_client = air_client
+        self.pacer = pacing.FramePacer(target_fps, pacing.FramePolicy.BLOCK)
+        self._buffers = (
+            np.zeros((pixel_count, channels), dtype=dtype),
+            np.zeros((pixel_count, channels), dtype=dtype),
+        )
+        self._back = 0
+        self._fresh = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._send_forever, daemon=True)
+        self.published_frames = 0
+        self.sent_frames = 0
+
+    @property
+    def buffer(self) -> np.ndarray:
+        return self._buffers[self._back]
+
+    @property
+    def overwritten_frames(self) -> int:
+        return self.published_frames - self.sent_frames - int(self._fresh)
+
+    def publish(self) -> None:
+        with self._condition:
+            self._back = 1 - self._back
+            self._fresh = True
+            self.published_frames += 1
+            self._condition.notify()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self) -> ThreadedAirClient:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.stop()
+
+    def _next_packet(self) -> t.Optional[client.FramePacket]:
+        with self._condition:
+            while not self._fresh and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                return None
+            self._fresh = False
+            return self.air_client.encode_array(self._buffers[1 - self._back])
+
+    def _send_forever(self) -> None:
+        while True:
+            self.pacer.wait()
+            packet = self._next_packet()
+            if packet is None:
+                return
+            self.air_client.show_packet(packet)
+            self.pacer.mark_sent()
+            self.sent_frames += 1
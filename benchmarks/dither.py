@@ -0,0 +1,21 @@
+import numpy as np  # type: ignore
+
+from airpixel import client
+from benchmarks import timing
+
+PIXEL_COUNTS = (300, 1_000, 5_000)
+
+
+def main() -> None:
+    sink = timing.udp_sink()
+    _, port = sink.getsockname()
+    for pixel_count in PIXEL_COUNTS:
+        frame = np.random.random((pixel_count, 3))
+        for dither in (False, True):
+            air_client = client.AirClient("127.0.0.1", port, dither=dither)
+            name = f"show_array {pixel_count:>6} px dither={dither}"
+            print(timing.measure(name, lambda: air_client.show_array(frame)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import encoding
+from benchmarks import timing
+
+PIXEL_COUNTS = (300, 1_000, 5_000)
+CHANNELS = 3
+
+
+def moving_dot(pixel_count: int) -> t.Callable[[int], np.ndarray]:
+    background = np.random.randint(0, 256, (pixel_count, CHANNELS), dtype=np.uint8)
+
+    def frame(number: int) -> np.ndarray:
+        pixels = background.copy()
+        pixels[number % pixel_count] = 255
+        return pixels.ravel()
+
+    return frame
+
+
+def solid(pixel_count: int) -> t.Callable[[int], np.ndarray]:
+    return lambda number: np.full(pixel_count * CHANNELS, number % 256, np.uint8)
+
+
+def noise(pixel_count: int) -> t.Callable[[int], np.ndarray]:
+    return lambda number: np.random.randint(
+        0, 256, pixel_count * CHANNELS, dtype=np.uint8
+    )
+
+
+SCENARIOS = {"moving dot": moving_dot, "solid": solid, "noise": noise}
+
+
+def main() -> None:
+    for pixel_count in PIXEL_COUNTS:
+        for name, scenario in SCENARIOS.items():
+            frame = scenario(pixel_count)
+            frames = [frame(number) for number in range(300)]
+            encoder = encoding.FrameEncoder(
+                [encoding.Encoding.DELTA, encoding.Encoding.RLE], CHANNELS
+            )
+            numbers = iter(range(10**9))
+
+            def encode() -> None:
+                number = next(numbers)
+                encoder.encode(number, frames[number % len(frames)])
+
+            result = timing.measure(f"{name} {pixel_count:>6} px", encode)
+            print(
+                f"{result}  ratio {encoder.compression_ratio:6.1f}x  "
+                f"{1e6 / result.mean_us:8.0f} frames/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
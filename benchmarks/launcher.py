@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import logging
+import shlex
+import sys
+import time
+
+import numpy as np  # type: ignore
+
+from airpixel import framework, launcher, stub_device
+from benchmarks import timing
+
+REPEAT = 10
+
+
+async def time_to_first_frame(server_port: int) -> float:
+    loop = asyncio.get_running_loop()
+    # A fresh port per run, so frames of the previous renderer don't count
+    device = stub_device.SimulatedDevice(
+        "benchmark", server_port=server_port, local_port=0
+    )
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: device, local_addr=("127.0.0.1", 0)
+    )
+    try:
+        device.activate()
+        start = time.perf_counter()
+        await device.register()
+        while not device.received_frames:
+            await asyncio.sleep(0.001)
+        return time.perf_counter() - start
+    finally:
+        transport.close()
+
+
+async def benchmark(
+    name: str, registration: framework.ProcessRegistration, repeat: int
+) -> timing.Timing:
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: framework.ConnectionProtocol(registration, 0), "127.0.0.1", 0
+    )
+    _, server_port = server.sockets[0].getsockname()
+    try:
+        # The first run of the fork launcher includes starting the fork server
+        await time_to_first_frame(server_port)
+        samples = np.array(
+            [await time_to_first_frame(server_port) for _ in range(repeat)]
+        )
+    finally:
+        server.close()
+        registration.cleanup()
+    return timing.Timing(name, samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time from registration to first frame per launcher"
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    command = f"{shlex.quote(sys.executable)} -m benchmarks.renderer"
+    shell = framework.ProcessRegistration(
+        [framework.DeviceConfig("benchmark", f"{command} {{ip_address}} {{port}}")]
+    )
+    # Forked children run this module again as __mp_main__, preloading what it
+    # imports keeps that cheap. The framework itself runs as airpixel.__main__,
+    # which multiprocessing skips
+    fork_launcher = launcher.ForkLauncher(
+        launcher.DEFAULT_PRELOAD
+        + ["benchmarks.renderer", "benchmarks.timing", "airpixel.framework"]
+    )
+    fork_launcher.start()
+    fork = framework.ProcessRegistration(
+        [framework.DeviceConfig("benchmark", entry_point="benchmarks.renderer:render")],
+        renderer_launcher=fork_launcher,
+    )
+
+    for name, registration in (("shell", shell), ("fork", fork)):
+        print(asyncio.run(benchmark(name, registration, arguments.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import logging
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import framework
+
+DEVICE_COUNT = 10_000
+KEEPALIVE_INTERVAL = 0.1
+TIMEOUT = 3.0
+SIMULATED_SECONDS = 12.0
+DEAD_SHARE = 0.01
+
+
+class FakeProcess:
+    def kill(self) -> None:
+        pass
+
+    def communicate(self) -> None:
+        pass
+
+
+class SimulatedClock:
+    def __init__(self) -> None:
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+def scan_purge(registration: framework.ProcessRegistration, now: float) -> t.Set[str]:
+    # The previous implementation: look at every process on every purge
+    return {
+        ip
+        for ip, process in registration._processes.items()
+        if now - process.last_response >= TIMEOUT
+    }
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    clock = SimulatedClock()
+    registration = framework.ProcessRegistration(
+        [framework.DeviceConfig("device", "renderer {ip_address}")],
+        subprocess_factory=lambda command: FakeProcess(),  # type: ignore
+        timeout=TIMEOUT,
+        clock=clock,
+    )
+    ips = [f"10.{i >> 16}.{(i >> 8) & 0xFF}.{i & 0xFF}" for i in range(DEVICE_COUNT)]
+    # Devices register spread over the first timeout period
+    for index, ip_address in enumerate(ips):
+        clock.time = index / DEVICE_COUNT * TIMEOUT
+        registration.launch_for("device", ip_address, 50001)
+    alive = ips[int(DEVICE_COUNT * DEAD_SHARE) :]
+
+    keepalive_times = []
+    wheel_purge_times = []
+    scan_purge_times = []
+    next_wheel_purge = 0.0
+    next_scan_purge = 0.0
+    while clock.time < SIMULATED_SECONDS:
+        start = time.perf_counter()
+        for ip_address in alive:
+            registration.response_from(ip_address)
+        keepalive_times.append((time.perf_counter() - start) / len(alive))
+        if clock.time >= next_scan_purge:
+            start = time.perf_counter()
+            scan_purge(registration, clock.time)
+            scan_purge_times.append(time.perf_counter() - start)
+            next_scan_purge += TIMEOUT / 4
+        if clock.time >= next_wheel_purge:
+            start = time.perf_counter()
+            registration.purge_processes()
+            wheel_purge_times.append(time.perf_counter() - start)
+            next_deadline = registration.next_deadline()
+            delay = TIMEOUT if next_deadline is None else next_deadline - clock.time
+            next_wheel_purge = clock.time + max(delay, registration._resolution)
+        clock.time += KEEPALIVE_INTERVAL
+
+    print(
+        f"{DEVICE_COUNT} devices, {DEAD_SHARE:.0%} dead, "
+        f"{SIMULATED_SECONDS:g}s simulated, "
+        f"{len(registration._processes)} processes left"
+    )
+    print(f"response_from mean {np.mean(keepalive_times) * 1e6:.2f}us per keepalive")
+    for name, samples in (("scan", scan_purge_times), ("wheel", wheel_purge_times)):
+        samples = np.array(samples)
+        print(
+            f"{name} purge: {samples.size} purges, "
+            f"mean {samples.mean() * 1e6:9.1f}us max {samples.max() * 1e6:9.1f}us, "
+            f"{samples.sum() / SIMULATED_SECONDS * 1e3:7.2f}ms per second"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import socket
+from unittest import mock
+
+import numpy as np  # type: ignore
+
+from airpixel import client, power
+from benchmarks import timing
+
+PIXEL_COUNTS = (300, 1_000, 10_000)
+
+
+def main() -> None:
+    for pixel_count in PIXEL_COUNTS:
+        frame = np.random.random((pixel_count, 3))
+        payload = np.random.randint(0, 256, pixel_count * 3, dtype=np.uint8)
+        repeat = max(100, 1_000_000 // pixel_count)
+        over_budget = power.PowerLimiter(pixel_count * 10)
+        under_budget = power.PowerLimiter(pixel_count * 100)
+        print(
+            timing.measure(
+                f"limiter over budget {pixel_count:>6} px",
+                lambda: over_budget.apply(payload.copy()),
+                repeat=repeat,
+            )
+        )
+        print(
+            timing.measure(
+                f"limiter under budget {pixel_count:>6} px",
+                lambda: under_budget.apply(payload),
+                repeat=repeat,
+            )
+        )
+        print(
+            timing.measure(
+                f"payload copy only {pixel_count:>6} px",
+                lambda: payload.copy(),
+                repeat=repeat,
+            )
+        )
+        sock = mock.MagicMock(spec=socket.socket)
+        for name, limiter in (
+            ("encode_array", None),
+            ("encode_array limited", power.PowerLimiter(pixel_count * 10)),
+        ):
+            air_client = client.AirClient(
+                "127.0.0.1", 50000, power_limiter=limiter, sock=sock
+            )
+            print(
+                timing.measure(
+                    f"{name} {pixel_count:>6} px",
+                    lambda: air_client.encode_array(frame),
+                    repeat=repeat,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import sys
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import client
+
+PIXEL_COUNT = 60
+FRAME_INTERVAL = 1 / 60
+
+
+def render(ip_address: str, port: int, **_: t.Any) -> None:
+    air_client = client.AirClient(ip_address, int(port))
+    frame = np.zeros((PIXEL_COUNT, 3), dtype=np.float32)
+    while True:
+        air_client.show_array(frame)
+        time.sleep(FRAME_INTERVAL)
+
+
+if __name__ == "__main__":
+    render(*sys.argv[1:3])
@@ -0,0 +1,129 @@
+import argparse
+import json
+import platform
+import subprocess
+import typing as t
+
+import numpy as np  # type: ignore
+
+from airpixel import client, fragmentation, gamma_table
+from benchmarks import timing
+
+PIXEL_COUNTS = (50, 300, 1_000, 5_000, 10_000, 50_000)
+COLOR_METHODS = (
+    client.ColorMethodRGB,
+    client.ColorMethodGRB,
+    client.ColorMethodRGBW,
+    client.ColorMethodGRBW,
+)
+# Largest payload that fits an unfragmented UDP datagram over IPv4
+MAX_DATAGRAM_PAYLOAD = 65_507 - client.UDPConstants.FRAME_NUMBER_BYTES
+# Pixel objects are slow to build, skip the per-pixel path above this size
+MAX_SHOW_FRAME_PIXELS = 10_000
+
+
+def commit() -> t.Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def repeat_for(pixel_count: int, budget: int) -> int:
+    return max(20, budget // pixel_count)
+
+
+def cases(
+    port: int, pixel_count: int, color_method: t.Type[client.ColorMethod]
+) -> t.Dict[str, t.Callable[[], t.Any]]:
+    payload_size = pixel_count * color_method.channels()
+    fragment_size = (
+        fragmentation.MTU_DATAGRAM_SIZE if payload_size > MAX_DATAGRAM_PAYLOAD else None
+    )
+    air_client = client.AirClient(
+        "127.0.0.1", port, color_method, fragment_size=fragment_size
+    )
+    frame = np.random.random((pixel_count, 3))
+    levels = client.quantize(color_method.expand(frame))
+    lookup_table = gamma_table.lookup_table(color_method.CHANNEL_ORDER)
+    out = np.empty(payload_size, dtype=np.uint8)
+    functions: t.Dict[str, t.Callable[[], t.Any]] = {
+        "lookup_table": lambda: lookup_table.apply(levels, out=out),
+        "encode_array": lambda: air_client.encode_array(frame),
+        "show_array": lambda: air_client.show_array(frame),
+    }
+    if pixel_count <= MAX_SHOW_FRAME_PIXELS:
+        pixels = [client.Pixel(*values) for values in frame]
+        functions["show_frame"] = lambda: air_client.show_frame(pixels)
+    return functions
+
+
+def run(budget: int) -> t.List[t.Dict[str, t.Any]]:
+    sink = timing.udp_sink()
+    _, port = sink.getsockname()
+    results = []
+    for color_method in COLOR_METHODS:
+        for pixel_count in PIXEL_COUNTS:
+            for path, function in cases(port, pixel_count, color_method).items():
+                name = f"{path} {color_method.__name__} {pixel_count:>6} px"
+                repeat = repeat_for(pixel_count, budget)
+                if path == "show_frame":
+                    repeat = max(5, repeat // 20)
+                result = timing.measure(name, function, repeat=repeat, warmup=5)
+                print(f"{result}  {result.frames_per_second:10.0f} frames/s")
+                results.append(
+                    dict(
+                        result.to_dict(),
+                        path=path,
+                        color_method=color_method.__name__,
+                        pixel_count=pixel_count,
+                    )
+                )
+    sink.close()
+    return results
+
+
+def compare(results: t.List[t.Dict[str, t.Any]], baseline_file: str) -> None:
+    with open(baseline_file) as file_:
+        baseline = {result["name"]: result for result in json.load(file_)["results"]}
+    print(f"\nCompared to {baseline_file} (mean, >1 is faster):")
+    for result in results:
+        if result["name"] in baseline:
+            speedup = baseline[result["name"]]["mean_us"] / result["mean_us"]
+            print(f"{result['name']:<40} {speedup:6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Client encode/send throughput")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=2_000_000,
+        help="pixels to process per case, more means steadier numbers",
+    )
+    arguments = parser.parse_args()
+
+    results = run(arguments.budget)
+    if arguments.output:
+        with open(arguments.output, "w") as file_:
+            json.dump(
+                {
+                    "commit": commit(),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                file_,
+                indent=2,
+            )
+    if arguments.baseline:
+        compare(results, arguments.baseline)
+
+
+if __name__ == "__main__":
+    main()
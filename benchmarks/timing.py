@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import dataclasses
+import socket
+import time
+import typing as t
+
+import numpy as np  # type: ignore
+
+
+@dataclasses.dataclass
+class Timing:
+    name: str
+    samples: np.ndarray
+
+    @property
+    def mean_us(self) -> float:
+        return float(self.samples.mean() * 1e6)
+
+    def percentile_us(self, percentile: float) -> float:
+        return float(np.percentile(self.samples, percentile) * 1e6)
+
+    @property
+    def frames_per_second(self) -> float:
+        return float(1 / self.samples.mean())
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "name": self.name,
+            "samples": int(self.samples.size),
+            "mean_us": self.mean_us,
+            "p50_us": self.percentile_us(50),
+            "p99_us": self.percentile_us(99),
+            "frames_per_second": self.frames_per_second,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<40} mean {self.mean_us:9.1f}us  "
+            f"p50 {self.percentile_us(50):9.1f}us  "
+            f"p99 {self.percentile_us(99):9.1f}us"
+        )
+
+
+def measure(
+    name: str, function: t.Callable[[], t.Any], repeat: int = 500, warmup: int = 20
+) -> Timing:
+    for _ in range(warmup):
+        function()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples[i] = time.perf_counter() - start
+    return Timing(name, samples)
+
+
+def udp_sink() -> socket.socket:
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.setblocking(False)
+    return sink
@@ -0,0 +1,40 @@
+import numpy as np  # type: ignore
+
+from airpixel import client
+from benchmarks import timing
+
+PIXEL_COUNTS = (300, 1_000, 10_000)
+
+
+def per_pixel(pixels: list) -> np.ndarray:
+    return np.concatenate([np.append(pixel.values, [0]) for pixel in pixels])
+
+
+def main() -> None:
+    extractions = {
+        "min": client.MinWhiteExtraction(),
+        "temperature": client.ColorTemperatureWhiteExtraction(4500),
+    }
+    for pixel_count in PIXEL_COUNTS:
+        frame = np.random.random((pixel_count, 3))
+        pixels = [client.Pixel(*values) for values in frame]
+        repeat = max(20, 300_000 // pixel_count)
+        print(
+            timing.measure(
+                f"per-pixel np.append {pixel_count:>6} px",
+                lambda: per_pixel(pixels),
+                repeat=repeat // 10,
+            )
+        )
+        for name, extraction in extractions.items():
+            print(
+                timing.measure(
+                    f"{name} extraction {pixel_count:>6} px",
+                    lambda: extraction.extract(frame),
+                    repeat=repeat,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import asyncio
+import socket
+import time
+
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import async_client, client, pacing
+
+
+@pytest.fixture(name="receiver")
+def f_receiver():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(1)
+    yield receiver
+    receiver.close()
+
+
+@pytest.fixture(name="async_air_client")
+def f_async_air_client(receiver):
+    _, port = receiver.getsockname()
+    return async_client.AsyncAirClient(
+        "127.0.0.1", port, color_method=client.ColorMethodRGB
+    )
+
+
+@pytest.fixture(name="frame")
+def f_frame():
+    return np.ones((4, 3))
+
+
+class TestAsyncAirClient:
+    @staticmethod
+    def test_show_array_sends_frame(async_air_client, receiver, frame):
+        async def show():
+            async with async_air_client:
+                await async_air_client.show_array(frame)
+                await async_air_client.show_bytes(b"abc")
+
+        asyncio.run(show())
+
+        assert receiver.recv(1024) == bytes(8) + b"\xff" * 12
+        assert receiver.recv(1024) == (1).to_bytes(8, "big") + b"abc"
+        assert async_air_client.sent_datagrams == 2
+        assert async_air_client.frame_number == 2
+
+    @staticmethod
+    def test_send_without_connection_is_dropped(async_air_client, frame):
+        asyncio.run(async_air_client.show_array(frame))
+
+        assert async_air_client.dropped_sends == 1
+
+    @staticmethod
+    def test_paused_transport_drops_frames(async_air_client, frame):
+        async_air_client.drop_when_paused = True
+
+        async def show():
+            async with async_air_client:
+                async_air_client.pause()
+                await async_air_client.show_array(frame)
+
+        asyncio.run(show())
+
+        assert async_air_client.dropped_sends == 1
+        assert async_air_client.sent_datagrams == 0
+
+    @staticmethod
+    def test_paused_transport_waits_for_resume(async_air_client, receiver, frame):
+        async def show():
+            async with async_air_client:
+                async_air_client.pause()
+                send = asyncio.ensure_future(async_air_client.show_array(frame))
+                await asyncio.sleep(0)
+                assert not send.done()
+                async_air_client.resume()
+                await send
+
+        asyncio.run(show())
+
+        assert receiver.recv(1024)[8:] == b"\xff" * 12
+
+    @staticmethod
+    def test_pacer_does_not_block_event_loop(receiver):
+        _, port = receiver.getsockname()
+        async_air_client = async_client.AsyncAirClient(
+            "127.0.0.1", port, pacer=pacing.FramePacer(20)
+        )
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        async def show():
+            ticker = asyncio.ensure_future(tick())
+            async with async_air_client:
+                for _ in range(3):
+                    await async_air_client.show_bytes(b"abc")
+            ticker.cancel()
+
+        start = time.monotonic()
+        asyncio.run(show())
+
+        assert time.monotonic() - start >= 0.09
+        assert async_air_client.frame_number == 3
+        assert np.diff(ticks).max() < 0.03
+
+    @staticmethod
+    def test_concurrent_senders_keep_pace(receiver):
+        _, port = receiver.getsockname()
+        async_air_client = async_client.AsyncAirClient(
+            "127.0.0.1", port, pacer=pacing.FramePacer(50)
+        )
+        sent_times = []
+
+        async def send():
+            await async_air_client.show_bytes(b"abc")
+            sent_times.append(time.monotonic())
+
+        async def show():
+            async with async_air_client:
+                await asyncio.gather(*(send() for _ in range(4)))
+
+        asyncio.run(show())
+
+        assert async_air_client.frame_number == 4
+        assert np.diff(sorted(sent_times)).min() >= 0.015
@@ -0,0 +1,779 @@
+import socket
+from unittest import mock
+
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import (
+    client,
+    encoding,
+    feedback,
+    fragmentation,
+    gamma_table,
+    pacing,
+    power,
+)
+
+
+@pytest.fixture(name="remote_ip")
+def f_remote_ip():
+    return "1.2.3.4"
+
+
+@pytest.fixture(name="remote_port")
+def f_remote_port():
+    return 50001
+
+
+@pytest.fixture(name="color_method")
+def f_color_method():
+    return client.ColorMethodGRB
+
+
+@pytest.fixture(name="mock_socket")
+def f_mock_socket():
+    return mock.MagicMock(spec=socket.socket)
+
+
+@pytest.fixture(name="air_client")
+def f_air_client(remote_ip, remote_port, color_method, mock_socket):
+    with mock.patch("socket.socket", return_value=mock_socket):
+        return client.AirClient(remote_ip, remote_port, color_method)
+
+
+@pytest.fixture(name="frame")
+def f_frame():
+    return np.array([[1.0, 0.5, 0.0], [0.25, 0.0, 0.75]])
+
+
+def sent_pixels(mock_socket):
+    (message, _), _ = mock_socket.sendto.call_args
+    return message[client.UDPConstants.FRAME_NUMBER_BYTES :]
+
+
+def gamma(values):
+    return bytes(gamma_table.GAMMA_TABLE[(np.array(values) * 255).astype("uint8")])
+
+
+@pytest.fixture(name="dithering_air_client")
+def f_dithering_air_client(remote_ip, remote_port, mock_socket):
+    with mock.patch("socket.socket", return_value=mock_socket):
+        return client.AirClient(
+            remote_ip, remote_port, client.ColorMethodRGB, dither=True
+        )
+
+
+class TestWhiteExtraction:
+    @staticmethod
+    def test_min_extraction_moves_common_part_to_white():
+        result = client.MinWhiteExtraction().extract(np.array([[0.5, 0.75, 1.0]]))
+
+        np.testing.assert_allclose(result, [[0, 0.25, 0.5, 0.5]])
+
+    @staticmethod
+    def test_min_extraction_preserves_uint8():
+        result = client.MinWhiteExtraction().extract(
+            np.array([[10, 20, 30]], dtype="uint8")
+        )
+
+        assert result.dtype == np.uint8
+        np.testing.assert_array_equal(result, [[0, 10, 20, 10]])
+
+    @staticmethod
+    def test_neutral_white_point_matches_min_extraction():
+        frame = np.random.random((10, 3))
+        extraction = client.ColorTemperatureWhiteExtraction(white_point=(1, 1, 1))
+
+        np.testing.assert_allclose(
+            extraction.extract(frame),
+            client.MinWhiteExtraction().extract(frame),
+            atol=1e-6,
+        )
+
+    @staticmethod
+    def test_warm_white_point_leaves_remaining_blue():
+        extraction = client.ColorTemperatureWhiteExtraction(white_point=(1, 1, 0.5))
+
+        result = extraction.extract(np.array([[1.0, 1.0, 1.0]]))
+
+        np.testing.assert_allclose(result, [[0, 0, 0.5, 1.0]])
+
+    @staticmethod
+    def test_temperature_extraction_rounds_integer_frames():
+        extraction = client.ColorTemperatureWhiteExtraction(white_point=(1, 1, 0.5))
+
+        result = extraction.extract(np.array([[255, 255, 255]], dtype="uint8"))
+
+        assert result.dtype == np.uint8
+        np.testing.assert_array_equal(result, [[0, 0, 128, 255]])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kelvin, expected",
+        [(6600, (1.0, 1.0, 1.0)), (2700, (1.0, 0.65, 0.34))],
+    )
+    def test_white_point_from_temperature(kelvin, expected):
+        assert client.white_point_from_temperature(kelvin) == pytest.approx(
+            expected, abs=0.01
+        )
+
+
+class TestQuantize:
+    @staticmethod
+    def test_float_to_uint16_clips():
+        result = client.quantize(np.array([[-1.0, 0.5, 2.0]]), np.uint16)
+
+        np.testing.assert_array_equal(result, [[0, 32767, 65535]])
+
+    @staticmethod
+    def test_uint8_to_uint16_spans_full_range():
+        result = client.quantize(np.array([[0, 1, 255]], dtype="uint8"), np.uint16)
+
+        np.testing.assert_array_equal(result, [[0, 257, 65535]])
+
+    @staticmethod
+    def test_uint16_to_uint8():
+        result = client.quantize(np.array([[0, 257, 65535]], dtype="uint16"))
+
+        np.testing.assert_array_equal(result, [[0, 1, 255]])
+
+    @staticmethod
+    @pytest.mark.parametrize("dtype", ["int64", "int8", "uint32", "bool"])
+    def test_unsupported_dtype_raises(dtype):
+        with pytest.raises(client.FrameShapeError):
+            client.quantize(np.array([[1, 0, 1]], dtype=dtype))
+
+
+class TestTemporalDither:
+    @staticmethod
+    def test_average_converges_to_fractional_level():
+        dither = client.TemporalDither()
+
+        frames = [dither.quantize(np.full(3, 0.3, dtype="float32")) for _ in range(10)]
+
+        assert np.mean(frames) == pytest.approx(0.3)
+
+    @staticmethod
+    def test_integer_levels_pass_through():
+        dither = client.TemporalDither()
+
+        result = dither.quantize(np.array([0, 17, 255], dtype="float32"))
+
+        np.testing.assert_array_equal(result, [0, 17, 255])
+
+
+class TestAirClient:
+    @staticmethod
+    def test_show_array_sends_frame_number_and_pixels(
+        air_client, mock_socket, frame, remote_ip, remote_port
+    ):
+        air_client.show_array(frame)
+
+        (message, address), _ = mock_socket.sendto.call_args
+        assert address == (remote_ip, remote_port)
+        assert message[: client.UDPConstants.FRAME_NUMBER_BYTES] == bytes(8)
+        assert message[client.UDPConstants.FRAME_NUMBER_BYTES :] == gamma(
+            [0.5, 1.0, 0.0, 0.0, 0.25, 0.75]
+        )
+
+    @staticmethod
+    def test_show_array_increments_frame_number(air_client, frame):
+        air_client.show_array(frame)
+        air_client.show_array(frame)
+
+        assert air_client.frame_number == 2
+
+    @staticmethod
+    def test_show_array_reuses_packet_buffer(air_client, mock_socket, frame):
+        air_client.show_array(frame)
+        (first_message, _), _ = mock_socket.sendto.call_args
+
+        air_client.show_array(frame)
+
+        (second_message, _), _ = mock_socket.sendto.call_args
+        assert second_message is first_message
+        assert second_message[: client.UDPConstants.FRAME_NUMBER_BYTES] == (
+            (1).to_bytes(client.UDPConstants.FRAME_NUMBER_BYTES, "big")
+        )
+
+    @staticmethod
+    def test_show_bytes_sends_frame_number_and_message(air_client, mock_socket):
+        air_client.show_bytes(b"abc")
+        air_client.show_bytes(b"defg")
+
+        (message, _), _ = mock_socket.sendto.call_args
+        assert bytes(message) == (1).to_bytes(8, "big") + b"defg"
+
+    @staticmethod
+    @pytest.mark.parametrize("color_method", [client.ColorMethodRGB])
+    def test_show_array_clips_out_of_range_values(air_client, mock_socket):
+        air_client.show_array(np.array([[2.0, -1.0, 0.5]]))
+
+        assert sent_pixels(mock_socket) == gamma([1.0, 0.0, 0.5])
+
+    @staticmethod
+    @pytest.mark.parametrize("color_method", [client.ColorMethodRGB])
+    def test_show_array_accepts_uint8(air_client, mock_socket):
+        air_client.show_array(np.array([[255, 0, 128]], dtype="uint8"))
+
+        assert sent_pixels(mock_socket) == bytes(gamma_table.GAMMA_TABLE[[255, 0, 128]])
+
+    @staticmethod
+    @pytest.mark.parametrize("color_method", [client.ColorMethodGRBW])
+    def test_show_array_adds_white_channel(air_client, mock_socket, frame):
+        air_client.show_array(frame)
+
+        assert sent_pixels(mock_socket) == gamma(
+            [0.5, 1.0, 0.0, 0.0, 0.0, 0.25, 0.75, 0.0]
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize("color_method", [client.ColorMethodGRBW])
+    def test_show_array_extracts_white(air_client, mock_socket):
+        air_client.show_array(np.array([[1.0, 0.5, 0.5]]))
+
+        assert sent_pixels(mock_socket) == gamma([0.0, 0.5, 0.0, 0.5])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "color_method",
+        [client.ColorMethodRGBW.with_white_extraction(client.NoWhiteExtraction())],
+    )
+    def test_show_array_uses_configured_white_extraction(air_client, mock_socket):
+        air_client.show_array(np.array([[1.0, 0.5, 0.5]]))
+
+        assert sent_pixels(mock_socket) == gamma([1.0, 0.5, 0.5, 0.0])
+
+    @staticmethod
+    @pytest.mark.parametrize("shape", [(3,), (2, 2), (2, 4), (2, 3, 1)])
+    def test_show_array_rejects_invalid_shapes(air_client, shape):
+        with pytest.raises(client.FrameShapeError):
+            air_client.show_array(np.zeros(shape))
+
+    @staticmethod
+    def test_show_array_rejects_unsupported_dtype(air_client, mock_socket):
+        with pytest.raises(client.FrameShapeError):
+            air_client.show_array(np.array([[128, 0, 255]]))
+
+        mock_socket.sendto.assert_not_called()
+
+    @staticmethod
+    def test_dithering_resolves_levels_below_8_bit(dithering_air_client, mock_socket):
+        frame = np.full((1, 3), 0.1)
+        levels = []
+        for _ in range(20):
+            dithering_air_client.show_array(frame)
+            levels.extend(sent_pixels(mock_socket))
+
+        expected = 0.1**gamma_table.DEFAULT_GAMMA * 255
+        assert set(levels) == {0, 1}
+        assert np.mean(levels) == pytest.approx(expected, abs=0.05)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "color_method",
+        [
+            client.ColorMethodRGB,
+            client.ColorMethodRGBW,
+            client.ColorMethodGRB,
+            client.ColorMethodGRBW,
+        ],
+    )
+    def test_show_frame_matches_per_pixel_color_method(
+        air_client, mock_socket, frame, color_method
+    ):
+        pixels = [client.Pixel(*values) for values in frame]
+
+        air_client.show_frame(pixels)
+
+        expected = np.concatenate([color_method.to_bytes(pixel) for pixel in pixels])
+        assert sent_pixels(mock_socket) == gamma(expected)
+
+    @staticmethod
+    def test_show_frame_accepts_integer_pixels(air_client, mock_socket):
+        pixels = [client.Pixel(1, 0, 0), client.Pixel(0, 1, 0)]
+
+        air_client.show_frame(pixels)
+
+        expected = np.concatenate(
+            [air_client.color_method.to_bytes(pixel) for pixel in pixels]
+        )
+        assert sent_pixels(mock_socket) == gamma(expected)
+
+
+@pytest.fixture(name="frame_buffer")
+def f_frame_buffer():
+    return client.FrameBuffer(4)
+
+
+class TestFrameBuffer:
+    @staticmethod
+    def test_new_buffer_is_black(frame_buffer):
+        assert frame_buffer.array.shape == (4, 3)
+        assert not frame_buffer.array.any()
+
+    @staticmethod
+    def test_pixel_view_writes_through(frame_buffer):
+        frame_buffer[1] = (0.1, 0.2, 0.3)
+        frame_buffer[2][0] = 1
+
+        assert frame_buffer.red[1] == pytest.approx(0.1)
+        assert frame_buffer.blue[1] == pytest.approx(0.3)
+        assert frame_buffer.red[2] == 1
+
+    @staticmethod
+    def test_fill_slice(frame_buffer):
+        frame_buffer.fill((1, 0, 0), 1, 3)
+
+        np.testing.assert_array_equal(frame_buffer.red, [0, 1, 1, 0])
+        assert not frame_buffer.green.any()
+
+    @staticmethod
+    def test_blend_with_buffer(frame_buffer):
+        other = client.FrameBuffer(4)
+        other.fill((1, 1, 1))
+
+        frame_buffer.blend(other, 0.25)
+
+        np.testing.assert_allclose(frame_buffer.array, 0.25)
+
+    @staticmethod
+    def test_blend_with_per_pixel_alpha(frame_buffer):
+        frame_buffer.blend(np.ones((4, 3)), np.array([0, 0.5, 1, 1]))
+
+        np.testing.assert_allclose(frame_buffer.green, [0, 0.5, 1, 1])
+
+    @staticmethod
+    def test_scale(frame_buffer):
+        frame_buffer.fill((1, 0.5, 0))
+
+        frame_buffer.scale(0.5)
+
+        np.testing.assert_allclose(frame_buffer[0], [0.5, 0.25, 0])
+
+    @staticmethod
+    def test_show_buffer_matches_show_array(air_client, mock_socket, frame):
+        frame_buffer = client.FrameBuffer(len(frame), dtype=np.float64)
+        frame_buffer[:] = frame
+
+        air_client.show_buffer(frame_buffer)
+
+        assert sent_pixels(mock_socket) == gamma([0.5, 1.0, 0.0, 0.0, 0.25, 0.75])
+
+
+@pytest.fixture(name="monotonic")
+def f_monotonic():
+    return mock.MagicMock(return_value=100.0)
+
+
+@pytest.fixture(name="paced_air_client")
+def f_paced_air_client(request, remote_ip, remote_port, mock_socket, monotonic):
+    pacer = pacing.FramePacer(10, request.param, clock=monotonic, sleep=mock.Mock())
+    with mock.patch("socket.socket", return_value=mock_socket):
+        return client.AirClient(remote_ip, remote_port, pacer=pacer)
+
+
+@pytest.fixture(name="fragmenting_air_client")
+def f_fragmenting_air_client(remote_ip, remote_port, mock_socket):
+    with mock.patch("socket.socket", return_value=mock_socket):
+        return client.AirClient(
+            remote_ip,
+            remote_port,
+            client.ColorMethodRGB,
+            fragment_size=fragmentation.HEADER.size + 7,
+        )
+
+
+@pytest.fixture(name="sent_datagrams")
+def f_sent_datagrams(mock_socket):
+    datagrams = []
+
+    def sendmsg(buffers, ancdata, flags, address):
+        datagrams.append(b"".join(bytes(buffer) for buffer in buffers))
+
+    mock_socket.sendmsg.side_effect = sendmsg
+    return datagrams
+
+
+class TestFragmentingAirClient:
+    @staticmethod
+    def test_sends_pixel_aligned_chunks(
+        fragmenting_air_client, mock_socket, sent_datagrams
+    ):
+        fragmenting_air_client.show_array(np.ones((5, 3)))
+
+        assert [len(d) - fragmentation.HEADER.size for d in sent_datagrams] == [
+            6,
+            6,
+            3,
+        ]
+        mock_socket.sendto.assert_not_called()
+
+    @staticmethod
+    def test_reference_receiver_reassembles_frame(
+        fragmenting_air_client, sent_datagrams
+    ):
+        assembler = fragmentation.FrameAssembler()
+        frame = np.random.random((5, 3))
+
+        fragmenting_air_client.show_array(frame)
+
+        shown = [assembler.receive(datagram) for datagram in sent_datagrams]
+        assert shown[-1] == gamma(frame.ravel())
+        assert assembler.frame_number == 0
+
+
+class TestEncodingAirClient:
+    @staticmethod
+    def test_sends_decodable_deltas(remote_ip, remote_port, mock_socket):
+        with mock.patch("socket.socket", return_value=mock_socket):
+            air_client = client.AirClient(
+                remote_ip,
+                remote_port,
+                client.ColorMethodRGB,
+                encodings=[encoding.Encoding.DELTA],
+            )
+        decoder = encoding.FrameDecoder(3)
+        frame = np.random.random((50, 3))
+
+        for brightness in (1, 1, 0.5):
+            frame[0] *= brightness
+            air_client.show_array(frame)
+            (packet, _), _ = mock_socket.sendto.call_args
+            shown = decoder.decode(packet)
+
+        assert shown == gamma(frame.ravel())
+        assert air_client.encoder.compression_ratio > 1
+
+    @staticmethod
+    def test_encoding_and_fragmentation_are_exclusive(remote_ip, remote_port):
+        with pytest.raises(client.ClientError):
+            client.AirClient(
+                remote_ip,
+                remote_port,
+                fragment_size=1000,
+                encodings=[encoding.Encoding.RLE],
+            )
+
+
+class TestIdleAirClient:
+    @staticmethod
+    def test_static_frames_are_suppressed_until_refresh(
+        remote_ip, remote_port, mock_socket, monotonic, frame
+    ):
+        with mock.patch("socket.socket", return_value=mock_socket):
+            air_client = client.AirClient(
+                remote_ip,
+                remote_port,
+                idle_suppressor=pacing.IdleSuppressor(1.0, clock=monotonic),
+            )
+
+        for _ in range(5):
+            air_client.show_array(frame)
+        monotonic.return_value += 1.0
+        air_client.show_array(frame)
+
+        assert mock_socket.sendto.call_count == 2
+        assert air_client.idle_suppressor.sent_frames == 2
+        assert air_client.idle_suppressor.suppressed_frames == 4
+        assert air_client.frame_number == 2
+
+
+class TestLatencyTrackingAirClient:
+    @staticmethod
+    def test_sent_frames_are_marked(remote_ip, remote_port, mock_socket, frame):
+        latency_tracker = mock.MagicMock(spec=feedback.LatencyTracker)
+        with mock.patch("socket.socket", return_value=mock_socket):
+            air_client = client.AirClient(
+                remote_ip, remote_port, latency_tracker=latency_tracker
+            )
+
+        air_client.show_array(frame)
+        air_client.show_array(frame)
+
+        assert latency_tracker.mark_sent.call_args_list == [mock.call(0), mock.call(1)]
+
+
+class TestPowerLimitedAirClient:
+    @staticmethod
+    def test_frames_are_scaled_to_budget(remote_ip, remote_port, mock_socket):
+        with mock.patch("socket.socket", return_value=mock_socket):
+            air_client = client.AirClient(
+                remote_ip,
+                remote_port,
+                power_limiter=power.PowerLimiter(30, idle_current=0),
+            )
+
+        air_client.show_array(np.ones((2, 3)))
+
+        assert sent_pixels(mock_socket) == bytes([63] * 6)
+
+    @staticmethod
+    def test_channel_count_must_match_color_method(remote_ip, remote_port):
+        with pytest.raises(client.ClientError):
+            client.AirClient(
+                remote_ip,
+                remote_port,
+                client.ColorMethodGRBW,
+                power_limiter=power.PowerLimiter(1000),
+            )
+
+
+class TestPacedAirClient:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "paced_air_client", [pacing.FramePolicy.SKIP], indirect=True
+    )
+    def test_skip_drops_early_frames(paced_air_client, mock_socket, frame):
+        paced_air_client.show_array(frame)
+        paced_air_client.show_array(frame)
+
+        assert mock_socket.sendto.call_count == 1
+        assert paced_air_client.pacer.skipped_frames == 1
+        assert paced_air_client.frame_number == 1
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "paced_air_client", [pacing.FramePolicy.BLOCK], indirect=True
+    )
+    def test_block_sleeps_until_deadline(paced_air_client, mock_socket, frame):
+        paced_air_client.show_array(frame)
+        paced_air_client.show_array(frame)
+
+        assert mock_socket.sendto.call_count == 2
+        paced_air_client.pacer._sleep.assert_called_once_with(pytest.approx(0.1))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "paced_air_client", [pacing.FramePolicy.LATEST], indirect=True
+    )
+    def test_latest_sends_newest_frame_when_due(
+        paced_air_client, mock_socket, monotonic
+    ):
+        paced_air_client.show_array(np.zeros((1, 3)))
+        paced_air_client.show_array(np.full((1, 3), 0.5))
+        paced_air_client.show_array(np.ones((1, 3)))
+        paced_air_client.poll()
+
+        assert mock_socket.sendto.call_count == 1
+
+        monotonic.return_value += 0.1
+        paced_air_client.poll()
+
+        assert mock_socket.sendto.call_count == 2
+        assert sent_pixels(mock_socket) == bytes((255, 255, 255))
+        assert paced_air_client.pacer.skipped_frames == 1
+
+
+@pytest.fixture(name="feedback_receiver")
+def f_feedback_receiver(tmp_path):
+    receiver = client.FeedbackReceiver(str(tmp_path / "feedback"))
+    yield receiver
+    receiver.close()
+
+
+@pytest.fixture(name="mock_receiver")
+def f_mock_receiver():
+    return mock.MagicMock(spec=client.FeedbackReceiver)
+
+
+@pytest.fixture(name="rate_controller")
+def f_rate_controller(mock_receiver):
+    return client.RateController(
+        pacing.FramePacer(50), mock_receiver, min_fps=10, max_fps=60
+    )
+
+
+class TestFeedbackReceiver:
+    @staticmethod
+    def test_latest_without_feedback(feedback_receiver):
+        assert feedback_receiver.latest() is None
+
+    @staticmethod
+    def test_latest_returns_newest_feedback(feedback_receiver):
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        for package in (b"invalid", feedback.Feedback(1, 1).to_bytes()):
+            sender.sendto(package, feedback_receiver.socket_path)
+        sender.sendto(feedback.Feedback(5, 4).to_bytes(), feedback_receiver.socket_path)
+
+        assert feedback_receiver.latest() == feedback.Feedback(5, 4)
+        assert feedback_receiver.latest() is None
+
+    @staticmethod
+    def test_confirmations_reach_latency_tracker(tmp_path):
+        latency_tracker = mock.MagicMock(spec=feedback.LatencyTracker)
+        receiver = client.FeedbackReceiver(str(tmp_path / "feedback"), latency_tracker)
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        for package in (feedback.Feedback(1, 1, 7), feedback.Feedback(1, 1)):
+            sender.sendto(package.to_bytes(), receiver.socket_path)
+
+        receiver.latest()
+        receiver.close()
+
+        latency_tracker.confirm.assert_called_once_with(7)
+
+    @staticmethod
+    def test_latest_heartbeat_skips_confirmations(tmp_path):
+        latency_tracker = mock.MagicMock(spec=feedback.LatencyTracker)
+        receiver = client.FeedbackReceiver(str(tmp_path / "feedback"), latency_tracker)
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        for package in (
+            feedback.Feedback(10, 9, 9),
+            feedback.Feedback(10, 10),
+            feedback.Feedback(11, 11, 11),
+        ):
+            sender.sendto(package.to_bytes(), receiver.socket_path)
+
+        heartbeat = receiver.latest_heartbeat()
+        sender.sendto(feedback.Feedback(12, 12, 12).to_bytes(), receiver.socket_path)
+        only_confirmations = receiver.latest_heartbeat()
+        receiver.close()
+
+        assert heartbeat == feedback.Feedback(10, 10)
+        assert only_confirmations is None
+        assert latency_tracker.confirm.call_count == 3
+
+
+class TestRateController:
+    @staticmethod
+    def test_first_feedback_only_sets_baseline(rate_controller, mock_receiver):
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+
+        rate_controller.update(10)
+
+        assert rate_controller.pacer.target_fps == 50
+
+    @staticmethod
+    def test_lowers_rate_when_frames_are_not_shown(rate_controller, mock_receiver):
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+        rate_controller.update(0)
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(90, 50)
+
+        rate_controller.update(100)
+
+        assert rate_controller.loss == pytest.approx(0.1)
+        assert rate_controller.delivery_ratio == pytest.approx(0.5)
+        assert rate_controller.pacer.target_fps == pytest.approx(40)
+
+    @staticmethod
+    def test_raises_rate_when_frames_are_shown(rate_controller, mock_receiver):
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+        rate_controller.update(0)
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(100, 100)
+
+        rate_controller.update(100)
+
+        assert rate_controller.pacer.target_fps == pytest.approx(51)
+
+    @staticmethod
+    def test_rate_stays_within_bounds(rate_controller, mock_receiver):
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+        rate_controller.update(0)
+        for sent in range(100, 2000, 100):
+            mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+            rate_controller.update(sent)
+
+        assert rate_controller.pacer.target_fps == 10
+
+    @staticmethod
+    def test_confirmations_do_not_drive_rate(tmp_path):
+        pacer = pacing.FramePacer(30)
+        receiver = client.FeedbackReceiver(str(tmp_path / "feedback"))
+        rate_controller = client.RateController(
+            pacer, receiver, max_fps=60, target_delivery=0.9
+        )
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        shown = 0
+        rate_changes = 0
+        for sent in range(1, 301):
+            # The device shows 9 out of 10 frames and confirms each of them
+            if sent % 10:
+                shown += 1
+                sender.sendto(
+                    feedback.Feedback(sent, shown, sent).to_bytes(),
+                    receiver.socket_path,
+                )
+            else:
+                sender.sendto(
+                    feedback.Feedback(sent, shown).to_bytes(), receiver.socket_path
+                )
+            target_fps = pacer.target_fps
+            rate_controller.update(sent)
+            rate_changes += pacer.target_fps != target_fps
+        receiver.close()
+
+        assert rate_controller.delivery_ratio == pytest.approx(0.9)
+        # Once per heartbeat after the first, not once per frame
+        assert rate_changes == 29
+        assert pacer.target_fps == 59
+
+    @staticmethod
+    def test_device_counter_reset_resets_baseline(rate_controller, mock_receiver):
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(1000, 1000)
+        rate_controller.update(1000)
+        mock_receiver.latest_heartbeat.return_value = feedback.Feedback(0, 0)
+
+        rate_controller.update(1100)
+
+        assert rate_controller.pacer.target_fps == 50
+
+
+@pytest.fixture(name="endpoints")
+def f_endpoints():
+    return [
+        client.Endpoint("1.2.3.4", 50001),
+        client.Endpoint("1.2.3.5", 50001, client.ColorMethodRGB),
+    ]
+
+
+@pytest.fixture(name="multi_air_client")
+def f_multi_air_client(endpoints, mock_socket):
+    sent = []
+    mock_socket.sendto.side_effect = lambda data, address: sent.append(
+        (bytes(data), address)
+    )
+    with mock.patch("socket.socket", return_value=mock_socket) as socket_factory:
+        multi_air_client = client.MultiAirClient(endpoints)
+    socket_factory.assert_called_once()
+    multi_air_client.sent = sent
+    return multi_air_client
+
+
+class TestMultiAirClient:
+    @staticmethod
+    def test_show_arrays_sends_one_frame_per_device(multi_air_client, frame):
+        multi_air_client.show_arrays([frame, frame])
+
+        assert [address for _, address in multi_air_client.sent] == [
+            ("1.2.3.4", 50001),
+            ("1.2.3.5", 50001),
+        ]
+        assert multi_air_client.sent[0][0][8:] == gamma(
+            [0.5, 1.0, 0.0, 0.0, 0.25, 0.75]
+        )
+        assert multi_air_client.sent[1][0][8:] == gamma(frame.ravel())
+
+    @staticmethod
+    def test_devices_share_frame_number(multi_air_client, frame):
+        multi_air_client.show_arrays([frame, frame])
+        multi_air_client.show_arrays([frame, frame])
+
+        assert [data[:8] for data, _ in multi_air_client.sent[2:]] == [
+            (1).to_bytes(8, "big")
+        ] * 2
+
+    @staticmethod
+    def test_show_arrays_requires_frame_per_device(multi_air_client, frame):
+        with pytest.raises(client.FrameShapeError):
+            multi_air_client.show_arrays([frame])
+
+    @staticmethod
+    def test_skew_report(multi_air_client, frame):
+        assert multi_air_client.skew_report().ticks == 0
+
+        for _ in range(3):
+            multi_air_client.show_arrays([frame, frame])
+
+        report = multi_air_client.skew_report()
+        assert report.ticks == 3
+        assert 0 <= report.mean <= report.max
@@ -0,0 +1,173 @@
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import encoding
+
+
+@pytest.fixture(name="channels")
+def f_channels():
+    return 3
+
+
+@pytest.fixture(name="encodings")
+def f_encodings():
+    return [encoding.Encoding.DELTA, encoding.Encoding.RLE]
+
+
+@pytest.fixture(name="encoder")
+def f_encoder(encodings, channels):
+    return encoding.FrameEncoder(encodings, channels, keyframe_interval=4)
+
+
+@pytest.fixture(name="decoder")
+def f_decoder(channels):
+    return encoding.FrameDecoder(channels)
+
+
+@pytest.fixture(name="frame")
+def f_frame():
+    return np.random.randint(0, 256, 60 * 3, dtype=np.uint8)
+
+
+def packet_type(packet):
+    _, type_ = encoding.FRAME_HEADER.unpack_from(packet)
+    return type_
+
+
+def changed(frame, *pixels):
+    new_frame = frame.reshape(-1, 3).copy()
+    for pixel in pixels:
+        new_frame[pixel] = 255 - new_frame[pixel]
+    return new_frame.ravel()
+
+
+class TestParseEncodings:
+    @staticmethod
+    def test_parse():
+        assert encoding.parse_encodings("delta,rle") == [
+            encoding.Encoding.DELTA,
+            encoding.Encoding.RLE,
+        ]
+
+    @staticmethod
+    def test_parse_unknown():
+        with pytest.raises(encoding.EncodingError):
+            encoding.parse_encodings("delta,fancy")
+
+
+class TestChangedSpans:
+    @staticmethod
+    def test_spans():
+        reference = np.zeros((10, 3), dtype=np.uint8)
+        pixels = reference.copy()
+        pixels[[1, 2, 6, 9], 0] = 1
+
+        starts, counts = encoding.changed_spans(pixels, reference, merge_gap=0)
+
+        np.testing.assert_array_equal(starts, [1, 6, 9])
+        np.testing.assert_array_equal(counts, [2, 1, 1])
+
+    @staticmethod
+    def test_close_spans_are_merged():
+        reference = np.zeros((10, 3), dtype=np.uint8)
+        pixels = reference.copy()
+        pixels[[1, 3, 9], 2] = 1
+
+        starts, counts = encoding.changed_spans(pixels, reference, merge_gap=1)
+
+        np.testing.assert_array_equal(starts, [1, 9])
+        np.testing.assert_array_equal(counts, [3, 1])
+
+
+class TestEncodeRle:
+    @staticmethod
+    def test_runs():
+        pixels = np.array([[1, 2, 3]] * 300 + [[0, 0, 0]], dtype=np.uint8)
+
+        runs = encoding.encode_rle(pixels)
+
+        assert runs.tobytes() == b"\x01\x2c\x01\x02\x03\x00\x01\x00\x00\x00"
+
+
+class TestRoundTrip:
+    @staticmethod
+    def test_first_frame_is_keyframe(encoder, decoder, frame):
+        packet = encoder.encode(0, frame)
+
+        assert packet_type(packet) == encoding.PacketType.RAW
+        assert decoder.decode(packet) == frame.tobytes()
+
+    @staticmethod
+    def test_solid_frame_uses_rle(encoder, decoder):
+        frame = np.full(60 * 3, 7, dtype=np.uint8)
+
+        packet = encoder.encode(0, frame)
+
+        assert packet_type(packet) == encoding.PacketType.RLE
+        assert len(packet) == encoding.FRAME_HEADER.size + 5
+        assert decoder.decode(packet) == frame.tobytes()
+
+    @staticmethod
+    def test_small_change_uses_delta(encoder, decoder, frame):
+        decoder.decode(encoder.encode(0, frame))
+        new_frame = changed(frame, 3, 40, 41)
+
+        packet = encoder.encode(1, new_frame)
+
+        assert packet_type(packet) == encoding.PacketType.DELTA
+        assert decoder.decode(packet) == new_frame.tobytes()
+
+    @staticmethod
+    def test_large_change_falls_back_to_keyframe(encoder, frame):
+        encoder.encode(0, frame)
+
+        packet = encoder.encode(1, changed(frame, *range(0, 60, 2)))
+
+        assert packet_type(packet) == encoding.PacketType.RAW
+
+    @staticmethod
+    def test_periodic_keyframes(encoder, frame):
+        types = [packet_type(encoder.encode(n, frame)) for n in range(6)]
+
+        assert types == [0, 1, 1, 1, 0, 1]
+
+    @staticmethod
+    def test_lost_delta_does_not_corrupt_later_frames(encoder, decoder, frame):
+        decoder.decode(encoder.encode(0, frame))
+        encoder.encode(1, changed(frame, 3))
+        new_frame = changed(frame, 5)
+
+        assert decoder.decode(encoder.encode(2, new_frame)) == new_frame.tobytes()
+
+    @staticmethod
+    def test_delta_without_reference_is_dropped(encoder, decoder, frame):
+        encoder.encode(0, frame)
+
+        assert decoder.decode(encoder.encode(1, changed(frame, 3))) is None
+
+    @staticmethod
+    def test_old_frames_are_dropped(encoder, decoder, frame):
+        old_packet = encoder.encode(0, frame)
+        decoder.decode(encoder.encode(4, frame))
+
+        assert decoder.decode(old_packet) is None
+
+    @staticmethod
+    def test_compression_ratio(encoder, frame):
+        for frame_number in range(4):
+            encoder.encode(frame_number, frame)
+
+        assert encoder.compression_ratio > 2
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "packet",
+        [
+            b"short",
+            encoding.FRAME_HEADER.pack(1, 9),
+            encoding.FRAME_HEADER.pack(1, encoding.PacketType.RLE) + b"\x00",
+        ],
+    )
+    def test_invalid_packets(decoder, packet):
+        with pytest.raises(encoding.DecodingError):
+            decoder.decode(packet)
@@ -0,0 +1,90 @@
+from unittest import mock
+
+import pytest
+
+from airpixel import feedback
+
+
+@pytest.fixture(name="clock")
+def f_clock():
+    return mock.MagicMock(return_value=100.0)
+
+
+@pytest.fixture(name="latency_tracker")
+def f_latency_tracker(clock):
+    return feedback.LatencyTracker(history=8, settle_time=0.5, clock=clock)
+
+
+class TestFeedback:
+    @staticmethod
+    def test_round_trip():
+        package = feedback.Feedback(10, 9, 8)
+
+        assert feedback.Feedback.from_bytes(package.to_bytes()) == package
+
+    @staticmethod
+    @pytest.mark.parametrize("raw_feedback", [b"", b"10 9", bytes(17)])
+    def test_from_bytes_for_invalid_package(raw_feedback):
+        with pytest.raises(feedback.FeedbackParsingError):
+            feedback.Feedback.from_bytes(raw_feedback)
+
+    @staticmethod
+    def test_socket_path_is_unique_per_device():
+        assert feedback.socket_path("ring", "1.2.3.4") != feedback.socket_path(
+            "ring", "1.2.3.5"
+        )
+
+
+class TestLatencyTracker:
+    @staticmethod
+    def test_report_without_frames(latency_tracker):
+        report = latency_tracker.report()
+
+        assert (report.sent_frames, report.confirmed_frames, report.loss) == (0, 0, 0)
+
+    @staticmethod
+    def test_latency_and_loss(latency_tracker, clock):
+        for frame_number in range(1, 5):
+            latency_tracker.mark_sent(frame_number)
+            clock.return_value += 0.01
+            if frame_number % 2:
+                latency_tracker.confirm(frame_number)
+        clock.return_value += 1
+
+        report = latency_tracker.report()
+
+        assert (report.sent_frames, report.confirmed_frames) == (4, 2)
+        assert report.loss == pytest.approx(0.5)
+        assert report.p50 == pytest.approx(0.01)
+        assert report.max == pytest.approx(0.01)
+
+    @staticmethod
+    def test_unsettled_frames_are_not_lost_yet(latency_tracker, clock):
+        latency_tracker.mark_sent(1)
+        clock.return_value += 0.1
+
+        assert latency_tracker.report().sent_frames == 0
+
+    @staticmethod
+    def test_duplicate_and_unknown_confirmations_are_ignored(latency_tracker, clock):
+        latency_tracker.mark_sent(1)
+        clock.return_value += 0.01
+        latency_tracker.confirm(1)
+        clock.return_value += 0.01
+        latency_tracker.confirm(1)
+        latency_tracker.confirm(9)
+        clock.return_value += 1
+
+        report = latency_tracker.report()
+
+        assert latency_tracker.confirmed_frames == 1
+        assert report.max == pytest.approx(0.01)
+
+    @staticmethod
+    def test_overwritten_frames_are_not_confirmed(latency_tracker):
+        latency_tracker.mark_sent(1)
+        latency_tracker.mark_sent(9)
+
+        latency_tracker.confirm(1)
+
+        assert latency_tracker.confirmed_frames == 0
@@ -0,0 +1,124 @@
+import pytest
+
+from airpixel import fragmentation
+
+
+@pytest.fixture(name="payload")
+def f_payload():
+    return bytes(range(30))
+
+
+@pytest.fixture(name="chunk_size")
+def f_chunk_size():
+    return 12
+
+
+@pytest.fixture(name="assembler")
+def f_assembler():
+    return fragmentation.FrameAssembler()
+
+
+def chunks(frame_number, payload, chunk_size):
+    return [
+        bytes(header) + chunk
+        for header, chunk in fragmentation.fragments(frame_number, payload, chunk_size)
+    ]
+
+
+class TestChunkSize:
+    @staticmethod
+    def test_chunk_holds_whole_pixels():
+        size = fragmentation.chunk_size(fragmentation.MTU_DATAGRAM_SIZE, 4)
+
+        assert size % 4 == 0
+        assert size + fragmentation.HEADER.size <= fragmentation.MTU_DATAGRAM_SIZE
+
+    @staticmethod
+    def test_too_small_datagram():
+        with pytest.raises(fragmentation.FragmentError):
+            fragmentation.chunk_size(fragmentation.HEADER.size + 2, 3)
+
+
+class TestFragments:
+    @staticmethod
+    def test_fragments_cover_payload(payload, chunk_size):
+        fragments = [
+            (fragmentation.HEADER.unpack(header), bytes(chunk))
+            for header, chunk in fragmentation.fragments(7, payload, chunk_size)
+        ]
+
+        assert fragments == [
+            ((7, 0, 30), payload[:12]),
+            ((7, 12, 30), payload[12:24]),
+            ((7, 24, 30), payload[24:]),
+        ]
+
+    @staticmethod
+    def test_fragments_reuse_header_buffer(payload, chunk_size):
+        header = bytearray(fragmentation.HEADER.size)
+
+        headers = {
+            id(fragment_header)
+            for fragment_header, _ in fragmentation.fragments(
+                1, payload, chunk_size, header
+            )
+        }
+
+        assert headers == {id(header)}
+
+
+class TestFrameAssembler:
+    @staticmethod
+    def test_assembles_complete_frame(assembler, payload, chunk_size):
+        results = [assembler.receive(c) for c in chunks(1, payload, chunk_size)]
+
+        assert results == [None, None, payload]
+        assert assembler.shown_frames == 1
+
+    @staticmethod
+    def test_assembles_out_of_order_chunks(assembler, payload, chunk_size):
+        results = [
+            assembler.receive(c) for c in reversed(chunks(1, payload, chunk_size))
+        ]
+
+        assert results[-1] == payload
+
+    @staticmethod
+    def test_lost_chunk_only_costs_its_segment(assembler, payload, chunk_size):
+        for chunk in chunks(1, payload, chunk_size):
+            assembler.receive(chunk)
+        new_payload = bytes(reversed(payload))
+        first, _, last = chunks(2, new_payload, chunk_size)
+        assembler.receive(first)
+        assembler.receive(last)
+
+        shown = assembler.receive(chunks(3, payload, chunk_size)[0])
+
+        assert shown == new_payload[:12] + payload[12:24] + new_payload[24:]
+        assert assembler.shown_frames == 2
+
+    @staticmethod
+    def test_stale_chunks_are_dropped(assembler, payload, chunk_size):
+        for chunk in chunks(2, payload, chunk_size):
+            assembler.receive(chunk)
+
+        assert assembler.receive(chunks(1, bytes(30), chunk_size)[0]) is None
+        assert assembler.receive(chunks(2, payload, chunk_size)[0]) is None
+        assert assembler.frame == payload
+
+    @staticmethod
+    def test_duplicate_chunks_do_not_complete_frame(assembler, payload, chunk_size):
+        first = chunks(1, payload, chunk_size)[0]
+
+        results = [assembler.receive(first) for _ in range(3)]
+
+        assert results == [None, None, None]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "datagram",
+        [b"short", fragmentation.HEADER.pack(1, 8, 10) + b"abc"],
+    )
+    def test_invalid_datagram(assembler, datagram):
+        with pytest.raises(fragmentation.FragmentParsingError):
+            assembler.receive(datagram)
@@ -1,10 +1,13 @@
 import asyncio
+import json
+import shlex
+import socket
 import subprocess
 from unittest import mock
 
 import pytest
 
-from airpixel import framework
+from airpixel import feedback, framework, gamma_table, launcher, telemetry
 
 
 @pytest.fixture(name="device_ip_address")
@@ -37,9 +40,23 @@ def f_registration_timeout():
     return 5
 
 
+@pytest.fixture(name="configured_encodings")
+def f_configured_encodings():
+    return ["delta", "rle"]
+
+
+@pytest.fixture(name="configured_layout")
+def f_configured_layout():
+    return None
+
+
 @pytest.fixture(name="device_config")
-def f_device_config(device_name, sh_command_template):
-    return framework.DeviceConfig(device_name, sh_command_template)
+def f_device_config(
+    device_name, sh_command_template, configured_encodings, configured_layout
+):
+    return framework.DeviceConfig(
+        device_name, sh_command_template, configured_encodings, configured_layout
+    )
 
 
 @pytest.fixture(name="device_configs")
@@ -75,17 +92,22 @@ def f_device_registration_data(device_name, device_udp_port):
 
 
 @pytest.fixture(name="process_registration")
-def f_process_registration(device_configs, subprocess_factory, registration_timeout):
+def f_process_registration(
+    device_configs, subprocess_factory, registration_timeout, clock
+):
     return framework.ProcessRegistration(
         device_configs,
         subprocess_factory=subprocess_factory,
         timeout=registration_timeout,
+        clock=clock,
     )
 
 
 @pytest.fixture(name="mock_process_registration")
 def f_mock_process_registration():
-    return mock.MagicMock(spec=framework.ProcessRegistration)
+    process_registration = mock.MagicMock(spec=framework.ProcessRegistration)
+    process_registration.uses_binary_keepalive.return_value = False
+    return process_registration
 
 
 @pytest.fixture(name="recieved_frames_number")
@@ -136,6 +158,274 @@ class TestProcessRegistration:
             )
         )
 
+    @staticmethod
+    @pytest.mark.parametrize(
+        "sh_command_template", ["some command {ip_address} {feedback_socket}"]
+    )
+    def test_launch_for_passes_feedback_socket(
+        process_registration,
+        device_name,
+        subprocess_factory,
+        device_ip_address,
+        device_udp_port,
+    ):
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        subprocess_factory.assert_called_once_with(
+            f"some command {device_ip_address} "
+            f"{feedback.socket_path(device_name, device_ip_address)}"
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "capabilities, expected",
+        [((), "raw"), (("rle", "fancy"), "rle"), (("rle", "delta"), "delta,rle")],
+    )
+    @pytest.mark.parametrize("sh_command_template", ["some command {encodings}"])
+    def test_launch_for_passes_negotiated_encodings(
+        process_registration,
+        device_name,
+        subprocess_factory,
+        device_ip_address,
+        device_udp_port,
+        capabilities,
+        expected,
+    ):
+        process_registration.launch_for(
+            device_name, device_ip_address, device_udp_port, capabilities
+        )
+
+        subprocess_factory.assert_called_once_with(f"some command {expected}")
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "configured_layout, expected",
+        [
+            (None, "'{}'"),
+            (
+                {"type": "ring", "pixel_count": 60},
+                """'{"type": "ring", "pixel_count": 60}'""",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("sh_command_template", ["some command {layout}"])
+    def test_launch_for_passes_layout(
+        process_registration,
+        device_name,
+        subprocess_factory,
+        device_ip_address,
+        device_udp_port,
+        expected,
+    ):
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        subprocess_factory.assert_called_once_with(f"some command {expected}")
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "capabilities, expected",
+        [((), False), ((feedback.BINARY_KEEPALIVE,), True)],
+    )
+    def test_launch_for_negotiates_binary_keepalive(
+        process_registration,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+        capabilities,
+        expected,
+    ):
+        process_registration.launch_for(
+            device_name, device_ip_address, device_udp_port, capabilities
+        )
+
+        assert process_registration.uses_binary_keepalive(device_ip_address) is expected
+
+    @staticmethod
+    def test_uses_binary_keepalive_for_unknown_device(
+        process_registration, device_ip_address
+    ):
+        assert not process_registration.uses_binary_keepalive(device_ip_address)
+
+    @staticmethod
+    def test_launch_for_forks_entry_point(
+        subprocess_factory, device_name, device_ip_address, device_udp_port
+    ):
+        renderer_launcher = mock.MagicMock(spec=launcher.ForkLauncher)
+        process_registration = framework.ProcessRegistration(
+            [
+                framework.DeviceConfig(
+                    device_name,
+                    layout={"type": "ring", "pixel_count": 60},
+                    entry_point="some.module:render",
+                )
+            ],
+            subprocess_factory=subprocess_factory,
+            renderer_launcher=renderer_launcher,
+        )
+
+        process_registration.launch_for(
+            device_name, device_ip_address, device_udp_port, ["rle"]
+        )
+
+        subprocess_factory.assert_not_called()
+        renderer_launcher.launch.assert_called_once_with(
+            "some.module:render",
+            ip_address=device_ip_address,
+            port=device_udp_port,
+            feedback_socket=feedback.socket_path(device_name, device_ip_address),
+            encodings=["raw"],
+            layout={"type": "ring", "pixel_count": 60},
+            calibration=gamma_table.Calibration(),
+        )
+
+    @staticmethod
+    def test_launch_for_kills_previously_forked_renderer(
+        device_name, device_ip_address, device_udp_port
+    ):
+        renderer_launcher = mock.MagicMock(spec=launcher.ForkLauncher)
+        first, second = mock.MagicMock(), mock.MagicMock()
+        renderer_launcher.launch.side_effect = [first, second]
+        process_registration = framework.ProcessRegistration(
+            [framework.DeviceConfig(device_name, entry_point="some.module:render")],
+            renderer_launcher=renderer_launcher,
+        )
+
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        first.kill.assert_called_once_with()
+        second.kill.assert_not_called()
+
+    @staticmethod
+    def test_launch_for_ignores_failed_fork(
+        device_name, device_ip_address, device_udp_port
+    ):
+        renderer_launcher = mock.MagicMock(spec=launcher.ForkLauncher)
+        renderer_launcher.launch.side_effect = launcher.EntryPointError
+        process_registration = framework.ProcessRegistration(
+            [framework.DeviceConfig(device_name, entry_point="some.module:render")],
+            renderer_launcher=renderer_launcher,
+        )
+
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        assert process_registration.next_deadline() is None
+
+    @staticmethod
+    def test_launch_for_and_report_from_record_telemetry(
+        device_configs,
+        subprocess_factory,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+    ):
+        device_telemetry = telemetry.Telemetry()
+        process_registration = framework.ProcessRegistration(
+            device_configs,
+            subprocess_factory=subprocess_factory,
+            device_telemetry=device_telemetry,
+        )
+
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+        process_registration.report_from(device_ip_address, 10, 8)
+        process_registration.report_from(device_ip_address, 20, 16)
+
+        (summary,) = device_telemetry.query()
+        assert summary.device_id == device_name
+        assert summary.registrations == 1
+        assert summary.keepalives == 2
+        assert (summary.received, summary.shown) == (10, 8)
+
+    @staticmethod
+    def test_confirmations_are_not_recorded_as_keepalives(
+        device_configs, subprocess_factory, device_ip_address
+    ):
+        device_telemetry = telemetry.Telemetry()
+        process_registration = framework.ProcessRegistration(
+            device_configs,
+            subprocess_factory=subprocess_factory,
+            device_telemetry=device_telemetry,
+        )
+
+        process_registration.report_from(device_ip_address, 10, 8)
+        for frame_number in range(1, 60):
+            process_registration.report_from(device_ip_address, 10, 8, frame_number)
+        process_registration.report_from(device_ip_address, 70, 68)
+
+        (summary,) = device_telemetry.query()
+        assert summary.keepalives == 2
+        assert (summary.received, summary.shown) == (60, 60)
+
+    @staticmethod
+    def test_launch_for_passes_calibration(
+        subprocess_factory, device_name, device_ip_address, device_udp_port
+    ):
+        device_config = framework.DeviceConfig.from_dict(
+            {
+                "device_id": device_name,
+                "command_template": "some command {calibration}",
+                "calibration": {"gamma": 2.2, "white_balance": [1, 0.8, 0.9]},
+            }
+        )
+        process_registration = framework.ProcessRegistration(
+            [device_config], subprocess_factory=subprocess_factory
+        )
+
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        (command,), _ = subprocess_factory.call_args
+        calibration = json.loads(shlex.split(command)[2])
+        assert gamma_table.Calibration.from_dict(calibration) == (
+            gamma_table.Calibration(2.2, (1, 0.8, 0.9), 1.0)
+        )
+
+    @staticmethod
+    def test_report_from_sends_feedback_to_renderer(
+        process_registration,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+    ):
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        with mock.patch.object(
+            process_registration, "_feedback_socket", spec=socket.socket
+        ) as feedback_socket:
+            process_registration.report_from(device_ip_address, 10, 9)
+
+        feedback_socket.sendto.assert_called_once_with(
+            feedback.Feedback(10, 9).to_bytes(),
+            feedback.socket_path(device_name, device_ip_address),
+        )
+
+    @staticmethod
+    def test_report_from_forwards_confirmed_frame_number(
+        process_registration,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+    ):
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+
+        with mock.patch.object(
+            process_registration, "_feedback_socket", spec=socket.socket
+        ) as feedback_socket:
+            process_registration.report_from(device_ip_address, 10, 9, 42)
+
+        (message, _), _ = feedback_socket.sendto.call_args
+        assert feedback.Feedback.from_bytes(message) == feedback.Feedback(10, 9, 42)
+
+    @staticmethod
+    def test_report_from_unknown_device_does_nothing(
+        process_registration, device_ip_address
+    ):
+        with mock.patch.object(
+            process_registration, "_feedback_socket", spec=socket.socket
+        ) as feedback_socket:
+            process_registration.report_from(device_ip_address, 10, 9)
+
+        feedback_socket.sendto.assert_not_called()
+
     @staticmethod
     def test_launch_for_kills_previously_launched_process(
         process_registration,
@@ -205,6 +495,57 @@ class TestProcessRegistration:
 
         mock_subprocess.kill.assert_not_called()
 
+    @staticmethod
+    def test_purge_processes_reschedules_recently_active(
+        process_registration,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+        mock_subprocess,
+        clock,
+        registration_timeout,
+    ):
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+        clock.time += registration_timeout / 2
+        process_registration.response_from(device_ip_address)
+        response_time = clock.time
+        clock.time += registration_timeout / 2
+
+        process_registration.purge_processes()
+
+        mock_subprocess.kill.assert_not_called()
+        assert process_registration.next_deadline() == pytest.approx(
+            response_time + registration_timeout
+        )
+
+        clock.time = response_time + registration_timeout
+        process_registration.purge_processes()
+
+        mock_subprocess.kill.assert_called_once()
+        assert process_registration.next_deadline() is None
+
+    @staticmethod
+    def test_purge_processes_ignores_deadline_of_replaced_process(
+        process_registration,
+        device_name,
+        device_ip_address,
+        device_udp_port,
+        subprocess_factory,
+        clock,
+        registration_timeout,
+    ):
+        first_process, second_process = mock.MagicMock(), mock.MagicMock()
+        subprocess_factory.side_effect = [first_process, second_process]
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+        clock.time += registration_timeout / 2
+        process_registration.launch_for(device_name, device_ip_address, device_udp_port)
+        clock.time += registration_timeout / 2
+
+        process_registration.purge_processes()
+
+        first_process.kill.assert_called_once()
+        second_process.kill.assert_not_called()
+
 
 class TestKeepaliveProtocol:
     @staticmethod
@@ -223,6 +564,165 @@ class TestKeepaliveProtocol:
             device_ip_address
         )
 
+    @staticmethod
+    def test_datagram_received_reports_statistics(
+        device_keepalive_data,
+        keepalive_protocol,
+        device_udp_port,
+        device_ip_address,
+        mock_process_registration,
+        recieved_frames_number,
+        drawn_frames_number,
+    ):
+        keepalive_protocol.datagram_received(
+            device_keepalive_data, (device_ip_address, device_udp_port)
+        )
+
+        mock_process_registration.report_from.assert_called_once_with(
+            device_ip_address, recieved_frames_number, drawn_frames_number, 0
+        )
+
+    @staticmethod
+    def test_datagram_received_forwards_confirmation(
+        keepalive_protocol,
+        device_udp_port,
+        device_ip_address,
+        mock_process_registration,
+    ):
+        keepalive_protocol.datagram_received(
+            b"10 9 42", (device_ip_address, device_udp_port)
+        )
+
+        mock_process_registration.report_from.assert_called_once_with(
+            device_ip_address, 10, 9, 42
+        )
+
+    @staticmethod
+    def test_datagram_received_parses_binary_keepalive(
+        keepalive_protocol,
+        device_udp_port,
+        device_ip_address,
+        mock_process_registration,
+    ):
+        mock_process_registration.uses_binary_keepalive.return_value = True
+
+        keepalive_protocol.datagram_received(
+            feedback.KEEPALIVE.pack(10, 9, 42), (device_ip_address, device_udp_port)
+        )
+
+        mock_process_registration.report_from.assert_called_once_with(
+            device_ip_address, 10, 9, 42
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize("binary", [True, False])
+    @pytest.mark.parametrize("data", [b"", b"10 nine", b"\x00" * 3])
+    def test_datagram_received_drops_malformed_keepalive(
+        keepalive_protocol,
+        device_udp_port,
+        device_ip_address,
+        mock_process_registration,
+        binary,
+        data,
+    ):
+        mock_process_registration.uses_binary_keepalive.return_value = binary
+
+        keepalive_protocol.datagram_received(data, (device_ip_address, device_udp_port))
+
+        mock_process_registration.response_from.assert_not_called()
+        assert keepalive_protocol.malformed_keepalives == 1
+
+    @staticmethod
+    def test_datagram_received_does_not_log(
+        keepalive_protocol, device_udp_port, device_ip_address
+    ):
+        with mock.patch.object(framework, "log") as log:
+            for received in range(1, 100):
+                keepalive_protocol.datagram_received(
+                    bytes(f"{received} {received}", "utf-8"),
+                    (device_ip_address, device_udp_port),
+                )
+
+        log.info.assert_not_called()
+
+    @staticmethod
+    def test_log_statistics_summarizes_interval(
+        keepalive_protocol, device_udp_port, device_ip_address
+    ):
+        for data in (b"100 90", b"110 95", b"200 180", b"250 200"):
+            keepalive_protocol.datagram_received(
+                data, (device_ip_address, device_udp_port)
+            )
+        keepalive_protocol.log_statistics()
+        for data in (b"260 210", b"300 240"):
+            keepalive_protocol.datagram_received(
+                data, (device_ip_address, device_udp_port)
+            )
+
+        with mock.patch.object(framework, "log") as log:
+            keepalive_protocol.log_statistics()
+
+        log.info.assert_called_once_with(mock.ANY, device_ip_address, 2, 0, 50, 40, 0.8)
+
+    @staticmethod
+    def test_confirmations_are_not_counted_as_keepalives(
+        keepalive_protocol, device_udp_port, device_ip_address
+    ):
+        for data in (b"10 10", b"11 11 1", b"12 12 2", b"13 13 3", b"14 14"):
+            keepalive_protocol.datagram_received(
+                data, (device_ip_address, device_udp_port)
+            )
+
+        with mock.patch.object(framework, "log") as log:
+            keepalive_protocol.log_statistics()
+
+        log.info.assert_called_once_with(mock.ANY, device_ip_address, 2, 3, 14, 14, 1.0)
+
+    @staticmethod
+    def test_log_statistics_handles_reset_counters(
+        keepalive_protocol, device_udp_port, device_ip_address
+    ):
+        keepalive_protocol.datagram_received(
+            b"500 500", (device_ip_address, device_udp_port)
+        )
+        keepalive_protocol.log_statistics()
+        keepalive_protocol.datagram_received(
+            b"20 10", (device_ip_address, device_udp_port)
+        )
+
+        with mock.patch.object(framework, "log") as log:
+            keepalive_protocol.log_statistics()
+
+        log.info.assert_called_once_with(mock.ANY, device_ip_address, 1, 0, 20, 10, 0.5)
+
+    @staticmethod
+    def test_log_statistics_skips_silent_devices(
+        keepalive_protocol, device_udp_port, device_ip_address
+    ):
+        keepalive_protocol.datagram_received(
+            b"10 10", (device_ip_address, device_udp_port)
+        )
+        keepalive_protocol.log_statistics()
+
+        with mock.patch.object(framework, "log") as log:
+            keepalive_protocol.log_statistics()
+
+        log.info.assert_not_called()
+        assert device_ip_address not in keepalive_protocol.statistics
+
+    @staticmethod
+    def test_log_statistics_forgets_silent_devices(keepalive_protocol, device_udp_port):
+        for index in range(100):
+            keepalive_protocol.datagram_received(
+                b"10 10", (f"10.0.0.{index}", device_udp_port)
+            )
+        keepalive_protocol.log_statistics()
+        keepalive_protocol.datagram_received(b"20 20", ("10.0.0.1", device_udp_port))
+
+        keepalive_protocol.log_statistics()
+
+        assert list(keepalive_protocol.statistics) == ["10.0.0.1"]
+
 
 class TestConnectionProtocol:
     @staticmethod
@@ -261,7 +761,7 @@ class TestConnectionProtocol:
 
         mock_transport.close.assert_called_once()
         mock_process_registration.launch_for.assert_called_once_with(
-            device_name, device_ip_address, device_udp_port
+            device_name, device_ip_address, device_udp_port, []
         )
         mock_transport.write.assert_called_once_with(
             int.to_bytes(
@@ -269,6 +769,30 @@ class TestConnectionProtocol:
             )
         )
 
+    @staticmethod
+    def test_data_received_parses_capabilities(
+        connected_connection_protocol,
+        mock_transport,
+        mock_process_registration,
+        device_ip_address,
+        device_udp_port,
+        device_name,
+        device_registration_data,
+    ):
+        mock_transport.get_extra_info.return_value = (
+            device_ip_address,
+            device_udp_port,
+        )
+        registration_data = device_registration_data.replace(
+            framework.ConnectionProtocol.SEPPERATOR, b" delta,rle\n"
+        )
+
+        connected_connection_protocol.data_received(registration_data)
+
+        mock_process_registration.launch_for.assert_called_once_with(
+            device_name, device_ip_address, device_udp_port, ["delta", "rle"]
+        )
+
     @staticmethod
     def test_data_received_launches_process_and_closes_connection_if_message_was_split(
         connected_connection_protocol,
@@ -291,5 +815,29 @@ class TestConnectionProtocol:
 
         mock_transport.close.assert_called_once()
         mock_process_registration.launch_for.assert_called_once_with(
-            device_name, device_ip_address, device_udp_port
+            device_name, device_ip_address, device_udp_port, []
         )
+
+
+class TestDeviceConfig:
+    @staticmethod
+    def test_from_dict_reads_calibration():
+        device_config = framework.DeviceConfig.from_dict(
+            {
+                "device_id": "some_device",
+                "command_template": "some command",
+                "calibration": {"gamma": 2.2, "max_brightness": 0.5},
+            }
+        )
+
+        assert device_config.calibration == gamma_table.Calibration(
+            gamma=2.2, max_brightness=0.5
+        )
+
+    @staticmethod
+    def test_from_dict_defaults_calibration():
+        device_config = framework.DeviceConfig.from_dict(
+            {"device_id": "some_device", "command_template": "some command"}
+        )
+
+        assert device_config.calibration == gamma_table.Calibration()
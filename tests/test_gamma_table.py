@@ -0,0 +1,80 @@
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import gamma_table
+
+
+@pytest.fixture(name="channel_order")
+def f_channel_order():
+    return (1, 0, 2)
+
+
+@pytest.fixture(name="calibration")
+def f_calibration():
+    return gamma_table.Calibration()
+
+
+@pytest.fixture(name="frame")
+def f_frame():
+    return np.array([[255, 128, 0], [28, 64, 200]], dtype="uint8")
+
+
+class TestChannelTable:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "level, expected",
+        [(0, 0), (28, 1), (64, 5), (128, 37), (200, 129), (255, 255)],
+    )
+    def test_default_matches_adafruit_table(level, expected):
+        assert gamma_table.GAMMA_TABLE[level] == expected
+
+    @staticmethod
+    def test_scale_is_clipped():
+        table = gamma_table.channel_table(1.0, 2.0)
+
+        assert table[255] == 255
+        assert table[64] == 128
+
+    @staticmethod
+    def test_is_memoized():
+        assert gamma_table.channel_table(2.2, 0.5) is gamma_table.channel_table(
+            2.2, 0.5
+        )
+
+
+class TestLookupTable:
+    @staticmethod
+    def test_apply_reorders_and_corrects(channel_order, calibration, frame):
+        table = gamma_table.lookup_table(channel_order, calibration)
+
+        result = table.apply(frame)
+
+        expected = gamma_table.GAMMA_TABLE[frame[:, channel_order]].ravel()
+        np.testing.assert_array_equal(result, expected)
+
+    @staticmethod
+    def test_apply_uses_white_balance_of_input_channel(channel_order, frame):
+        calibration = gamma_table.Calibration(white_balance=(0.5, 1.0, 1.0))
+        table = gamma_table.lookup_table(channel_order, calibration)
+
+        result = table.apply(frame).reshape(-1, 3)
+
+        np.testing.assert_array_equal(
+            result[:, 1], gamma_table.channel_table(2.8, 0.5)[frame[:, 0]]
+        )
+        np.testing.assert_array_equal(
+            result[:, 0], gamma_table.GAMMA_TABLE[frame[:, 1]]
+        )
+
+    @staticmethod
+    def test_max_brightness_caps_output(channel_order, frame):
+        calibration = gamma_table.Calibration(max_brightness=0.5)
+        table = gamma_table.lookup_table(channel_order, calibration)
+
+        assert table.apply(frame).max() == 128
+
+    @staticmethod
+    def test_lookup_table_is_memoized(channel_order, calibration):
+        assert gamma_table.lookup_table(
+            channel_order, calibration
+        ) is gamma_table.lookup_table(channel_order, gamma_table.Calibration())
@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+
+from airpixel import launcher
+
+
+def wait_forever(**_):
+    while True:
+        time.sleep(1)
+
+
+@pytest.fixture(name="fork_launcher")
+def f_fork_launcher():
+    return launcher.ForkLauncher(preload=[])
+
+
+class TestEntryPoints:
+    @staticmethod
+    def test_parse_entry_point():
+        assert launcher.parse_entry_point("some.module:render") == (
+            "some.module",
+            "render",
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "entry_point", ["some.module", "some.module:", ":render", ""]
+    )
+    def test_parse_invalid_entry_point(entry_point):
+        with pytest.raises(launcher.EntryPointError):
+            launcher.parse_entry_point(entry_point)
+
+    @staticmethod
+    def test_load_entry_point():
+        assert launcher.load_entry_point("os.path:join") is os.path.join
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "entry_point", ["airpixel.does_not_exist:render", "os.path:does_not_exist"]
+    )
+    def test_load_missing_entry_point(entry_point):
+        with pytest.raises(launcher.EntryPointError):
+            launcher.load_entry_point(entry_point)
+
+
+class TestForkLauncher:
+    @staticmethod
+    def test_launch_calls_entry_point_with_arguments(fork_launcher, tmp_path):
+        directory = tmp_path / "created_by_renderer"
+
+        process = fork_launcher.launch("os:makedirs", name=str(directory))
+        process.communicate()
+
+        assert directory.is_dir()
+        assert process.poll() == 0
+
+    @staticmethod
+    def test_kill(fork_launcher):
+        process = fork_launcher.launch(f"{__name__}:wait_forever")
+
+        assert process.poll() is None
+        process.kill()
+        process.communicate()
+        assert process.poll() is not None
+
+    @staticmethod
+    def test_launch_invalid_entry_point(fork_launcher):
+        with pytest.raises(launcher.EntryPointError):
+            fork_launcher.launch("no_function")
@@ -0,0 +1,122 @@
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import layout
+
+
+class TestLayout:
+    @staticmethod
+    def test_rejects_one_dimensional_coordinates():
+        with pytest.raises(layout.LayoutError):
+            layout.Layout(np.arange(4).reshape(4, 1))
+
+    @staticmethod
+    def test_index_map_is_cached():
+        grid = layout.grid(4, 3)
+
+        assert grid.index_map((3, 4)) is grid.index_map((3, 4))
+
+    @staticmethod
+    def test_sample_grid_of_same_size_is_identity():
+        canvas = np.arange(12 * 3).reshape(3, 4, 3)
+
+        pixels = layout.grid(4, 3).sample(canvas)
+
+        assert np.array_equal(pixels, canvas.reshape(-1, 3))
+
+    @staticmethod
+    def test_sample_serpentine_grid_reverses_odd_rows():
+        canvas = np.arange(6).reshape(2, 3, 1)
+
+        pixels = layout.grid(3, 2, serpentine=True).sample(canvas)
+
+        assert pixels.ravel().tolist() == [0, 1, 2, 5, 4, 3]
+
+    @staticmethod
+    def test_sample_vertical_serpentine_grid():
+        canvas = np.arange(6).reshape(2, 3, 1)
+
+        pixels = layout.grid(3, 2, serpentine=True, vertical=True).sample(canvas)
+
+        assert pixels.ravel().tolist() == [0, 3, 4, 1, 2, 5]
+
+    @staticmethod
+    def test_sample_resamples_larger_canvas():
+        canvas = np.zeros((5, 5))
+        canvas[0, 0] = 1
+        canvas[4, 4] = 2
+
+        pixels = layout.grid(2, 2).sample(canvas)
+
+        assert pixels.tolist() == [1, 0, 0, 2]
+
+    @staticmethod
+    def test_sample_into_out():
+        out = np.empty((4, 3))
+        canvas = np.ones((8, 8, 3))
+
+        pixels = layout.grid(2, 2).sample(canvas, out=out)
+
+        assert pixels is out
+        assert np.all(out == 1)
+
+
+class TestRing:
+    @staticmethod
+    def test_coordinates_lie_on_circle():
+        ring = layout.ring(12, radius=2)
+
+        assert np.allclose(np.hypot(*ring.coordinates.T), 2)
+
+    @staticmethod
+    def test_clockwise_reverses_direction():
+        ring = layout.ring(4, clockwise=True)
+
+        assert np.allclose(ring.coordinates[1], (0, -1))
+
+    @staticmethod
+    def test_sample_hits_canvas_edges():
+        canvas = np.arange(9).reshape(3, 3)
+
+        pixels = layout.ring(4).sample(canvas)
+
+        assert pixels.tolist() == [5, 7, 3, 1]
+
+
+class TestFromFile:
+    @staticmethod
+    def test_loads_coordinates(tmp_path):
+        file_name = tmp_path / "layout.txt"
+        file_name.write_text("# x y z\n0 0 0\n1 2 3\n")
+
+        loaded = layout.from_file(str(file_name))
+
+        assert loaded.dimensions == 3
+        assert loaded.coordinates.tolist() == [[0, 0, 0], [1, 2, 3]]
+
+    @staticmethod
+    def test_missing_file_raises(tmp_path):
+        with pytest.raises(layout.LayoutError):
+            layout.from_file(str(tmp_path / "missing.txt"))
+
+
+class TestFromDict:
+    @staticmethod
+    def test_builds_configured_layout():
+        grid = layout.from_dict({"type": "grid", "width": 4, "height": 2})
+
+        assert len(grid) == 8
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "dict_", [{}, {"type": "hexagon"}, {"type": "ring", "diameter": 3}]
+    )
+    def test_invalid_layout_raises(dict_):
+        with pytest.raises(layout.LayoutError):
+            layout.from_dict(dict_)
+
+    @staticmethod
+    def test_from_json():
+        ring = layout.from_json('{"type": "ring", "pixel_count": 60}')
+
+        assert len(ring) == 60
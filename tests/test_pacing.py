@@ -0,0 +1,163 @@
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import pacing
+
+
+@pytest.fixture(name="monotonic")
+def f_monotonic():
+    class MockMonotonic:
+        def __init__(self):
+            self.time = 100.0
+
+        def __call__(self):
+            return self.time
+
+        def sleep(self, seconds):
+            self.time += seconds
+
+    return MockMonotonic()
+
+
+@pytest.fixture(name="target_fps")
+def f_target_fps():
+    return 50
+
+
+@pytest.fixture(name="policy")
+def f_policy():
+    return pacing.FramePolicy.BLOCK
+
+
+@pytest.fixture(name="pacer")
+def f_pacer(target_fps, policy, monotonic):
+    return pacing.FramePacer(target_fps, policy, clock=monotonic, sleep=monotonic.sleep)
+
+
+class TestFramePacer:
+    @staticmethod
+    def test_first_frame_is_due(pacer):
+        assert pacer.due()
+
+    @staticmethod
+    def test_next_frame_is_due_after_one_period(pacer, monotonic):
+        pacer.mark_sent()
+        monotonic.time += pacer.period / 2
+
+        assert not pacer.due()
+
+        monotonic.time += pacer.period / 2
+
+        assert pacer.due()
+
+    @staticmethod
+    def test_wait_sleeps_until_deadline(pacer, monotonic):
+        pacer.mark_sent()
+        start = monotonic.time
+
+        pacer.wait()
+
+        assert monotonic.time == pytest.approx(start + pacer.period)
+
+    @staticmethod
+    def test_slightly_late_frame_keeps_phase(pacer, monotonic):
+        pacer.mark_sent()
+        start = monotonic.time
+        monotonic.time += pacer.period * 1.5
+        pacer.mark_sent()
+        monotonic.time = start + pacer.period * 1.9
+
+        assert not pacer.due()
+
+    @staticmethod
+    def test_very_late_frame_reanchors_schedule(pacer, monotonic):
+        pacer.mark_sent()
+        monotonic.time += pacer.period * 5
+        pacer.mark_sent()
+
+        assert not pacer.due()
+
+    @staticmethod
+    def test_report(pacer, monotonic, target_fps):
+        for _ in range(11):
+            pacer.wait()
+            pacer.mark_sent()
+        pacer.mark_skipped()
+
+        report = pacer.report()
+
+        assert report.achieved_fps == pytest.approx(target_fps)
+        assert report.sent_frames == 11
+        assert report.skipped_frames == 1
+        assert report.jitter_histogram[0] == 11
+        assert report.jitter_histogram.sum() == 11
+
+    @staticmethod
+    def test_report_buckets_jitter(pacer, monotonic):
+        pacer.mark_sent()
+        monotonic.time += pacer.period + 0.003
+        pacer.mark_sent()
+
+        report = pacer.report()
+
+        assert (
+            report.jitter_histogram[pacing.FramePacer.JITTER_BINS.searchsorted(0.003)]
+            == 1
+        )
+
+    @staticmethod
+    def test_empty_report(pacer):
+        report = pacer.report()
+
+        assert report.achieved_fps == 0
+        assert report.jitter_histogram.sum() == 0
+
+
+@pytest.fixture(name="refresh_interval")
+def f_refresh_interval():
+    return 1.0
+
+
+@pytest.fixture(name="idle_suppressor")
+def f_idle_suppressor(refresh_interval, monotonic):
+    return pacing.IdleSuppressor(refresh_interval, clock=monotonic)
+
+
+@pytest.fixture(name="payload")
+def f_payload():
+    return np.arange(12, dtype=np.uint8)
+
+
+class TestIdleSuppressor:
+    @staticmethod
+    def test_first_frame_is_sent(idle_suppressor, payload):
+        assert not idle_suppressor.suppress(payload)
+
+    @staticmethod
+    def test_identical_frame_is_suppressed(idle_suppressor, payload, monotonic):
+        idle_suppressor.mark_sent(payload)
+        monotonic.time += 0.5
+
+        assert idle_suppressor.suppress(payload.copy())
+        assert idle_suppressor.suppressed_frames == 1
+
+    @staticmethod
+    def test_changed_frame_is_sent(idle_suppressor, payload):
+        idle_suppressor.mark_sent(payload)
+        payload[3] += 1
+
+        assert not idle_suppressor.suppress(payload)
+
+    @staticmethod
+    def test_identical_frame_is_refreshed(
+        idle_suppressor, payload, monotonic, refresh_interval
+    ):
+        idle_suppressor.mark_sent(payload)
+        monotonic.time += refresh_interval
+
+        assert not idle_suppressor.suppress(payload)
+
+    @staticmethod
+    def test_refresh_interval_must_be_below_device_timeout():
+        with pytest.raises(pacing.PacingError):
+            pacing.IdleSuppressor(pacing.DEVICE_TIMEOUT)
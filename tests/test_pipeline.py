@@ -0,0 +1,137 @@
+import socket
+from unittest import mock
+
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import client, gamma_table, layout, pipeline
+
+
+@pytest.fixture(name="clock")
+def f_clock():
+    class MockClock:
+        def __init__(self):
+            self.time = 0.0
+
+        def __call__(self):
+            return self.time
+
+    return MockClock()
+
+
+@pytest.fixture(name="mock_socket")
+def f_mock_socket():
+    return mock.MagicMock(spec=socket.socket)
+
+
+@pytest.fixture(name="air_client")
+def f_air_client(mock_socket):
+    return client.AirClient("1.2.3.4", 50001, client.ColorMethodRGB, sock=mock_socket)
+
+
+def fill_with_frame_number(frame_number, frame):
+    frame[:] = frame_number
+
+
+class TestSource:
+    @staticmethod
+    def test_reuses_frame_buffer():
+        frames = pipeline.source(fill_with_frame_number, 4)
+
+        first = next(frames)
+        second = next(frames)
+
+        assert first is second
+        assert np.all(second == 1)
+
+
+class TestTransform:
+    @staticmethod
+    def test_writes_into_reused_buffer():
+        def halve(frame, out):
+            np.multiply(frame, 0.5, out=out)
+
+        stage = pipeline.transform(halve)
+        frames = stage(iter([np.ones((2, 3)), np.ones((2, 3))]))
+
+        first = next(frames)
+        second = next(frames)
+
+        assert first is second
+        assert np.all(second == 0.5)
+        assert stage.__name__ == "halve"
+
+
+class TestResample:
+    @staticmethod
+    def test_gathers_canvas_into_strip_order():
+        canvas = np.arange(6 * 3).reshape(2, 3, 3)
+        stage = pipeline.resample(layout.grid(3, 2, serpentine=True))
+
+        pixels = next(stage(iter([canvas])))
+
+        assert pixels[:, 0].tolist() == [0, 3, 6, 15, 12, 9]
+
+
+class TestCalibrate:
+    @staticmethod
+    @pytest.mark.parametrize("dither", [False, True])
+    def test_matches_air_client_encoding(dither, mock_socket):
+        air_client = client.AirClient(
+            "1.2.3.4", 50001, client.ColorMethodGRBW, dither=dither, sock=mock_socket
+        )
+        frame = np.linspace(0, 1, 12).reshape(4, 3)
+        stages = pipeline.Pipeline(
+            iter([frame]),
+            pipeline.color_conversion(client.ColorMethodGRBW),
+            pipeline.calibrate(client.ColorMethodGRBW, dither=dither),
+        )
+
+        assert bytes(next(stages).ravel()) == bytes(
+            air_client.encode_array(frame).payload
+        )
+
+
+class TestPipeline:
+    @staticmethod
+    def test_sends_frames(air_client, mock_socket):
+        stages = pipeline.Pipeline(
+            pipeline.source(fill_with_frame_number, 2),
+            pipeline.calibrate(
+                client.ColorMethodRGB, gamma_table.Calibration(gamma=1.0)
+            ),
+            pipeline.transport(air_client),
+        )
+
+        stages.run(2)
+
+        assert mock_socket.sendto.call_count == 2
+        assert air_client.frame_number == 2
+
+    @staticmethod
+    def test_reports_time_per_stage(clock):
+        def slow_source(frame_number, frame):
+            clock.time += 2
+
+        def slow_transform(frame, out):
+            clock.time += 1
+
+        stages = pipeline.Pipeline(
+            pipeline.source(slow_source, 2),
+            pipeline.transform(slow_transform),
+            clock=clock,
+        )
+
+        stages.run(3)
+
+        assert [
+            (timing.name, timing.frames, timing.total) for timing in stages.report()
+        ] == [("source", 3, 6.0), ("slow_transform", 3, 3.0)]
+
+    @staticmethod
+    def test_run_stops_when_source_is_exhausted():
+        stages = pipeline.Pipeline(iter([np.zeros((2, 3))] * 3))
+
+        stages.run()
+
+        assert stages.report()[0].frames == 3
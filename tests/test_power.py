@@ -0,0 +1,67 @@
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import power
+
+
+@pytest.fixture(name="budget")
+def f_budget():
+    return 60.0
+
+
+@pytest.fixture(name="power_limiter")
+def f_power_limiter(budget):
+    return power.PowerLimiter(budget, (10, 20, 30), idle_current=1, recovery=0.5)
+
+
+@pytest.fixture(name="full_white")
+def f_full_white():
+    return np.full(6, 255, dtype=np.uint8)
+
+
+class TestPowerLimiter:
+    @staticmethod
+    def test_invalid_recovery_raises():
+        with pytest.raises(power.PowerError):
+            power.PowerLimiter(100, recovery=0)
+
+    @staticmethod
+    def test_estimate_sums_channel_currents(power_limiter):
+        payload = np.array([255, 0, 0, 0, 255, 51], dtype=np.uint8)
+
+        assert power_limiter.estimate(payload) == pytest.approx(10 + 20 + 6 + 2)
+
+    @staticmethod
+    def test_frame_within_budget_is_unchanged(power_limiter):
+        payload = np.array([255, 0, 0, 0, 255, 0], dtype=np.uint8)
+
+        power_limiter.apply(payload)
+
+        assert payload.tolist() == [255, 0, 0, 0, 255, 0]
+        assert power_limiter.limited_frames == 0
+
+    @staticmethod
+    def test_frame_over_budget_is_scaled_down(power_limiter, full_white, budget):
+        power_limiter.apply(full_white)
+
+        assert power_limiter.current == pytest.approx(122)
+        assert power_limiter.estimate(full_white) <= budget
+        assert power_limiter.limited_frames == 1
+
+    @staticmethod
+    def test_brightness_recovers_gradually(power_limiter, full_white):
+        power_limiter.apply(full_white.copy())
+        dimmed_scale = power_limiter.scale
+
+        power_limiter.apply(np.zeros(6, dtype=np.uint8))
+
+        assert dimmed_scale < power_limiter.scale < 1.0
+
+    @staticmethod
+    def test_brightness_snaps_back_to_full(power_limiter, full_white):
+        power_limiter.apply(full_white.copy())
+
+        for _ in range(20):
+            power_limiter.apply(np.zeros(6, dtype=np.uint8))
+
+        assert power_limiter.scale == 1.0
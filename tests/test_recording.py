@@ -0,0 +1,155 @@
+import socket
+from unittest import mock
+
+import numpy as np  # type: ignore
+import pytest
+
+from airpixel import client, recording
+
+
+@pytest.fixture(name="monotonic")
+def f_monotonic():
+    class MockMonotonic:
+        def __init__(self):
+            self.time = 100.0
+
+        def __call__(self):
+            return self.time
+
+        def sleep(self, seconds):
+            self.time += seconds
+
+    return MockMonotonic()
+
+
+@pytest.fixture(name="file_name")
+def f_file_name(tmp_path):
+    return str(tmp_path / "frames.rec")
+
+
+@pytest.fixture(name="recorded_file")
+def f_recorded_file(file_name, monotonic):
+    with recording.FrameRecorder(file_name, clock=monotonic) as recorder:
+        recorder.record(b"\x01\x02\x03")
+        monotonic.time += 0.5
+        recorder.record(np.array([4, 5, 6, 7, 8, 9], dtype=np.uint8).data)
+    return file_name
+
+
+@pytest.fixture(name="mock_socket")
+def f_mock_socket():
+    sock = mock.MagicMock(spec=socket.socket)
+    sock.sent = []
+    sock.sendto.side_effect = lambda data, address: sock.sent.append(bytes(data))
+    return sock
+
+
+@pytest.fixture(name="air_client")
+def f_air_client(mock_socket):
+    return client.AirClient("1.2.3.4", 50001, sock=mock_socket)
+
+
+def sent_payloads(mock_socket):
+    return [
+        message[client.UDPConstants.FRAME_NUMBER_BYTES :]
+        for message in mock_socket.sent
+    ]
+
+
+class TestRecording:
+    @staticmethod
+    def test_frames_round_trip(recorded_file):
+        with recording.Recording(recorded_file) as recorded:
+            frames = [
+                (timestamp, bytes(payload)) for timestamp, payload in recorded.frames()
+            ]
+
+        assert frames == [(0.0, b"\x01\x02\x03"), (0.5, bytes([4, 5, 6, 7, 8, 9]))]
+
+    @staticmethod
+    def test_close_after_iterating_in_with_block(recorded_file):
+        with recording.Recording(recorded_file) as recorded:
+            for _, payload in recorded.frames():
+                pass
+
+        # Payloads are released once the recording moves on
+        with pytest.raises(ValueError):
+            bytes(payload)
+
+    @staticmethod
+    def test_close_after_break(recorded_file):
+        with recording.Recording(recorded_file) as recorded:
+            for _, payload in recorded.frames():
+                break
+
+    @staticmethod
+    def test_close_with_payload_in_use_raises(recorded_file):
+        recorded = recording.Recording(recorded_file)
+        frames = recorded.frames()
+        _, payload = next(frames)
+        still_in_use = memoryview(payload)
+
+        with pytest.raises(recording.RecordingError):
+            recorded.close()
+
+        still_in_use.release()
+        frames.close()
+        recorded.close()
+
+    @staticmethod
+    def test_invalid_file_raises(file_name):
+        with open(file_name, "wb") as file_:
+            file_.write(b"not a recording")
+
+        with pytest.raises(recording.RecordingFormatError):
+            recording.Recording(file_name)
+
+    @staticmethod
+    def test_truncated_frame_raises(recorded_file):
+        with open(recorded_file, "r+b") as file_:
+            file_.truncate(file_.seek(0, 2) - 1)
+
+        with recording.Recording(recorded_file) as recorded:
+            with pytest.raises(recording.RecordingFormatError):
+                list(recorded.frames())
+
+    @staticmethod
+    def test_replay_keeps_timing(recorded_file, air_client, mock_socket, monotonic):
+        start = monotonic.time
+        with recording.Recording(recorded_file) as recorded:
+            replayed = recorded.replay(
+                [air_client], clock=monotonic, sleep=monotonic.sleep
+            )
+
+        assert replayed == 2
+        assert monotonic.time == pytest.approx(start + 0.5)
+        assert sent_payloads(mock_socket) == [
+            b"\x01\x02\x03",
+            bytes([4, 5, 6, 7, 8, 9]),
+        ]
+
+    @staticmethod
+    def test_replay_as_fast_as_possible(recorded_file, air_client, monotonic):
+        start = monotonic.time
+        with recording.Recording(recorded_file) as recorded:
+            recorded.replay(
+                [air_client], speed=None, clock=monotonic, sleep=monotonic.sleep
+            )
+
+        assert monotonic.time == start
+
+
+class TestRecordingAirClient:
+    @staticmethod
+    def test_shown_frames_are_recorded(file_name, mock_socket):
+        with recording.FrameRecorder(file_name) as recorder:
+            air_client = client.AirClient(
+                "1.2.3.4", 50001, recorder=recorder, sock=mock_socket
+            )
+            air_client.show_bytes(b"\x01\x02\x03")
+            air_client.show_array(np.ones((1, 3)))
+
+        with recording.Recording(file_name) as recorded:
+            payloads = [bytes(payload) for _, payload in recorded.frames()]
+
+        assert payloads == sent_payloads(mock_socket)
@@ -0,0 +1,235 @@
+import asyncio
+import socket
+from unittest import mock
+
+import pytest
+
+from airpixel import client, feedback, framework, stub_device
+
+
+@pytest.fixture(name="clock")
+def f_clock():
+    return mock.MagicMock(return_value=100.0)
+
+
+@pytest.fixture(name="device")
+def f_device(clock):
+    device = stub_device.SimulatedDevice("some_device", pixel_count=2, clock=clock)
+    device.activate()
+    return device
+
+
+def frame(frame_number, pixels=b"\x01\x02\x03\x04\x05\x06"):
+    return stub_device.FRAME_NUMBER.pack(frame_number) + pixels
+
+
+class TestSimulatedDevice:
+    @staticmethod
+    def test_highest_frame_number_wins(device):
+        device.receive(frame(2, b"\x02" * 6))
+        device.receive(frame(1, b"\x01" * 6))
+
+        assert device.highest_frame_number == 2
+        assert device.pixels == b"\x02" * 6
+        assert device.received_frames == 2
+
+    @staticmethod
+    def test_frame_zero_is_never_shown(device):
+        device.receive(frame(0))
+        device.show()
+
+        assert device.shown_frames == 0
+        assert device.received_frames == 1
+
+    @staticmethod
+    def test_frames_received_together_are_shown_once(device):
+        async def receive():
+            for frame_number in range(1, 4):
+                device.datagram_received(frame(frame_number), ("1.2.3.4", 1))
+            await asyncio.sleep(0)
+
+        asyncio.run(receive())
+
+        assert device.received_frames == 3
+        assert device.shown_frames == 1
+
+    @staticmethod
+    def test_binary_keepalive(device):
+        device.binary_keepalive = True
+        device.receive(frame(7))
+        device.show()
+
+        assert feedback.KEEPALIVE.unpack(device.heartbeat()) == (1, 1, 0)
+        assert feedback.KEEPALIVE.unpack(device.confirmation()) == (1, 1, 7)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "binary_keepalive, expected",
+        [(False, b"some_device\n"), (True, b"some_device binary-keepalive\n")],
+    )
+    def test_registration_advertises_binary_keepalive(
+        device, binary_keepalive, expected
+    ):
+        device.binary_keepalive = binary_keepalive
+
+        assert device.registration()[stub_device.PORT_SIZE :] == expected
+
+    @staticmethod
+    def test_inactive_device_ignores_frames(device):
+        device.active = False
+
+        device.datagram_received(frame(1), ("1.2.3.4", 1))
+
+        assert device.received_frames == 0
+
+    @staticmethod
+    def test_times_out_without_shown_frames(device, clock):
+        clock.return_value += stub_device.TIMEOUT / 2
+        device.receive(frame(1))
+        device.show()
+        clock.return_value += stub_device.TIMEOUT
+
+        assert not device.timed_out()
+
+        clock.return_value += 0.1
+
+        assert device.timed_out()
+
+    @staticmethod
+    def test_heartbeat_reports_counters(device):
+        device.receive(frame(1))
+        device.receive(frame(1))
+        device.show()
+
+        assert device.heartbeat() == b"2 1"
+
+    @staticmethod
+    def test_activate_resets_counters(device):
+        device.receive(frame(5))
+        device.show()
+
+        device.activate()
+
+        assert (device.received_frames, device.shown_frames) == (0, 0)
+        assert device.highest_frame_number == 0
+
+
+class TestSimulation:
+    @staticmethod
+    def test_simulated_devices_use_distinct_addresses():
+        devices = stub_device.simulated_devices("some_device", 3, "127.1.0.254")
+
+        assert [device.local_ip for device in devices] == [
+            "127.1.0.254",
+            "127.1.0.255",
+            "127.1.1.0",
+        ]
+
+    @staticmethod
+    def test_device_registers_and_reports_shown_frames():
+        keepalive = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        keepalive.bind(("127.0.0.1", 0))
+        keepalive.settimeout(1)
+        _, keepalive_port = keepalive.getsockname()
+        process_registration = mock.MagicMock(spec=framework.ProcessRegistration)
+
+        async def simulate():
+            loop = asyncio.get_running_loop()
+            server = await loop.create_server(
+                lambda: framework.ConnectionProtocol(
+                    process_registration, keepalive_port
+                ),
+                "127.0.0.1",
+                0,
+            )
+            _, server_port = server.sockets[0].getsockname()
+            device = stub_device.SimulatedDevice(
+                "some_device", server_port=server_port, local_port=0
+            )
+            task = asyncio.ensure_future(device.run_forever())
+            while not device.active:
+                await asyncio.sleep(0.01)
+            air_client = client.AirClient("127.0.0.1", device.local_port)
+            for _ in range(3):
+                air_client.show_bytes(b"\xff" * 6)
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(stub_device.HEARTBEAT_DELTA * 1.5)
+            task.cancel()
+            server.close()
+            return device
+
+        device = asyncio.run(simulate())
+        heartbeats = []
+        with keepalive:
+            keepalive.settimeout(0)
+            while True:
+                try:
+                    heartbeats.append(keepalive.recv(64))
+                except BlockingIOError:
+                    break
+
+        process_registration.launch_for.assert_called_once_with(
+            "some_device", "127.0.0.1", device.local_port, []
+        )
+        assert (device.received_frames, device.shown_frames) == (3, 2)
+        assert heartbeats[-1] == b"3 2"
+
+    @staticmethod
+    @pytest.mark.parametrize("binary_keepalive", [False, True])
+    def test_confirmations_measure_latency(binary_keepalive):
+        process_registration = framework.ProcessRegistration(
+            [framework.DeviceConfig("latency_test", "renderer")],
+            subprocess_factory=mock.MagicMock(),
+        )
+        latency_tracker = feedback.LatencyTracker(settle_time=0)
+        receiver = client.FeedbackReceiver(
+            feedback.socket_path("latency_test", "127.0.0.1"), latency_tracker
+        )
+
+        async def simulate():
+            loop = asyncio.get_running_loop()
+            keepalive, _ = await loop.create_datagram_endpoint(
+                lambda: framework.KeepaliveProtocol(process_registration),
+                local_addr=("127.0.0.1", 0),
+            )
+            _, keepalive_port = keepalive.get_extra_info("sockname")
+            server = await loop.create_server(
+                lambda: framework.ConnectionProtocol(
+                    process_registration, keepalive_port
+                ),
+                "127.0.0.1",
+                0,
+            )
+            _, server_port = server.sockets[0].getsockname()
+            device = stub_device.SimulatedDevice(
+                "latency_test",
+                server_port=server_port,
+                local_port=0,
+                confirm=True,
+                binary_keepalive=binary_keepalive,
+            )
+            task = asyncio.ensure_future(device.run_forever())
+            while not device.active:
+                await asyncio.sleep(0.01)
+            air_client = client.AirClient(
+                "127.0.0.1", device.local_port, latency_tracker=latency_tracker
+            )
+            for _ in range(5):
+                air_client.show_bytes(b"\xff" * 6)
+                for _ in range(10):
+                    await asyncio.sleep(0.001)
+                    receiver.latest()
+            task.cancel()
+            server.close()
+            keepalive.close()
+
+        try:
+            asyncio.run(simulate())
+        finally:
+            receiver.close()
+            process_registration.cleanup()
+
+        report = latency_tracker.report()
+        # The device never shows frame 0
+        assert (report.sent_frames, report.confirmed_frames) == (5, 4)
+        assert 0 < report.p50 < 0.005
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+
+from airpixel import telemetry
+
+
+class MockClock:
+    def __init__(self):
+        self.time = 100.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture(name="clock")
+def f_clock():
+    return MockClock()
+
+
+@pytest.fixture(name="device_telemetry")
+def f_device_telemetry(clock):
+    return telemetry.Telemetry(capacity=8, device_limit=2, clock=clock)
+
+
+class TestRingBuffer:
+    @staticmethod
+    def test_invalid_capacity():
+        with pytest.raises(telemetry.TelemetryError):
+            telemetry.RingBuffer(0)
+
+    @staticmethod
+    def test_since_returns_samples_in_order():
+        ring_buffer = telemetry.RingBuffer(4, columns=1)
+        for timestamp in range(3):
+            ring_buffer.append(timestamp, timestamp * 10)
+
+        times, values = ring_buffer.since(1)
+
+        assert list(times) == [1, 2]
+        assert list(values[:, 0]) == [10, 20]
+
+    @staticmethod
+    def test_oldest_samples_are_overwritten():
+        ring_buffer = telemetry.RingBuffer(4, columns=1)
+        for timestamp in range(10):
+            ring_buffer.append(timestamp, timestamp * 10)
+
+        times, values = ring_buffer.since(0)
+
+        assert len(ring_buffer) == 4
+        assert ring_buffer.appended == 10
+        assert list(times) == [6, 7, 8, 9]
+        assert list(values[:, 0]) == [60, 70, 80, 90]
+
+
+class TestTelemetry:
+    @staticmethod
+    def test_query_aggregates_window(device_telemetry, clock):
+        for received, shown in ((10, 10), (50, 40), (100, 80), (120, 100)):
+            device_telemetry.record_keepalive("1.2.3.4", received, shown)
+            clock.time += 0.1
+
+        (summary,) = device_telemetry.query(0.35)
+
+        assert summary.keepalives == 3
+        assert (summary.received, summary.shown) == (70, 60)
+        assert summary.delivery_ratio == pytest.approx(60 / 70)
+        assert summary.keepalive_interval == pytest.approx(0.1)
+        assert summary.keepalive_jitter == pytest.approx(0.0)
+
+    @staticmethod
+    def test_query_counts_frames_after_reconnect(device_telemetry, clock):
+        for received, shown in ((100, 100), (120, 110), (5, 4)):
+            device_telemetry.record_keepalive("1.2.3.4", received, shown)
+            clock.time += 0.1
+
+        (summary,) = device_telemetry.query()
+
+        assert (summary.received, summary.shown) == (25, 14)
+
+    @staticmethod
+    def test_query_jitter(device_telemetry, clock):
+        for delay in (0.1, 0.3, 0.1, 0.3):
+            device_telemetry.record_keepalive("1.2.3.4", 0, 0)
+            clock.time += delay
+        device_telemetry.record_keepalive("1.2.3.4", 0, 0)
+
+        (summary,) = device_telemetry.query()
+
+        assert summary.keepalive_interval == pytest.approx(0.2)
+        assert summary.keepalive_jitter == pytest.approx(0.1)
+
+    @staticmethod
+    def test_query_counts_registrations(device_telemetry, clock):
+        device_telemetry.record_registration("1.2.3.4", "some_device")
+        clock.time += 100
+        device_telemetry.record_registration("1.2.3.4", "some_device")
+        device_telemetry.record_registration("1.2.3.4", "some_device")
+
+        (summary,) = device_telemetry.query(10)
+
+        assert summary.device_id == "some_device"
+        assert summary.registrations == 2
+        assert summary.keepalives == 0
+        assert summary.delivery_ratio == 0.0
+
+    @staticmethod
+    def test_least_recently_seen_device_is_dropped(device_telemetry):
+        device_telemetry.record_keepalive("1.1.1.1", 1, 1)
+        device_telemetry.record_keepalive("2.2.2.2", 1, 1)
+        device_telemetry.record_keepalive("1.1.1.1", 2, 2)
+        device_telemetry.record_keepalive("3.3.3.3", 1, 1)
+
+        assert len(device_telemetry) == 2
+        assert [summary.ip_address for summary in device_telemetry.query()] == [
+            "1.1.1.1",
+            "3.3.3.3",
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "request_, expected_window", [(b"5\n", 5.0), (b"", telemetry.DEFAULT_WINDOW)]
+    )
+    def test_handle_query(device_telemetry, tmp_path, request_, expected_window):
+        path = str(tmp_path / "telemetry")
+        device_telemetry.record_keepalive("1.2.3.4", 10, 10)
+
+        async def query():
+            server = await asyncio.start_unix_server(
+                device_telemetry.handle_query, path=path
+            )
+            async with server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(request_)
+                if not request_:
+                    writer.write_eof()
+                response = await reader.readline()
+                writer.close()
+            return json.loads(response)
+
+        response = asyncio.run(query())
+
+        assert response["window"] == expected_window
+        assert response["devices"][0]["ip_address"] == "1.2.3.4"
+        assert response["devices"][0]["keepalives"] == 1
+
+    @staticmethod
+    def test_query_over_socket(device_telemetry, tmp_path):
+        path = str(tmp_path / "telemetry")
+        device_telemetry.record_registration("1.2.3.4", "some_device")
+
+        async def serve():
+            task = asyncio.ensure_future(device_telemetry.serve_forever(path))
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, telemetry.query, path, 30)
+            task.cancel()
+            return result
+
+        result = asyncio.run(serve())
+
+        assert result["window"] == 30
+        assert result["devices"][0]["registrations"] == 1
+
+    @staticmethod
+    def test_invalid_window_is_an_error(device_telemetry, tmp_path):
+        path = str(tmp_path / "telemetry")
+
+        async def serve():
+            task = asyncio.ensure_future(device_telemetry.serve_forever(path))
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(None, telemetry.query, path, "x")
+            finally:
+                task.cancel()
+
+        with pytest.raises(telemetry.TelemetryError):
+            asyncio.run(serve())
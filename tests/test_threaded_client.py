@@ -0,0 +1,73 @@
+import socket
+import time
+from unittest import mock
+
+import pytest
+
+from airpixel import client, threaded_client
+
+
+@pytest.fixture(name="mock_socket")
+def f_mock_socket():
+    sock = mock.MagicMock(spec=socket.socket)
+    sock.sent = []
+    sock.sendto.side_effect = lambda data, address: sock.sent.append(bytes(data))
+    return sock
+
+
+@pytest.fixture(name="threaded_air_client")
+def f_threaded_air_client(mock_socket):
+    air_client = client.AirClient(
+        "1.2.3.4", 50001, client.ColorMethodRGB, sock=mock_socket
+    )
+    return threaded_client.ThreadedAirClient(air_client, 2, target_fps=1000)
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.001)
+
+
+class TestThreadedAirClient:
+    @staticmethod
+    def test_publish_swaps_buffers(threaded_air_client):
+        first = threaded_air_client.buffer
+
+        threaded_air_client.publish()
+
+        assert threaded_air_client.buffer is not first
+
+    @staticmethod
+    def test_sends_published_frame(threaded_air_client, mock_socket):
+        threaded_air_client.buffer[:] = 1
+
+        with threaded_air_client:
+            threaded_air_client.publish()
+            wait_for(lambda: threaded_air_client.sent_frames == 1)
+
+        assert mock_socket.sent == [bytes(8) + b"\xff" * 6]
+
+    @staticmethod
+    def test_only_newest_frame_is_sent(threaded_air_client, mock_socket):
+        threaded_air_client.buffer[:] = 0.5
+        threaded_air_client.publish()
+        threaded_air_client.buffer[:] = 1
+        threaded_air_client.publish()
+
+        with threaded_air_client:
+            wait_for(lambda: threaded_air_client.sent_frames == 1)
+
+        assert mock_socket.sent == [bytes(8) + b"\xff" * 6]
+        assert threaded_air_client.overwritten_frames == 1
+
+    @staticmethod
+    def test_does_not_resend_without_new_frame(threaded_air_client, mock_socket):
+        with threaded_air_client:
+            threaded_air_client.publish()
+            wait_for(lambda: threaded_air_client.sent_frames == 1)
+            time.sleep(0.01)
+
+        assert len(mock_socket.sent) == 1